@@ -14,7 +14,7 @@ License:
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING, Optional, Union
+from typing import TYPE_CHECKING, Callable, Optional, Union
 
 from qgis.core import (
     Qgis,
@@ -89,7 +89,9 @@ class Layer:
         self.wkb_type = wkb_type
         self.alias = alias
         self.__layer = None
-        self.fields = list()
+        self.__attached = False
+        self.__fields = list()
+        self.__fields_loader = None
         self.is_domain = is_domain
         self.is_structure = is_structure
         self.is_enum = is_enum
@@ -125,6 +127,30 @@ class Layer:
         self.checked = True
         self.featurecount = False
 
+    @property
+    def fields(self) -> list[Field]:
+        if self.__fields_loader is not None:
+            fields_loader = self.__fields_loader
+            self.__fields_loader = None
+            self.__fields = fields_loader()
+        return self.__fields
+
+    @fields.setter
+    def fields(self, fields: list[Field]) -> None:
+        self.__fields = fields
+        self.__fields_loader = None
+
+    def set_fields_loader(self, fields_loader: Callable[[], list[Field]]) -> None:
+        """
+        Sets a function creating the fields. It's called on the first access of `fields` (e.g. on `create()`),
+        so the fields of layers never used are never created.
+        """
+        self.__fields_loader = fields_loader
+
+    @property
+    def fields_loaded(self) -> bool:
+        return self.__fields_loader is None
+
     def dump(self) -> dict:
         definition = dict()
         definition["provider"] = self.provider
@@ -169,7 +195,18 @@ class Layer:
         self.__form.load(definition["form"])
         self.base_class = definition["base_class"]
 
+    def attach(self, qgis_layer: Union[QgsRasterLayer, QgsVectorLayer]) -> None:
+        """
+        Uses an existing QGIS layer (e.g. of a project that is updated) instead of creating a new one.
+        `create()` returns it as it is.
+        """
+        self.__layer = qgis_layer
+        self.__attached = True
+
     def create(self) -> Union[QgsRasterLayer, QgsVectorLayer]:
+        if self.__attached:
+            return self.__layer
+
         if self.definitionfile:
             if self.__layer is None:
                 layers = QgsLayerDefinition.loadLayerDefinitionLayers(
@@ -72,8 +72,15 @@ class LegendGroup:
         self.items = definition
 
     def create(
-        self, qgis_project: QgsProject, group: Optional[QgsLayerTreeGroup] = None
+        self,
+        qgis_project: QgsProject,
+        group: Optional[QgsLayerTreeGroup] = None,
+        update: bool = False,
     ) -> None:
+        """
+        Creates the groups and inserts the layers not yet in the layer tree.
+        On `update` the definition files are not loaded again and the properties of existing groups are kept.
+        """
         if group is None:
             group = qgis_project.layerTreeRoot()
 
@@ -87,22 +94,29 @@ class LegendGroup:
         for item in self.items:
             if isinstance(item, LegendGroup):
                 if item.definitionfile:
-                    QgsLayerDefinition.loadLayerDefinition(
-                        item.definitionfile, qgis_project, group
-                    )
+                    if not update:
+                        QgsLayerDefinition.loadLayerDefinition(
+                            item.definitionfile, qgis_project, group
+                        )
                 else:
                     subgroup = get_group_non_recursive(group, item.name)
-                    if subgroup is None:
+                    existing = subgroup is not None
+                    if not existing:
                         subgroup = group.addGroup(item.name)
-                    item.create(qgis_project, subgroup)
-                    subgroup.setExpanded(item.expanded)
-                    subgroup.setItemVisibilityChecked(item.checked)
-                    subgroup.setIsMutuallyExclusive(
-                        item.mutually_exclusive, item.mutually_exclusive_child
-                    )
+                    item.create(qgis_project, subgroup, update)
+                    if not (update and existing):
+                        subgroup.setExpanded(item.expanded)
+                        subgroup.setItemVisibilityChecked(item.checked)
+                        subgroup.setIsMutuallyExclusive(
+                            item.mutually_exclusive, item.mutually_exclusive_child
+                        )
             else:
                 layer = item.layer
-                if (
+                # on update the kept layers are already in the layer tree
+                in_layer_tree = update and bool(
+                    qgis_project.layerTreeRoot().findLayer(layer.id())
+                )
+                if not in_layer_tree and (
                     not layer.dataProvider()
                     or layer.dataProvider().dataSourceUri()
                     not in existing_layer_source_uris
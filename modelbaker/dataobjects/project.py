@@ -13,6 +13,8 @@ License:
 
 from __future__ import annotations
 
+import hashlib
+import json
 from typing import Any, Optional
 
 from qgis.core import (
@@ -26,6 +28,7 @@ from qgis.core import (
     QgsPrintLayout,
     QgsProject,
     QgsReadWriteContext,
+    QgsVectorLayer,
 )
 from qgis.PyQt.QtCore import QObject, pyqtSignal
 from qgis.PyQt.QtXml import QDomDocument
@@ -37,6 +40,11 @@ from .relations import Relation
 
 ENUM_THIS_CLASS_COLUMN = "thisclass"
 
+# the state of the generated layers and relations stored in the QGIS project (see `Project.update`)
+GENERATION_STATE_SCOPE = "modelbaker"
+GENERATION_STATE_KEY = "/generation_state"
+GENERATION_STATE_VERSION = 1
+
 
 class Project(QObject):
     layer_added = pyqtSignal(str)
@@ -157,9 +165,388 @@ class Project(QObject):
                 qgis_project.setCrs(crs)
 
         # Set relations and relation depending editor widgets accordingly
+        self._create_relations(qgis_project, self.relations)
+
+        # BAG-OF Enumerations with ARRAY mapping are value relations as well
+        self._create_bags_of_enum(self.bags_of_enum)
+
+        for layer in self.layers:
+            if layer.layer.type() == QgsMapLayer.LayerType.VectorLayer:
+                # even when a style will be loaded we create the form because not sure if the style contains form settngs
+                layer.create_form(self)
+                layer.store_variables(self)
+            layer.load_styles()
+
+        if self.legend:
+            self.legend.create(qgis_project, group)
+
+        self.load_custom_layer_order(qgis_project)
+
+        self.load_mapthemes(qgis_project)
+
+        self.load_custom_variables(qgis_project)
+
+        self.load_layouts(qgis_project)
+
+        self.store_project_variables(qgis_project)
+
+        self.store_generation_state(qgis_project)
+
+        if path:
+            qgis_project.write(path)
+
+    def update(
+        self,
+        qgis_project: QgsProject,
+        path: Optional[str] = None,
+        group: Optional[QgsLayerTreeGroup] = None,
+    ) -> Optional[dict[str, list[str]]]:
+        """
+        Updates a QGIS project created with `create` (e.g. after a schema update) to the layers, relations and legend of this project.
+
+        Only the layers whose definition (including their fields and relations) changed since the last generation are created again,
+        the others are kept. Layers the user customized (e.g. the widgets, aliases or the form) are not touched at all.
+
+        Returns the names of the layers per outcome (`added`, `updated`, `removed`, `unchanged` and `customized`)
+        or `None` if the QGIS project has no generation state to compare with.
+        """
+        state = self.read_generation_state(qgis_project)
+        if state is None:
+            self.log_function(
+                self.tr(
+                    "The project has not been generated by Model Baker or is too old to be updated."
+                ),
+                LogLevel.FAIL,
+            )
+            return None
+
+        report = {
+            "added": [],
+            "updated": [],
+            "removed": [],
+            "unchanged": [],
+            "customized": [],
+        }
+        previous_layers = state["layers"]
+
+        customized_uris = set()
+        for uri, previous in previous_layers.items():
+            qgis_layer = qgis_project.mapLayer(previous["id"])
+            if (
+                qgis_layer
+                and self._customization_fingerprint(qgis_layer)
+                != previous["customization"]
+            ):
+                customized_uris.add(uri)
+
+        fingerprints = {
+            layer.uri: self._layer_fingerprint(layer) for layer in self.layers
+        }
+        created_layers = []
+        for layer in self.layers:
+            if layer.uri in customized_uris:
+                continue
+            previous = previous_layers.get(layer.uri)
+            if (
+                previous is None
+                or previous["fingerprint"] != fingerprints[layer.uri]
+                or not qgis_project.mapLayer(previous["id"])
+            ):
+                created_layers.append(layer)
+
+        # the widgets referencing created layers (by relation or bag of enum) need to be created again
+        referencing_layers = [
+            relation.referencing_layer
+            for relation in self.relations
+            if relation.referenced_layer in created_layers
+        ] + [
+            bag_of_enum_info[0]
+            for bag_of_enum in self.bags_of_enum.values()
+            for bag_of_enum_info in bag_of_enum.values()
+            if bag_of_enum_info[2] in created_layers
+        ]
+        for layer in referencing_layers:
+            if layer.uri not in customized_uris and layer not in created_layers:
+                created_layers.append(layer)
+
+        # remove the outdated layers (their relations are removed with them)
+        created_uris = [layer.uri for layer in created_layers]
+        for uri, previous in previous_layers.items():
+            if uri in customized_uris:
+                continue
+            if uri not in fingerprints or uri in created_uris:
+                if qgis_project.mapLayer(previous["id"]):
+                    qgis_project.removeMapLayer(previous["id"])
+                if uri not in fingerprints:
+                    report["removed"].append(previous["name"])
+
+        # keep the others
+        for layer in self.layers:
+            if layer in created_layers:
+                continue
+            layer.attach(qgis_project.mapLayer(previous_layers[layer.uri]["id"]))
+            if layer.uri in customized_uris:
+                report["customized"].append(layer.name)
+            else:
+                report["unchanged"].append(layer.name)
+
+        qgis_layers = list()
+        for layer in created_layers:
+            qgis_layer = layer.create()
+            self.layer_added.emit(qgis_layer.id())
+            qgis_layers.append(qgis_layer)
+            if layer.uri in previous_layers:
+                report["updated"].append(layer.name)
+            else:
+                report["added"].append(layer.name)
+        qgis_project.addMapLayers(qgis_layers, not self.legend)
+
+        # remove the relations that are not generated anymore and create the missing ones
+        relation_fingerprints = [
+            (relation, self._relation_fingerprint(relation))
+            for relation in self.relations
+        ]
+        generated_fingerprints = {
+            fingerprint for _, fingerprint in relation_fingerprints
+        }
+        kept_relation_ids = {}
+        for relation_id, fingerprint in state["relations"].items():
+            if not qgis_project.relationManager().relation(relation_id).isValid():
+                continue
+            if fingerprint in generated_fingerprints:
+                kept_relation_ids[fingerprint] = relation_id
+            else:
+                qgis_project.relationManager().removeRelation(relation_id)
+        created_relations = [
+            relation
+            for relation, fingerprint in relation_fingerprints
+            if relation.referencing_layer in created_layers
+            or relation.referenced_layer in created_layers
+            or fingerprint not in kept_relation_ids
+        ]
+        self._create_relations(
+            qgis_project,
+            created_relations,
+            [layer.name for layer in self.layers if layer not in created_layers],
+        )
+        created_layer_names = [layer.name for layer in created_layers]
+        self._create_bags_of_enum(
+            {
+                layer_name: bag_of_enum
+                for layer_name, bag_of_enum in self.bags_of_enum.items()
+                if layer_name in created_layer_names
+            }
+        )
+
+        for layer in created_layers:
+            if layer.layer.type() == QgsMapLayer.LayerType.VectorLayer:
+                layer.create_form(self)
+                layer.store_variables(self)
+            layer.load_styles()
+
+        if self.legend:
+            self.legend.create(qgis_project, group, update=True)
+
+        self.store_project_variables(qgis_project)
+
+        self.store_generation_state(
+            qgis_project,
+            {
+                uri: previous
+                for uri, previous in previous_layers.items()
+                if uri in customized_uris
+            },
+            kept_relation_ids,
+        )
+
+        if path:
+            qgis_project.write(path)
+
+        return report
+
+    def store_generation_state(
+        self,
+        qgis_project: QgsProject,
+        kept_layers: dict[str, dict] = {},
+        kept_relation_ids: dict[str, str] = {},
+    ) -> None:
+        """
+        Stores the fingerprints of the generated layers and relations in the QGIS project, so it can be updated later (see `update`).
+        The entries of `kept_layers` (customized layers on update) are stored as they are.
+        """
+        layers = dict(kept_layers)
+        for layer in self.layers:
+            if layer.uri in layers or not layer.layer:
+                continue
+            layers[layer.uri] = {
+                "id": layer.layer.id(),
+                "name": layer.name,
+                "fingerprint": self._layer_fingerprint(layer),
+                "customization": self._customization_fingerprint(layer.layer),
+            }
+
+        relations = {
+            relation_id: fingerprint
+            for fingerprint, relation_id in kept_relation_ids.items()
+        }
+        for relation in self.relations:
+            if relation.qgis_relation and relation.id:
+                relations[relation.id] = self._relation_fingerprint(relation)
+
+        qgis_project.writeEntry(
+            GENERATION_STATE_SCOPE,
+            GENERATION_STATE_KEY,
+            json.dumps(
+                {
+                    "version": GENERATION_STATE_VERSION,
+                    "layers": layers,
+                    "relations": relations,
+                }
+            ),
+        )
+
+    @staticmethod
+    def read_generation_state(qgis_project: QgsProject) -> Optional[dict]:
+        """
+        Returns the generation state stored by `store_generation_state` or `None` if there is no (valid) one.
+        """
+        content, found = qgis_project.readEntry(
+            GENERATION_STATE_SCOPE, GENERATION_STATE_KEY
+        )
+        if not found or not content:
+            return None
+        try:
+            state = json.loads(content)
+        except ValueError:
+            return None
+        if state.get("version") != GENERATION_STATE_VERSION:
+            return None
+        return state
+
+    def _layer_fingerprint(self, layer: Layer) -> str:
+        """
+        Hash over everything the QGIS layer, its widgets and its form are generated from.
+        """
+        return self._fingerprint(
+            {
+                "provider": layer.provider,
+                "uri": layer.uri,
+                "alias": layer.alias,
+                "wkb_type": int(layer.wkb_type),
+                "kind": [
+                    layer.is_domain,
+                    layer.is_structure,
+                    layer.is_nmrel,
+                    layer.is_enum,
+                    layer.is_basket_table,
+                    layer.is_dataset_table,
+                    layer.is_relevant,
+                ],
+                "display_expression": layer.display_expression,
+                "coordinate_precision": layer.coordinate_precision,
+                "srid": layer.srid,
+                "topics": [sorted(layer.all_topics), sorted(layer.relevant_topics)],
+                "definitionfile": layer.definitionfile,
+                "qmlstylefile": layer.qmlstylefile,
+                "styles": layer.styles,
+                "fields": [
+                    [
+                        field.name,
+                        field.alias,
+                        getattr(field, "hidden", False),
+                        field.read_only,
+                        field.widget,
+                        field.widget_config,
+                        field.default_value_expression,
+                        field.enum_domain,
+                        field.oid_domain,
+                    ]
+                    for field in layer.fields
+                ],
+                "relations": sorted(
+                    self._relation_fingerprint(relation)
+                    for relation in self.relations
+                    if layer in (relation.referencing_layer, relation.referenced_layer)
+                ),
+                "bags_of_enum": {
+                    attribute: [
+                        item.name if isinstance(item, Layer) else item
+                        for item in bag_of_enum_info
+                    ]
+                    for attribute, bag_of_enum_info in self.bags_of_enum.get(
+                        layer.name, {}
+                    ).items()
+                },
+                "optimize_strategy": self.optimize_strategy.name,
+            }
+        )
+
+    def _relation_fingerprint(self, relation: Relation) -> str:
+        return self._fingerprint(
+            [
+                relation.name,
+                relation.referencing_layer.uri,
+                relation.referencing_field,
+                relation.referenced_layer.uri,
+                relation.referenced_field,
+                int(relation.strength),
+                relation.child_domain_name,
+                relation.translate_name,
+            ]
+        )
+
+    def _customization_fingerprint(self, qgis_layer: QgsMapLayer) -> str:
+        """
+        Hash over the properties of a QGIS layer a user usually customizes (name, aliases, widgets, default values, form).
+        If it differs from the one stored on generation, the layer has been customized.
+        """
+        content = {"name": qgis_layer.name()}
+        if isinstance(qgis_layer, QgsVectorLayer):
+            fields = qgis_layer.fields()
+            content["fields"] = [
+                [
+                    fields.at(index).name(),
+                    fields.at(index).alias(),
+                    qgis_layer.editorWidgetSetup(index).type(),
+                    qgis_layer.editorWidgetSetup(index).config(),
+                    qgis_layer.defaultValueDefinition(index).expression(),
+                ]
+                for index in range(fields.count())
+            ]
+            content["display_expression"] = qgis_layer.displayExpression()
+            edit_form_config = qgis_layer.editFormConfig()
+            content["form"] = [
+                int(edit_form_config.layout()),
+                self._form_elements(edit_form_config.invisibleRootContainer()),
+            ]
+        return self._fingerprint(content)
+
+    def _form_elements(self, element) -> list:
+        children = element.children() if hasattr(element, "children") else []
+        return [
+            element.name(),
+            [self._form_elements(child) for child in children],
+        ]
+
+    @staticmethod
+    def _fingerprint(content: Any) -> str:
+        return hashlib.sha256(
+            json.dumps(content, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
+    def _create_relations(
+        self,
+        qgis_project: QgsProject,
+        relations: list[Relation],
+        skip_widget_layer_names: list[str] = [],
+    ) -> None:
+        """
+        Creates the relations in the relation manager (additionally to the existing ones) and sets the relation depending editor widgets.
+        The editor widgets of the layers in `skip_widget_layer_names` are not touched.
+        """
         qgis_relations = list(qgis_project.relationManager().relations().values())
         dict_layers = {layer.layer.id(): layer for layer in self.layers}
-        for relation in self.relations:
+        for relation in relations:
             rel = relation.create(qgis_project, qgis_relations)
             if not rel.isValid():
                 self.log_function(
@@ -264,14 +651,16 @@ class Project(QObject):
                 )
                 qgis_relations.append(rel)
 
+            if relation.referencing_layer.name in skip_widget_layer_names:
+                continue
             referencing_layer = rel.referencingLayer()
             referencing_layer.setEditorWidgetSetup(
                 rel.referencingFields()[0], editor_widget_setup
             )
         qgis_project.relationManager().setRelations(qgis_relations)
 
-        # BAG-OF Enumerations with ARRAY mapping are value relations as well
-        for layer_name, bag_of_enum in self.bags_of_enum.items():
+    def _create_bags_of_enum(self, bags_of_enum: dict) -> None:
+        for layer_name, bag_of_enum in bags_of_enum.items():
             current_layer = None
             for attribute, bag_of_enum_info in bag_of_enum.items():
                 mapping_type = bag_of_enum_info[5]
@@ -319,29 +708,6 @@ class Project(QObject):
                         self.tr("The minimal selection is 1"),
                     )
 
-        for layer in self.layers:
-            if layer.layer.type() == QgsMapLayer.LayerType.VectorLayer:
-                # even when a style will be loaded we create the form because not sure if the style contains form settngs
-                layer.create_form(self)
-                layer.store_variables(self)
-            layer.load_styles()
-
-        if self.legend:
-            self.legend.create(qgis_project, group)
-
-        self.load_custom_layer_order(qgis_project)
-
-        self.load_mapthemes(qgis_project)
-
-        self.load_custom_variables(qgis_project)
-
-        self.load_layouts(qgis_project)
-
-        self.store_project_variables(qgis_project)
-
-        if path:
-            qgis_project.write(path)
-
     def _enum_filter_expression(self, child_domain_names, t_type_name):
         expression = ""
         if len(child_domain_names) == 1:
@@ -52,11 +52,14 @@ class PgFactory(DbFactory):
 
                 _db_connector = self.get_db_connector(uri, configuration.dbschema)
 
-                result = schema_exist = _db_connector.db_or_schema_exists()
+                try:
+                    result = schema_exist = _db_connector.db_or_schema_exists()
 
-                if not schema_exist:
-                    _db_connector.create_db_or_schema(configuration.dbusr)
-                    result = True
+                    if not schema_exist:
+                        _db_connector.create_db_or_schema(configuration.dbusr)
+                        result = True
+                finally:
+                    _db_connector.close()
 
             except (DBConnectorError, FileNotFoundError) as e:
                 message = QCoreApplication.translate(
@@ -80,8 +83,10 @@ class PgFactory(DbFactory):
         )
 
         connector = self.get_db_connector(uri, configuration.dbschema)
+        postgis_exists = connector._postgis_exists()
+        connector.close()
 
-        if not connector._postgis_exists():
+        if not postgis_exists:
             message = QCoreApplication.translate(
                 "PgFactory",
                 "The current database does not have PostGIS installed! Please install it by running `CREATE EXTENSION postgis;` on the database before proceeding.",
@@ -68,8 +68,12 @@ IGNORED_TABLES = [
     "T_ILI2DB_DATASET",
     "t_ili2db_nls",
     "T_ILI2DB_NLS",
+    "t_modelbaker_bulk_load",
 ]
 
+# Journal of the indexes and constraints dropped for a bulk load, to restore them after a crash during the import
+BULK_LOAD_JOURNAL_TABLE = "t_modelbaker_bulk_load"
+
 BASKET_TABLES = [
     "t_ili2db_basket",
     "T_ILI2DB_BASKET",
@@ -91,3 +95,14 @@ IGNORED_ILI_ELEMENTS = [
     "LocalisationCH_V1.LocalisedMText",
     "LocalisationCH_V1.LocalisedText",
 ]
+
+# Indexes supporting the joins of the introspection queries on the ili2db meta tables (ili2db creates none)
+METADATA_INDEXES = [
+    ("t_ili2db_inheritance", ["baseclass"]),
+    ("t_ili2db_classname", ["sqlname"]),
+    ("t_ili2db_table_prop", ["tablename", "tag"]),
+    ("t_ili2db_column_prop", ["tablename", "columnname", "tag"]),
+    ("t_ili2db_attrname", ["colowner", "sqlname"]),
+    ("t_ili2db_attrname", ["iliname"]),
+    ("t_ili2db_attrname", ["target"]),
+]
@@ -0,0 +1,129 @@
+"""
+Metadata:
+    Creation Date: 2026-10-18
+    Copyright: (C) 2026 by OPENGIS.ch
+    Contact: info@opengis.ch
+
+License:
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the **GNU General Public License** as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Optional
+
+
+class ConnectionPool:
+    """
+    Process-wide pool of database connections keyed by the connection uri.
+
+    A connector borrows a connection with `acquire` and hands it back with `release` (see `DBConnector.close`).
+    Released connections are kept idle and reused by the next connector with the same uri, so the connection
+    setup (e.g. SSL handshake and authentication) is paid only once.
+    The connections are never shared between two connectors at the same time.
+
+    Idle connections are closed when they are idle longer than `idle_timeout` seconds, when there are already
+    `max_size` idle connections for an uri, when they fail the health check or on `close_all`.
+    """
+
+    def __init__(self, max_size: int = 4, idle_timeout: float = 300.0) -> None:
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.enabled = True
+        self._idle: dict[str, list[tuple[Any, float]]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(
+        self,
+        key: str,
+        connect: Callable[[], Any],
+        health_check: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        Returns an idle connection for the key that passes the health check or a new one created by `connect`.
+        """
+        if self.enabled:
+            while True:
+                with self._lock:
+                    self._discard_expired()
+                    idle_connections = self._idle.get(key)
+                    if not idle_connections:
+                        break
+                    connection, _ = idle_connections.pop()
+                if health_check is None or health_check(connection):
+                    return connection
+                self._close(connection)
+        return connect()
+
+    def release(
+        self,
+        key: str,
+        connection: Any,
+        reset: Optional[Callable[[Any], bool]] = None,
+    ) -> None:
+        """
+        Hands back a connection so it can be reused. If `reset` fails (returns False or raises), it's closed instead.
+        """
+        if not self.enabled:
+            self._close(connection)
+            return
+
+        try:
+            reusable = reset is None or reset(connection)
+        except Exception:
+            reusable = False
+        if reusable:
+            with self._lock:
+                self._discard_expired()
+                idle_connections = self._idle.setdefault(key, [])
+                if len(idle_connections) < self.max_size:
+                    idle_connections.append((connection, time.monotonic()))
+                    return
+        self._close(connection)
+
+    def close_all(self) -> None:
+        """Closes all the idle connections."""
+        with self._lock:
+            idle = self._idle
+            self._idle = {}
+        for idle_connections in idle.values():
+            for connection, _ in idle_connections:
+                self._close(connection)
+
+    def idle_count(self, key: Optional[str] = None) -> int:
+        with self._lock:
+            if key is not None:
+                return len(self._idle.get(key, []))
+            return sum(
+                len(idle_connections) for idle_connections in self._idle.values()
+            )
+
+    def _discard_expired(self) -> None:
+        # called with the lock held
+        now = time.monotonic()
+        for key in list(self._idle.keys()):
+            idle_connections = []
+            for connection, released in self._idle[key]:
+                if now - released > self.idle_timeout:
+                    self._close(connection)
+                else:
+                    idle_connections.append((connection, released))
+            if idle_connections:
+                self._idle[key] = idle_connections
+            else:
+                del self._idle[key]
+
+    @staticmethod
+    def _close(connection: Any) -> None:
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+connection_pool = ConnectionPool()
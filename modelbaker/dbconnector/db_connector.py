@@ -12,11 +12,18 @@ License:
 """
 
 import fnmatch
+import hashlib
 from typing import Optional
 
 from qgis.PyQt.QtCore import QObject, pyqtSignal
 
-from .config import BASKET_TABLES, IGNORED_ILI_ELEMENTS, IGNORED_SCHEMAS, IGNORED_TABLES
+from .config import (
+    BASKET_TABLES,
+    IGNORED_ILI_ELEMENTS,
+    IGNORED_SCHEMAS,
+    IGNORED_TABLES,
+    METADATA_INDEXES,
+)
 
 
 class DBConnector(QObject):
@@ -25,6 +32,9 @@ class DBConnector(QObject):
     stdout = pyqtSignal(str)
     new_message = pyqtSignal(int, str)
 
+    # the longest index name in bytes supported by all the databases (PostgreSQL's limit)
+    MAX_IDENTIFIER_LENGTH = 63
+
     def __init__(self, uri, schema, parent=None):
         QObject.__init__(self, parent)
         self.QGIS_DATE_TYPE = "date"
@@ -42,6 +52,22 @@ class DBConnector(QObject):
         self.ttype_name = ""  # On smart1 the type of inherited object (t_type)
         self._lang = ""  # Preferred tr language for table/column info (2 characters)
 
+    def __del__(self):
+        # hand back pooled connections when the connector is not closed explicitly
+        if getattr(self, "_pool_key", None):
+            try:
+                self.close()
+            except Exception:
+                # e.g. on interpreter shutdown
+                pass
+
+    def close(self) -> None:
+        """Closes the connection. Pooled connections are handed back to the connection pool instead."""
+        conn = getattr(self, "conn", None)
+        if conn is not None:
+            self.conn = None
+            conn.close()
+
     def get_provider_specific_names(self) -> dict:
         """
         Returns a dictionary of the provider-specific names defined in the initialization of the derived classes.
@@ -177,6 +203,63 @@ class DBConnector(QObject):
         """
         return {}
 
+    def get_fields_info_bulk(self, table_names: list[str]) -> dict:
+        """
+        Info about fields of the given tables, fetched all at once (bulk introspection).
+
+        Connectors able to do it with set-based queries should override this. By default
+        it falls back to one `get_fields_info` call per table.
+
+        Return:
+            Dictionary with keys corresponding to table names and values corresponding
+            to the list of field records as returned by `get_fields_info`
+        """
+        return {
+            table_name: [
+                {key: value for key, value in record.items()}
+                for record in self.get_fields_info(table_name)
+            ]
+            for table_name in table_names
+        }
+
+    def get_min_max_info_bulk(self, table_names: list[str]) -> dict:
+        """
+        Info about range constraints found in the given tables, fetched all at once (bulk introspection).
+
+        Return:
+            Dictionary with keys corresponding to table names and values corresponding
+            to the dictionary as returned by `get_min_max_info`
+        """
+        return {
+            table_name: self.get_min_max_info(table_name) for table_name in table_names
+        }
+
+    def get_value_map_info_bulk(self, table_names: list[str]) -> dict:
+        """
+        Info about value map constraints found in the given tables, fetched all at once (bulk introspection).
+
+        Return:
+            Dictionary with keys corresponding to table names and values corresponding
+            to the dictionary as returned by `get_value_map_info`
+        """
+        return {
+            table_name: self.get_value_map_info(table_name)
+            for table_name in table_names
+        }
+
+    def get_t_type_map_info_bulk(self, table_names: list[str]) -> dict:
+        """
+        Info about available types of the given smart1-inherited tables, fetched all at once (bulk introspection).
+
+        Return:
+            Dictionary with keys corresponding to table names and values corresponding
+            to the dictionary as returned by `get_t_type_map_info`
+        """
+        return {
+            table_name: self.get_t_type_map_info(table_name)
+            for table_name in table_names
+        }
+
     def get_relations_info(self, filter_layer_list: list[str] = []) -> list[dict]:
         """
         Info about relations found in a database (or database schema).
@@ -214,15 +297,24 @@ class DBConnector(QObject):
         """
         return []
 
-    def get_ignored_layers(self, ignore_basket_tables=True) -> list[str]:
+    def get_ignored_layers(
+        self,
+        ignore_basket_tables=True,
+        tables_info: Optional[list[dict]] = None,
+        relations_info: Optional[list[dict]] = None,
+    ) -> list[str]:
         """
         The ignored layers according to the ignored schemas and ignored tables and the ignored ili elements
         listed in the config.py.
         Additionally all the ili elements that have the attribute name ili2db.mapping in the meta attribute
         table.
+
+        Already fetched (e.g. cached) tables info and relations info can be passed to avoid querying them again.
         """
-        tables_info = self.get_tables_info()
-        relations_info = self.get_relations_info()
+        if tables_info is None:
+            tables_info = self.get_tables_info()
+        if relations_info is None:
+            relations_info = self.get_relations_info()
         meta_attrs_info = self.get_meta_attrs_info()
         mapping_ili_elements = []
         static_tables = []
@@ -429,6 +521,36 @@ class DBConnector(QObject):
             settings_dict[setting_record["tag"]] = setting_record["setting"]
         return settings_dict
 
+    def get_meta_table_counts(self) -> dict:
+        """
+        Returns the number of rows of the meta tables t_ili2db_attrname and t_ili2db_classname
+        as a dict with the table name as key.
+        """
+        return {}
+
+    def get_metadata_fingerprint(self) -> Optional[str]:
+        """
+        Returns a fingerprint of the ili2db meta tables, made of the settings, the hashed model contents
+        and the row counts of t_ili2db_attrname and t_ili2db_classname.
+        It changes when the schema changes and is `None` when there is no INTERLIS model in the DB/schema.
+        """
+        if not self.metadata_exists():
+            return None
+
+        fingerprint = hashlib.sha256()
+        for tag, setting in sorted(self.get_ili2db_settings_as_dict().items()):
+            fingerprint.update(f"setting|{tag}|{setting}\n".encode("utf-8"))
+        for model in sorted(self.get_models(), key=lambda model: model["modelname"]):
+            content_hash = hashlib.sha256(
+                (model["content"] or "").encode("utf-8")
+            ).hexdigest()
+            fingerprint.update(
+                f"model|{model['modelname']}|{content_hash}\n".encode("utf-8")
+            )
+        for tablename, count in sorted(self.get_meta_table_counts().items()):
+            fingerprint.update(f"count|{tablename}|{count}\n".encode("utf-8"))
+        return fingerprint.hexdigest()
+
     def get_ili2db_sequence_value(self) -> str:
         """
         Returns the current value of the sequence used for the t_id
@@ -447,6 +569,144 @@ class DBConnector(QObject):
         """
         return False, None
 
+    def get_missing_indexes(self) -> list[dict]:
+        """
+        Returns the columns lacking an index as dicts with the keys tablename, columnname and kind.
+        These are the foreign key and basket columns (kind "btree") and the geometry columns (kind "spatial")
+        when ili2db did not create their indexes (--createFkIdx, --createGeomIdx).
+        """
+        return []
+
+    def create_index(self, index: dict) -> tuple[bool, str]:
+        """
+        Creates the index of a column returned by *get_missing_indexes*
+        """
+        return False, None
+
+    def index_name(self, tablename: str, columns: list[str]) -> str:
+        """
+        Returns the name of an index on the columns of a table, named like the indexes created by ili2db.
+        Names longer than *MAX_IDENTIFIER_LENGTH* bytes are cut and get a hash of the full name, so they stay unique
+        instead of being truncated by the database.
+        """
+        name = "{}_{}_idx".format(tablename, "_".join(columns))
+        encoded_name = name.encode("utf-8")
+        if len(encoded_name) <= self.MAX_IDENTIFIER_LENGTH:
+            return name
+        suffix = "_{}_idx".format(hashlib.sha256(encoded_name).hexdigest()[:8])
+        prefix = encoded_name[: self.MAX_IDENTIFIER_LENGTH - len(suffix)]
+        return prefix.decode("utf-8", "ignore") + suffix
+
+    def update_statistics(self) -> tuple[bool, str]:
+        """
+        Updates the statistics of the query planner for the tables of the DB/schema
+        """
+        return False, None
+
+    def optimize(self, create_indexes: bool = True) -> tuple[bool, list[str]]:
+        """
+        Creates the missing indexes of the data and meta tables (if wished) and updates the statistics after an import.
+        Returns whether everything succeeded and the messages reporting what has been changed.
+        """
+        success = True
+        messages = []
+        if create_indexes:
+            for index in self.get_missing_indexes():
+                result, message = self.create_index(index)
+                success = success and result
+                messages.append(message)
+            result, metadata_messages = self.create_metadata_indexes()
+            success = success and result
+            messages += metadata_messages
+        result, message = self.update_statistics()
+        success = success and result
+        if message:
+            messages.append(message)
+        return success, messages
+
+    def get_metadata_indexes(self) -> list[dict]:
+        """
+        Returns the indexes supporting the introspection queries on the ili2db meta tables (like the recursive
+        inheritance queries) as dicts with the keys name, tablename and columns.
+        """
+        owner_column = "owner" if self.ili_version() == 3 else "colowner"
+        indexes = []
+        for tablename, columns in METADATA_INDEXES:
+            columns = [owner_column if col == "colowner" else col for col in columns]
+            indexes.append(
+                {
+                    "name": self.index_name(tablename, columns),
+                    "tablename": tablename,
+                    "columns": columns,
+                }
+            )
+        return indexes
+
+    def get_missing_metadata_indexes(self) -> list[dict]:
+        """
+        Returns the indexes of *get_metadata_indexes* not existing yet on the meta tables of the DB/schema
+        """
+        return []
+
+    def create_metadata_indexes(self) -> tuple[bool, list[str]]:
+        """
+        Creates the missing indexes on the meta tables.
+        Returns whether it succeeded and the messages reporting the created indexes.
+        """
+        return False, []
+
+    def drop_metadata_indexes(self) -> tuple[bool, list[str]]:
+        """
+        Drops the indexes created by *create_metadata_indexes*.
+        Returns whether it succeeded and the messages reporting the dropped indexes.
+        """
+        return False, []
+
+    def get_bulk_load_objects(self) -> dict:
+        """
+        Returns the secondary indexes and the foreign key constraints of the data tables slowing down a bulk load.
+        They are listed under the keys indexes and constraints as dicts with the keys name, tablename and definition.
+        """
+        return {"indexes": [], "constraints": []}
+
+    def drop_bulk_load_objects(self, objects: dict) -> tuple[bool, str]:
+        """
+        Drops the indexes and constraints returned by *get_bulk_load_objects* before a bulk load.
+        Their definitions are recorded in the journal in the same transaction.
+        """
+        return False, None
+
+    def get_bulk_load_journal(self) -> dict:
+        """
+        Returns the indexes and constraints recorded by *drop_bulk_load_objects* and not restored yet (e.g. because
+        the application was killed during the import), listed like in *get_bulk_load_objects*.
+        """
+        return {"indexes": [], "constraints": []}
+
+    def clear_bulk_load_journal(self, objects: dict) -> tuple[bool, str]:
+        """
+        Removes the restored indexes and constraints from the journal and the journal itself when it is empty
+        """
+        return False, None
+
+    def restore_bulk_load_indexes(
+        self, indexes: list[dict], max_workers: Optional[int] = None
+    ) -> tuple[bool, list[str]]:
+        """
+        Recreates the dropped indexes, up to `max_workers` at the same time.
+        Returns whether all succeeded and the error messages.
+        """
+        return False, []
+
+    def restore_bulk_load_constraints(
+        self, constraints: list[dict], max_workers: Optional[int] = None
+    ) -> tuple[bool, list[str]]:
+        """
+        Recreates and validates the dropped constraints, up to `max_workers` at the same time.
+        Returns whether all succeeded and the error messages.
+        """
+        return False, []
+
     def set_preferred_translation(self, lang: str) -> bool:
         """
         Returns whether the preferred translation language was successfully set.
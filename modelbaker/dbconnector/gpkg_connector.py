@@ -12,6 +12,7 @@ License:
 """
 
 import ast
+import contextlib
 import errno
 import os
 import re
@@ -397,6 +398,83 @@ class GPKGConnector(DBConnector):
                 )
                 columns_tr = cursor.fetchall()
 
+        cursor.close()
+        return self._fields_records(
+            columns_info, columns_prop, columns_full_name, meta_attrs, columns_tr
+        )
+
+    def get_fields_info_bulk(self, table_names: list[str]) -> dict:
+        cursor = self.conn.cursor()
+        cursor.execute(
+            """
+            SELECT m.name AS tablename, p.name, p.type
+            FROM sqlite_master m
+            JOIN pragma_table_info(m.name) p
+            WHERE m.type = 'table'
+            ORDER BY m.name, p.cid;"""
+        )
+        columns_info_index = {table_name: [] for table_name in table_names}
+        for column_info in cursor.fetchall():
+            if column_info["tablename"] in columns_info_index:
+                columns_info_index[column_info["tablename"]].append(column_info)
+
+        columns_prop_index = {}
+        columns_full_name_index = {}
+        meta_attrs = list()
+        columns_tr = list()
+        tr_enabled, lang = self.get_translation_handling()
+
+        if self.metadata_exists():
+            cursor.execute(
+                """
+                SELECT *
+                FROM T_ILI2DB_COLUMN_PROP;"""
+            )
+            for column_prop in cursor.fetchall():
+                columns_prop_index.setdefault(column_prop["tablename"], []).append(
+                    column_prop
+                )
+
+            cursor.execute(
+                """
+                SELECT SqlName, IliName, {} AS owner
+                FROM T_ILI2DB_ATTRNAME;""".format(  # nosec
+                    "owner" if self.ili_version() == 3 else "colowner"
+                )
+            )
+            for column_full_name in cursor.fetchall():
+                columns_full_name_index.setdefault(
+                    column_full_name["owner"], []
+                ).append(column_full_name)
+
+            if self._table_exists(GPKG_METAATTRS_TABLE):
+                meta_attrs = self.get_meta_attrs_info()
+
+            if tr_enabled:
+                cursor.execute(
+                    """
+                    SELECT ilielement, label
+                    FROM T_ILI2DB_NLS
+                    WHERE lang = ?;""",
+                    (lang,),
+                )
+                columns_tr = cursor.fetchall()
+
+        cursor.close()
+        return {
+            table_name: self._fields_records(
+                columns_info,
+                columns_prop_index.get(table_name, []),
+                columns_full_name_index.get(table_name, []),
+                meta_attrs,
+                columns_tr,
+            )
+            for table_name, columns_info in columns_info_index.items()
+        }
+
+    def _fields_records(
+        self, columns_info, columns_prop, columns_full_name, meta_attrs, columns_tr
+    ):
         # Build result dict from query results
         complete_records = list()
         for column_info in columns_info:
@@ -473,10 +551,7 @@ class GPKGConnector(DBConnector):
             complete_records.append(record)
 
         # Finally, let's order the records by attr_order
-        complete_records = sorted(complete_records, key=lambda k: int(k["attr_order"]))
-
-        cursor.close()
-        return complete_records
+        return sorted(complete_records, key=lambda k: int(k["attr_order"]))
 
     def get_min_max_info(self, table_name):
         constraint_mapping = dict()
@@ -502,6 +577,30 @@ class GPKGConnector(DBConnector):
         cursor.close()
         return constraint_mapping
 
+    def get_min_max_info_bulk(self, table_names: list[str]) -> dict:
+        constraints_index = {table_name: dict() for table_name in table_names}
+        cursor = self.conn.cursor()
+        cursor.execute(
+            """SELECT name, sql
+            FROM sqlite_master
+            WHERE type = 'table';"""
+        )
+        for table in cursor.fetchall():
+            if table["name"] not in constraints_index or not table["sql"]:
+                continue
+            for res in re.findall(r"CHECK\((.*)\)", table["sql"]):
+                res2 = re.search(
+                    r"(\w+) BETWEEN ([-?\d\.E]+) AND ([-?\d\.E]+)", res
+                )  # Might contain scientific notation
+                if res2:
+                    constraints_index[table["name"]][res2.group(1)] = (
+                        res2.group(2),
+                        res2.group(3),
+                    )
+
+        cursor.close()
+        return constraints_index
+
     def get_t_type_map_info(self, table_name: str) -> dict:
         if self.metadata_exists():
             cursor = self.conn.cursor()
@@ -522,6 +621,25 @@ class GPKGConnector(DBConnector):
             return types_mapping
         return {}
 
+    def get_t_type_map_info_bulk(self, table_names: list[str]) -> dict:
+        types_index = {table_name: dict() for table_name in table_names}
+        if self.metadata_exists():
+            cursor = self.conn.cursor()
+            cursor.execute(
+                """
+                SELECT *
+                FROM T_ILI2DB_COLUMN_PROP
+                WHERE tag = 'ch.ehi.ili2db.types';"""
+            )
+            for types_entry in cursor.fetchall():
+                if types_entry["tablename"] in types_index:
+                    values = ast.literal_eval(types_entry["setting"])
+                    types_index[types_entry["tablename"]][
+                        types_entry["columnname"]
+                    ] = values
+            cursor.close()
+        return types_index
+
     def get_relations_info(self, filter_layer_list: list[str] = []) -> list[dict]:
         # We need to get the PK for each table, so first get tables_info
         # and then build something more searchable
@@ -1309,6 +1427,19 @@ class GPKGConnector(DBConnector):
             ),
         )
 
+    def get_meta_table_counts(self) -> dict:
+        counts = {}
+        cursor = self.conn.cursor()
+        for tablename in ["T_ILI2DB_ATTRNAME", "T_ILI2DB_CLASSNAME"]:
+            if not self._table_exists(tablename):
+                continue
+            cursor.execute(
+                """SELECT count(*) FROM "{}";""".format(tablename)  # nosec
+            )
+            counts[tablename] = cursor.fetchone()[0]
+        cursor.close()
+        return counts
+
     def get_ili2db_sequence_value(self) -> str:
         if self._table_exists("T_KEY_OBJECT"):
             cursor = self.conn.cursor()
@@ -1370,6 +1501,234 @@ class GPKGConnector(DBConnector):
 
         return False, self.tr("Could not reset T_LastUniqueId")
 
+    def get_missing_indexes(self) -> list[dict]:
+        cursor = self.conn.cursor()
+        cursor.execute(
+            """SELECT name FROM sqlite_master
+            WHERE type = 'table' AND name NOT LIKE 'gpkg%'
+            AND name NOT LIKE 'rtree%' AND name NOT LIKE 'sqlite%';"""
+        )
+        tablenames = {record["name"].lower(): record["name"] for record in cursor}
+
+        # foreign key and basket columns and the references known by ili2db (even when created without --createFk)
+        # keyed by the lower case names, since sqlite compares the names case insensitive
+        candidates = dict()
+        indexed_columns = set()
+        for tablename in tablenames.values():
+            cursor.execute("""PRAGMA foreign_key_list("{}")""".format(tablename))
+            foreign_keys = cursor.fetchall()
+            for foreign_key in foreign_keys:
+                if sum(1 for fk in foreign_keys if fk["id"] == foreign_key["id"]) == 1:
+                    candidates[(tablename.lower(), foreign_key["from"].lower())] = (
+                        foreign_key["from"]
+                    )
+            cursor.execute("""PRAGMA table_info("{}")""".format(tablename))
+            for column_info in cursor.fetchall():
+                if column_info["name"].lower() == "t_basket":
+                    candidates[(tablename.lower(), "t_basket")] = column_info["name"]
+            cursor.execute("""PRAGMA index_list("{}")""".format(tablename))
+            for index_info in cursor.fetchall():
+                cursor.execute(
+                    """PRAGMA index_info("{}")""".format(index_info["name"])
+                )
+                for index_column in cursor.fetchall():
+                    if index_column["seqno"] == 0 and index_column["name"]:
+                        indexed_columns.add(
+                            (tablename.lower(), index_column["name"].lower())
+                        )
+        if self._table_exists("T_ILI2DB_ATTRNAME"):
+            cursor.execute(
+                """SELECT {colowner} AS tablename, sqlname AS columnname
+                FROM T_ILI2DB_ATTRNAME
+                WHERE target IS NOT NULL;""".format(
+                    colowner="owner" if self.ili_version() == 3 else "colowner"
+                )
+            )
+            for record in cursor.fetchall():
+                candidates.setdefault(
+                    (record["tablename"].lower(), record["columnname"].lower()),
+                    record["columnname"],
+                )
+
+        missing_indexes = []
+        for key in sorted(set(candidates) - indexed_columns):
+            if key[0] in tablenames:
+                missing_indexes.append(
+                    {
+                        "tablename": tablenames[key[0]],
+                        "columnname": candidates[key],
+                        "kind": "btree",
+                    }
+                )
+
+        if self._table_exists("gpkg_geometry_columns"):
+            cursor.execute(
+                """SELECT g.table_name AS tablename, g.column_name AS columnname
+                FROM gpkg_geometry_columns g
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM sqlite_master
+                    WHERE name = 'rtree_' || g.table_name || '_' || g.column_name
+                )
+                ORDER BY g.table_name, g.column_name;"""
+            )
+            for record in cursor.fetchall():
+                missing_indexes.append(
+                    {
+                        "tablename": record["tablename"],
+                        "columnname": record["columnname"],
+                        "kind": "spatial",
+                    }
+                )
+        cursor.close()
+        return missing_indexes
+
+    def create_index(self, index: dict) -> tuple[bool, str]:
+        cursor = self.conn.cursor()
+        try:
+            if index["kind"] == "spatial":
+                # the rtree and its triggers following the GeoPackage spec are created by spatialite, the
+                # amphibious mode lets its functions read the GeoPackage geometries to fill the rtree
+                index_name = "rtree_{}_{}".format(
+                    index["tablename"], index["columnname"]
+                )
+                cursor.execute("""SELECT EnableGpkgAmphibiousMode();""")
+                cursor.execute(
+                    """SELECT gpkgAddSpatialIndex(?, ?);""",
+                    (index["tablename"], index["columnname"]),
+                )
+                cursor.execute(
+                    """INSERT OR REPLACE INTO "{index_name}"
+                    SELECT rowid, ST_MinX("{column}"), ST_MaxX("{column}"), ST_MinY("{column}"), ST_MaxY("{column}")
+                    FROM "{table}"
+                    WHERE "{column}" IS NOT NULL AND NOT ST_IsEmpty("{column}");""".format(
+                        index_name=index_name,
+                        table=index["tablename"],
+                        column=index["columnname"],
+                    )
+                )
+                cursor.execute("""SELECT DisableGpkgAmphibiousMode();""")
+            else:
+                index_name = self.index_name(index["tablename"], [index["columnname"]])
+                # without IF NOT EXISTS an index of the same name on another column is reported
+                cursor.execute(
+                    """CREATE INDEX "{}" ON "{}" ("{}");""".format(
+                        index_name, index["tablename"], index["columnname"]
+                    )
+                )
+            self.conn.commit()
+            cursor.close()
+            return True, self.tr('Created index "{}" on {}.{}.').format(
+                index_name, index["tablename"], index["columnname"]
+            )
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            if index["kind"] == "spatial":
+                with contextlib.suppress(sqlite3.Error):
+                    cursor.execute("""SELECT DisableGpkgAmphibiousMode();""")
+            cursor.close()
+            error_message = " ".join(e.args)
+            return False, self.tr("Could not create index on {}.{}: {}").format(
+                index["tablename"], index["columnname"], error_message
+            )
+
+    def update_statistics(self) -> tuple[bool, str]:
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("""ANALYZE;""")
+            cursor.execute("""PRAGMA optimize;""")
+            self.conn.commit()
+            cursor.close()
+            return True, self.tr('Analyzed the GeoPackage "{}".').format(self.uri)
+        except sqlite3.Error as e:
+            cursor.close()
+            error_message = " ".join(e.args)
+            return False, self.tr("Could not analyze the GeoPackage: {}").format(
+                error_message
+            )
+
+    def get_missing_metadata_indexes(self) -> list[dict]:
+        tablenames, indexnames = self._table_and_index_names()
+        return [
+            index
+            for index in self.get_metadata_indexes()
+            if index["tablename"] in tablenames and index["name"] not in indexnames
+        ]
+
+    def create_metadata_indexes(self) -> tuple[bool, list[str]]:
+        missing_indexes = self.get_missing_metadata_indexes()
+        cursor = self.conn.cursor()
+        try:
+            for index in missing_indexes:
+                cursor.execute(
+                    """CREATE INDEX IF NOT EXISTS "{}" ON "{}" ({});""".format(
+                        index["name"],
+                        index["tablename"].upper(),
+                        ", ".join('"{}"'.format(column) for column in index["columns"]),
+                    )
+                )
+            self.conn.commit()
+            cursor.close()
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            cursor.close()
+            error_message = " ".join(e.args)
+            return False, [
+                self.tr("Could not create the meta table indexes: {}").format(
+                    error_message
+                )
+            ]
+
+        return True, [
+            self.tr('Created index "{}" on {}.').format(
+                index["name"], index["tablename"].upper()
+            )
+            for index in missing_indexes
+        ]
+
+    def drop_metadata_indexes(self) -> tuple[bool, list[str]]:
+        _, indexnames = self._table_and_index_names()
+        existing_indexes = [
+            index
+            for index in self.get_metadata_indexes()
+            if index["name"] in indexnames
+        ]
+        cursor = self.conn.cursor()
+        try:
+            for index in existing_indexes:
+                cursor.execute("""DROP INDEX IF EXISTS "{}";""".format(index["name"]))
+            self.conn.commit()
+            cursor.close()
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            cursor.close()
+            error_message = " ".join(e.args)
+            return False, [
+                self.tr("Could not drop the meta table indexes: {}").format(
+                    error_message
+                )
+            ]
+
+        return True, [
+            self.tr('Dropped index "{}" on {}.').format(
+                index["name"], index["tablename"].upper()
+            )
+            for index in existing_indexes
+        ]
+
+    def _table_and_index_names(self) -> tuple[set, set]:
+        # lower case, since sqlite compares the names case insensitive
+        cursor = self.conn.cursor()
+        cursor.execute("""SELECT type, name FROM sqlite_master;""")
+        tablenames = set()
+        indexnames = set()
+        for record in cursor.fetchall():
+            if record["type"] == "table":
+                tablenames.add(record["name"].lower())
+            elif record["type"] == "index":
+                indexnames.add(record["name"].lower())
+        cursor.close()
+        return tablenames, indexnames
+
     def get_translation_handling(self) -> tuple[bool, str]:
         return self._table_exists(GPKG_NLS_TABLE) and self._lang != "", self._lang
 
@@ -20,6 +20,7 @@ from typing import Optional
 import pyodbc
 from qgis.core import Qgis
 
+from .connection_pool import connection_pool
 from .db_connector import DBConnector, DBConnectorError
 
 METADATA_TABLE = "t_ili2db_table_prop"
@@ -34,8 +35,13 @@ class MssqlConnector(DBConnector):
     def __init__(self, uri, schema):
         DBConnector.__init__(self, uri, schema)
 
+        self._pool_key = "mssql:{}".format(uri)
         try:
-            self.conn = pyodbc.connect(uri)
+            self.conn = connection_pool.acquire(
+                self._pool_key,
+                lambda: pyodbc.connect(uri),
+                self._connection_alive,
+            )
         except (
             pyodbc.ProgrammingError,
             pyodbc.InterfaceError,
@@ -56,6 +62,29 @@ class MssqlConnector(DBConnector):
         self.basket_table_name = BASKET_TABLE
         self.dataset_table_name = DATASET_TABLE
 
+    def close(self) -> None:
+        conn = getattr(self, "conn", None)
+        if conn is not None:
+            self.conn = None
+            connection_pool.release(self._pool_key, conn, self._reset_connection)
+
+    @staticmethod
+    def _connection_alive(conn) -> bool:
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.close()
+            conn.rollback()
+        except pyodbc.Error:
+            return False
+        return True
+
+    @staticmethod
+    def _reset_connection(conn) -> bool:
+        # end a pending transaction, so the next connector starts on a clean connection
+        conn.rollback()
+        return True
+
     def map_data_types(self, data_type: str) -> str:
         result = data_type.lower()
         if "timestamp" in data_type:
@@ -489,95 +518,123 @@ class MssqlConnector(DBConnector):
         res = []
         # Get all fields for this table
         if self.schema:
-            metadata_exists = self.metadata_exists()
-            metaattrs_exists = self._table_exists(METAATTRS_TABLE)
-            tr_enabled, lang = self.get_translation_handling()
-            ln = "\n"
-            stmt = ""
+            cur = self.conn.cursor()
+            cur.execute(self._fields_info_statement(table_name))
+            res = self._get_dict_result(cur)
+        return res
 
-            # TODO description column is missing
-            stmt += ln + "SELECT"
-            stmt += ln + "     c.column_name"
+    def get_fields_info_bulk(self, table_names: list[str]) -> dict:
+        fields_index = {table_name: [] for table_name in table_names}
+        # Get all fields of all tables in the schema with one single query
+        if self.schema:
+            cur = self.conn.cursor()
+            cur.execute(self._fields_info_statement())
+            for record in self._get_dict_result(cur):
+                table_name = record.pop("tablename")
+                if table_name in fields_index:
+                    fields_index[table_name].append(record)
+        return fields_index
+
+    def _fields_info_statement(self, table_name: Optional[str] = None) -> str:
+        """
+        Returns the statement to get the fields info of the given table or, when no table is given, of all the tables in the schema.
+        In the second case the table name is additionally selected as `tablename`.
+        """
+        metadata_exists = self.metadata_exists()
+        metaattrs_exists = self._table_exists(METAATTRS_TABLE)
+        tr_enabled, lang = self.get_translation_handling()
+        ln = "\n"
+        stmt = ""
+
+        # TODO description column is missing
+        stmt += ln + "SELECT"
+        if not table_name:
+            stmt += ln + "     c.table_name AS tablename,"
+        stmt += ln + "     c.column_name"
+        stmt += (
+            ln
+            + "    , case c.data_type when 'decimal' then 'numeric' else c.DATA_TYPE end as data_type"
+        )
+        stmt += ln + "    , c.numeric_scale"
+        if metadata_exists:
+            stmt += ln + "    , unit.setting AS unit"
+            stmt += ln + "    , txttype.setting AS texttype"
+            stmt += ln + "    , alias.setting AS column_alias"
+            stmt += ln + "    , full_name.iliname AS fully_qualified_name"
             stmt += (
                 ln
-                + "    , case c.data_type when 'decimal' then 'numeric' else c.DATA_TYPE end as data_type"
+                + "    , CASE"
+                + "        WHEN enum_domain.setting IS NOT NULL"
+                + "        THEN CAST(CONCAT('[{{\"', enum_domain.setting, '\":null}}]') AS NVARCHAR(MAX))"
+                + "        ELSE CAST('[]' AS NVARCHAR(MAX))"
+                + "    END AS enum_domain"
             )
-            stmt += ln + "    , c.numeric_scale"
-            if metadata_exists:
-                stmt += ln + "    , unit.setting AS unit"
-                stmt += ln + "    , txttype.setting AS texttype"
-                stmt += ln + "    , alias.setting AS column_alias"
-                stmt += ln + "    , full_name.iliname AS fully_qualified_name"
+            stmt += ln + "    , oid_domain.setting AS oid_domain"
+            if metaattrs_exists:
                 stmt += (
                     ln
-                    + "    , CASE"
-                    + "        WHEN enum_domain.setting IS NOT NULL"
-                    + "        THEN CAST(CONCAT('[{{\"', enum_domain.setting, '\":null}}]') AS NVARCHAR(MAX))"
-                    + "        ELSE CAST('[]' AS NVARCHAR(MAX))"
-                    + "    END AS enum_domain"
+                    + "    , COALESCE(CAST(form_order.attr_value AS int), 999) AS attr_order"
+                    + "    , attr_mapping.attr_value AS attr_mapping"
                 )
-                stmt += ln + "    , oid_domain.setting AS oid_domain"
-                if metaattrs_exists:
-                    stmt += (
-                        ln
-                        + "    , COALESCE(CAST(form_order.attr_value AS int), 999) AS attr_order"
-                        + "    , attr_mapping.attr_value AS attr_mapping"
-                    )
-            stmt += ln + "    , null AS comment"
+        stmt += ln + "    , null AS comment"
+        if tr_enabled:
+            stmt += ln + "    , nls.label AS column_tr"
+        stmt += ln + "FROM INFORMATION_SCHEMA.COLUMNS AS c"
+        if metadata_exists:
+            stmt += ln + "LEFT JOIN {schema}.t_ili2db_column_prop unit"
+            stmt += ln + "    ON c.table_name = unit.tablename"
+            stmt += ln + "    AND c.column_name = unit.columnname"
+            stmt += ln + "    AND unit.tag = 'ch.ehi.ili2db.unit'"
+            stmt += ln + "LEFT JOIN {schema}.t_ili2db_column_prop txttype"
+            stmt += ln + "    ON c.table_name = txttype.tablename"
+            stmt += ln + "    AND c.column_name = txttype.columnname"
+            stmt += ln + "    AND txttype.tag = 'ch.ehi.ili2db.textKind'"
+            stmt += ln + "LEFT JOIN {schema}.t_ili2db_column_prop alias"
+            stmt += ln + "    ON c.table_name = alias.tablename"
+            stmt += ln + "    AND c.column_name = alias.columnname"
+            stmt += ln + "    AND alias.tag = 'ch.ehi.ili2db.dispName'"
+            stmt += ln + "LEFT JOIN {schema}.t_ili2db_attrname full_name"
+            stmt += ln + "    ON full_name.{}={}".format(
+                "owner" if self.ili_version() == 3 else "colowner",
+                "'{table}'" if table_name else "c.table_name",
+            )
+            stmt += ln + "    AND c.column_name=full_name.sqlname"
+            stmt += ln + "LEFT JOIN {schema}.t_ili2db_column_prop enum_domain"
+            stmt += ln + "    ON c.table_name = enum_domain.tablename"
+            stmt += ln + "    AND c.column_name = enum_domain.columnname"
+            stmt += ln + "    AND enum_domain.tag = 'ch.ehi.ili2db.enumDomain'"
+            stmt += ln + "LEFT JOIN {schema}.t_ili2db_column_prop oid_domain"
+            stmt += ln + "    ON c.table_name = oid_domain.tablename"
+            stmt += (
+                ln + "    AND LOWER(c.column_name) = LOWER(oid_domain.columnname)"
+            )
+            stmt += ln + "    AND oid_domain.tag = 'ch.ehi.ili2db.oidDomain'"
+            if metaattrs_exists:
+                stmt += ln + "LEFT JOIN {schema}.t_ili2db_meta_attrs form_order"
+                stmt += ln + "    ON full_name.iliname=form_order.ilielement AND"
+                stmt += ln + "    form_order.attr_name IN ("
+                stmt += ln + "        'form_order',"  # obsolete
+                stmt += ln + "        'qgis.modelbaker.form_order',"  # obsolete
+                stmt += ln + "        'qgis.modelbaker.formOrder')"
+                stmt += ln + "LEFT JOIN {schema}.t_ili2db_meta_attrs attr_mapping"
+                stmt += ln + "    ON full_name.iliname=attr_mapping.ilielement AND"
+                stmt += ln + "    attr_mapping.attr_name='ili2db.mapping'"
             if tr_enabled:
-                stmt += ln + "    , nls.label AS column_tr"
-            stmt += ln + "FROM INFORMATION_SCHEMA.COLUMNS AS c"
-            if metadata_exists:
-                stmt += ln + "LEFT JOIN {schema}.t_ili2db_column_prop unit"
-                stmt += ln + "    ON c.table_name = unit.tablename"
-                stmt += ln + "    AND c.column_name = unit.columnname"
-                stmt += ln + "    AND unit.tag = 'ch.ehi.ili2db.unit'"
-                stmt += ln + "LEFT JOIN {schema}.t_ili2db_column_prop txttype"
-                stmt += ln + "    ON c.table_name = txttype.tablename"
-                stmt += ln + "    AND c.column_name = txttype.columnname"
-                stmt += ln + "    AND txttype.tag = 'ch.ehi.ili2db.textKind'"
-                stmt += ln + "LEFT JOIN {schema}.t_ili2db_column_prop alias"
-                stmt += ln + "    ON c.table_name = alias.tablename"
-                stmt += ln + "    AND c.column_name = alias.columnname"
-                stmt += ln + "    AND alias.tag = 'ch.ehi.ili2db.dispName'"
-                stmt += ln + "LEFT JOIN {schema}.t_ili2db_attrname full_name"
-                stmt += ln + "    ON full_name.{}='{{table}}'".format(
-                    "owner" if self.ili_version() == 3 else "colowner"
-                )
-                stmt += ln + "    AND c.column_name=full_name.sqlname"
-                stmt += ln + "LEFT JOIN {schema}.t_ili2db_column_prop enum_domain"
-                stmt += ln + "    ON c.table_name = enum_domain.tablename"
-                stmt += ln + "    AND c.column_name = enum_domain.columnname"
-                stmt += ln + "    AND enum_domain.tag = 'ch.ehi.ili2db.enumDomain'"
-                stmt += ln + "LEFT JOIN {schema}.t_ili2db_column_prop oid_domain"
-                stmt += ln + "    ON c.table_name = oid_domain.tablename"
-                stmt += (
-                    ln + "    AND LOWER(c.column_name) = LOWER(oid_domain.columnname)"
-                )
-                stmt += ln + "    AND oid_domain.tag = 'ch.ehi.ili2db.oidDomain'"
-                if metaattrs_exists:
-                    stmt += ln + "LEFT JOIN {schema}.t_ili2db_meta_attrs form_order"
-                    stmt += ln + "    ON full_name.iliname=form_order.ilielement AND"
-                    stmt += ln + "    form_order.attr_name IN ("
-                    stmt += ln + "        'form_order',"  # obsolete
-                    stmt += ln + "        'qgis.modelbaker.form_order',"  # obsolete
-                    stmt += ln + "        'qgis.modelbaker.formOrder')"
-                    stmt += ln + "LEFT JOIN {schema}.t_ili2db_meta_attrs attr_mapping"
-                    stmt += ln + "    ON full_name.iliname=attr_mapping.ilielement AND"
-                    stmt += ln + "    attr_mapping.attr_name='ili2db.mapping'"
-                if tr_enabled:
-                    stmt += ln + "LEFT JOIN {schema}.t_ili2db_nls nls"
-                    stmt += ln + "    ON full_name.iliname = nls.ilielement"
-                    stmt += ln + "    AND nls.lang = '{lang}'".format(lang=lang)
+                stmt += ln + "LEFT JOIN {schema}.t_ili2db_nls nls"
+                stmt += ln + "    ON full_name.iliname = nls.ilielement"
+                stmt += ln + "    AND nls.lang = '{lang}'".format(lang=lang)
+        if table_name:
             stmt += ln + "WHERE TABLE_NAME = '{table}' AND TABLE_SCHEMA = '{schema}'"
             if metadata_exists and metaattrs_exists:
                 stmt += ln + "ORDER BY attr_order;"
-            stmt = stmt.format(schema=self.schema, table=table_name)
-
-            cur = self.conn.cursor()
-            cur.execute(stmt)
-            res = self._get_dict_result(cur)
-        return res
+        else:
+            # all the tables of the schema - the order per table stays the same as when querying a single table
+            stmt += ln + "WHERE TABLE_SCHEMA = '{schema}'"
+            if metadata_exists and metaattrs_exists:
+                stmt += ln + "ORDER BY c.table_name, attr_order, c.ordinal_position;"
+            else:
+                stmt += ln + "ORDER BY c.table_name, c.ordinal_position;"
+        return stmt.format(schema=self.schema, table=table_name)
 
     def get_min_max_info(self, table_name):
         result = {}
@@ -622,6 +679,42 @@ class MssqlConnector(DBConnector):
 
         return result
 
+    def get_min_max_info_bulk(self, table_names: list[str]) -> dict:
+        constraints_index = {table_name: dict() for table_name in table_names}
+        # Get all 'c'heck constraints of all tables in the schema with one single query
+        if self.schema:
+            constraints_cur = self.conn.cursor()
+            query = """
+                SELECT c.TABLE_NAME, cc.CHECK_CLAUSE
+                FROM
+                    INFORMATION_SCHEMA.CHECK_CONSTRAINTS cc INNER JOIN
+                    INFORMATION_SCHEMA.CONSTRAINT_COLUMN_USAGE c
+                        ON cc.CONSTRAINT_NAME = c.CONSTRAINT_NAME
+                        AND cc.CONSTRAINT_SCHEMA = c.CONSTRAINT_SCHEMA
+                WHERE
+                    cc.CONSTRAINT_SCHEMA = '{schema}'
+                """.format(  # nosec
+                schema=self.schema
+            )
+
+            constraints_cur.execute(query)
+
+            for constraint in constraints_cur:
+                if constraint[0] not in constraints_index:
+                    continue
+                m = re.match(
+                    r"\(\[(.*)\]>=\(([+-]?[0-9]+(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?)\) AND \[(.*)\]<=\(([+-]?[0-9]+(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?)\)\)",
+                    constraint[1],
+                )
+
+                if m:
+                    constraints_index[constraint[0]][m.group(1)] = (
+                        m.group(2),
+                        m.group(4),
+                    )
+
+        return constraints_index
+
     def get_t_type_map_info(self, table_name: str) -> dict:
         if self.schema and self.metadata_exists():
             cur = self.conn.cursor()
@@ -644,6 +737,27 @@ class MssqlConnector(DBConnector):
             return types_mapping
         return {}
 
+    def get_t_type_map_info_bulk(self, table_names: list[str]) -> dict:
+        types_index = {table_name: dict() for table_name in table_names}
+        if self.schema and self.metadata_exists():
+            cur = self.conn.cursor()
+            cur.execute(
+                """
+                SELECT *
+                FROM {}.t_ili2db_column_prop
+                WHERE tag = 'ch.ehi.ili2db.types'
+                """.format(  # nosec
+                    self.schema
+                )
+            )
+            for types_entry in self._get_dict_result(cur):
+                if types_entry["tablename"] in types_index:
+                    values = ast.literal_eval(types_entry["setting"])
+                    types_index[types_entry["tablename"]][
+                        types_entry["columnname"]
+                    ] = values
+        return types_index
+
     def get_relations_info(self, filter_layer_list: list[str] = []) -> list[dict]:
         result = []
 
@@ -1227,6 +1341,23 @@ WHERE TABLE_SCHEMA='{schema}'
             result = self._get_dict_result(cur)
         return result
 
+    def get_meta_table_counts(self) -> dict:
+        counts = {}
+        if self.schema:
+            cur = self.conn.cursor()
+            for tablename in ["t_ili2db_attrname", "t_ili2db_classname"]:
+                if not self._table_exists(tablename):
+                    continue
+                cur.execute(
+                    """
+                    SELECT count(*) FROM {schema}.{table};
+                    """.format(  # nosec
+                        schema=self.schema, table=tablename
+                    )
+                )
+                counts[tablename] = cur.fetchone()[0]
+        return counts
+
     def get_ili2db_sequence_value(self) -> str:
         # not implemented, return the next one
         return self.get_next_ili2db_sequence_value()
@@ -1269,6 +1400,310 @@ WHERE TABLE_SCHEMA='{schema}'
 
         return False, self.tr("Could not reset sequence")
 
+    def get_missing_indexes(self) -> list[dict]:
+        if not self.schema:
+            return []
+
+        # foreign key and basket columns and the references known by ili2db (even when created without --createFk)
+        attrname_candidates = ""
+        if self._table_exists("t_ili2db_attrname"):
+            attrname_candidates = """
+                UNION
+                SELECT {colowner}, sqlname
+                FROM {schema}.t_ili2db_attrname
+                WHERE target IS NOT NULL
+            """.format(  # nosec
+                colowner="owner" if self.ili_version() == 3 else "colowner",
+                schema=self.schema,
+            )
+
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            SELECT DISTINCT cand.tablename, cand.columnname
+            FROM (
+                SELECT t.name AS tablename, c.name AS columnname
+                FROM sys.foreign_key_columns fkc
+                JOIN sys.tables t ON t.object_id = fkc.parent_object_id
+                JOIN sys.schemas s ON s.schema_id = t.schema_id
+                JOIN sys.columns c
+                    ON c.object_id = fkc.parent_object_id AND c.column_id = fkc.parent_column_id
+                WHERE s.name = '{schema}' AND (
+                    SELECT count(*) FROM sys.foreign_key_columns fkc2
+                    WHERE fkc2.constraint_object_id = fkc.constraint_object_id
+                ) = 1
+                UNION
+                SELECT TABLE_NAME, COLUMN_NAME
+                FROM INFORMATION_SCHEMA.COLUMNS
+                WHERE TABLE_SCHEMA = '{schema}' AND LOWER(COLUMN_NAME) = 't_basket'
+                {attrname_candidates}
+            ) cand
+            JOIN sys.tables t ON t.name = cand.tablename
+            JOIN sys.schemas s ON s.schema_id = t.schema_id AND s.name = '{schema}'
+            JOIN sys.columns c ON c.object_id = t.object_id AND c.name = cand.columnname
+            WHERE NOT EXISTS (
+                SELECT 1 FROM sys.index_columns ic
+                WHERE ic.object_id = t.object_id AND ic.column_id = c.column_id
+                AND ic.key_ordinal = 1
+            )
+            ORDER BY cand.tablename, cand.columnname
+            """.format(  # nosec
+                schema=self.schema, attrname_candidates=attrname_candidates
+            )
+        )
+        missing_indexes = [
+            {
+                "tablename": row.tablename,
+                "columnname": row.columnname,
+                "kind": "btree",
+            }
+            for row in cur.fetchall()
+        ]
+
+        cur.execute(
+            """
+            SELECT t.name AS tablename, c.name AS columnname
+            FROM sys.columns c
+            JOIN sys.tables t ON t.object_id = c.object_id
+            JOIN sys.schemas s ON s.schema_id = t.schema_id
+            JOIN sys.types ty ON ty.user_type_id = c.user_type_id
+            WHERE s.name = '{schema}' AND ty.name = 'geometry' AND NOT EXISTS (
+                SELECT 1 FROM sys.index_columns ic
+                JOIN sys.indexes i ON i.object_id = ic.object_id AND i.index_id = ic.index_id
+                WHERE ic.object_id = t.object_id AND ic.column_id = c.column_id
+                AND i.type = 4
+            )
+            ORDER BY t.name, c.name
+            """.format(  # nosec
+                schema=self.schema
+            )
+        )
+        missing_indexes += [
+            {
+                "tablename": row.tablename,
+                "columnname": row.columnname,
+                "kind": "spatial",
+            }
+            for row in cur.fetchall()
+        ]
+        return missing_indexes
+
+    def create_index(self, index: dict) -> tuple[bool, str]:
+        if self.schema:
+            index_name = self.index_name(index["tablename"], [index["columnname"]])
+            cur = self.conn.cursor()
+            try:
+                if index["kind"] == "spatial":
+                    # a geometry index needs the bounding box of the data
+                    # (the envelope of a point or an axis-parallel line is no rectangle, its last point is the maximum)
+                    cur.execute(
+                        """
+                        SELECT
+                            MIN([{column}].STEnvelope().STPointN(1).STX),
+                            MIN([{column}].STEnvelope().STPointN(1).STY),
+                            MAX(COALESCE(
+                                [{column}].STEnvelope().STPointN(3).STX,
+                                [{column}].STEnvelope().STPointN([{column}].STEnvelope().STNumPoints()).STX
+                            )),
+                            MAX(COALESCE(
+                                [{column}].STEnvelope().STPointN(3).STY,
+                                [{column}].STEnvelope().STPointN([{column}].STEnvelope().STNumPoints()).STY
+                            ))
+                        FROM [{schema}].[{table}]
+                        """.format(  # nosec
+                            schema=self.schema,
+                            table=index["tablename"],
+                            column=index["columnname"],
+                        )
+                    )
+                    bounding_box = cur.fetchone()
+                    if bounding_box is None or None in bounding_box:
+                        return True, self.tr(
+                            "Skipped the spatial index on {}.{}, there are no geometries to define its extent."
+                        ).format(index["tablename"], index["columnname"])
+                    xmin, ymin, xmax, ymax = bounding_box
+                    # the bounding box must have an extent (e.g. a single point or an axis-parallel line)
+                    if xmin == xmax:
+                        xmin, xmax = xmin - 1, xmax + 1
+                    if ymin == ymax:
+                        ymin, ymax = ymin - 1, ymax + 1
+                    cur.execute(
+                        """
+                        CREATE SPATIAL INDEX [{index_name}] ON [{schema}].[{table}] ([{column}])
+                        USING GEOMETRY_AUTO_GRID
+                        WITH (BOUNDING_BOX = ({xmin}, {ymin}, {xmax}, {ymax}))
+                        """.format(  # nosec
+                            index_name=index_name,
+                            schema=self.schema,
+                            table=index["tablename"],
+                            column=index["columnname"],
+                            xmin=xmin,
+                            ymin=ymin,
+                            xmax=xmax,
+                            ymax=ymax,
+                        )
+                    )
+                else:
+                    cur.execute(
+                        """
+                        CREATE INDEX [{index_name}] ON [{schema}].[{table}] ([{column}])
+                        """.format(  # nosec
+                            index_name=index_name,
+                            schema=self.schema,
+                            table=index["tablename"],
+                            column=index["columnname"],
+                        )
+                    )
+                self.conn.commit()
+                return True, self.tr('Created index "{}" on {}.{}.').format(
+                    index_name, index["tablename"], index["columnname"]
+                )
+            except pyodbc.Error as e:
+                self.conn.rollback()
+                error_message = " ".join(e.args)
+                return False, self.tr("Could not create index on {}.{}: {}").format(
+                    index["tablename"], index["columnname"], error_message
+                )
+
+        return False, self.tr("Could not create index")
+
+    def update_statistics(self) -> tuple[bool, str]:
+        if self.schema:
+            cur = self.conn.cursor()
+            try:
+                cur.execute(
+                    """
+                    SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES
+                    WHERE TABLE_TYPE = 'BASE TABLE' AND TABLE_SCHEMA = '{}'
+                    """.format(  # nosec
+                        self.schema
+                    )
+                )
+                tablenames = [row.TABLE_NAME for row in cur.fetchall()]
+                for tablename in tablenames:
+                    cur.execute(
+                        "UPDATE STATISTICS [{}].[{}]".format(  # nosec
+                            self.schema, tablename
+                        )
+                    )
+                self.conn.commit()
+                return True, self.tr(
+                    'Updated the statistics of {} tables of schema "{}".'
+                ).format(len(tablenames), self.schema)
+            except pyodbc.Error as e:
+                self.conn.rollback()
+                error_message = " ".join(e.args)
+                return False, self.tr("Could not update statistics: {}").format(
+                    error_message
+                )
+
+        return False, self.tr("Could not update statistics")
+
+    def get_missing_metadata_indexes(self) -> list[dict]:
+        if not self.schema:
+            return []
+
+        tablenames, indexnames = self._table_and_index_names()
+        return [
+            index
+            for index in self.get_metadata_indexes()
+            if index["tablename"] in tablenames and index["name"] not in indexnames
+        ]
+
+    def create_metadata_indexes(self) -> tuple[bool, list[str]]:
+        if not self.schema:
+            return False, [self.tr("Could not create the meta table indexes")]
+
+        missing_indexes = self.get_missing_metadata_indexes()
+        cur = self.conn.cursor()
+        try:
+            for index in missing_indexes:
+                cur.execute(
+                    """
+                    CREATE INDEX [{index_name}] ON [{schema}].[{table}] ({columns})
+                    """.format(  # nosec
+                        index_name=index["name"],
+                        schema=self.schema,
+                        table=index["tablename"],
+                        columns=", ".join(
+                            "[{}]".format(column) for column in index["columns"]
+                        ),
+                    )
+                )
+            self.conn.commit()
+        except pyodbc.Error as e:
+            self.conn.rollback()
+            error_message = " ".join(e.args)
+            return False, [
+                self.tr("Could not create the meta table indexes: {}").format(
+                    error_message
+                )
+            ]
+
+        return True, [
+            self.tr('Created index "{}" on {}.').format(
+                index["name"], index["tablename"]
+            )
+            for index in missing_indexes
+        ]
+
+    def drop_metadata_indexes(self) -> tuple[bool, list[str]]:
+        if not self.schema:
+            return False, [self.tr("Could not drop the meta table indexes")]
+
+        _, indexnames = self._table_and_index_names()
+        existing_indexes = [
+            index
+            for index in self.get_metadata_indexes()
+            if index["name"] in indexnames
+        ]
+        cur = self.conn.cursor()
+        try:
+            for index in existing_indexes:
+                cur.execute(
+                    "DROP INDEX [{}] ON [{}].[{}]".format(  # nosec
+                        index["name"], self.schema, index["tablename"]
+                    )
+                )
+            self.conn.commit()
+        except pyodbc.Error as e:
+            self.conn.rollback()
+            error_message = " ".join(e.args)
+            return False, [
+                self.tr("Could not drop the meta table indexes: {}").format(
+                    error_message
+                )
+            ]
+
+        return True, [
+            self.tr('Dropped index "{}" on {}.').format(
+                index["name"], index["tablename"]
+            )
+            for index in existing_indexes
+        ]
+
+    def _table_and_index_names(self) -> tuple[set, set]:
+        # lower case, since the default collation compares the names case insensitive
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            SELECT t.name AS tablename, i.name AS indexname
+            FROM sys.tables t
+            JOIN sys.schemas s ON s.schema_id = t.schema_id
+            LEFT JOIN sys.indexes i ON i.object_id = t.object_id
+            WHERE s.name = '{}'
+            """.format(  # nosec
+                self.schema
+            )
+        )
+        tablenames = set()
+        indexnames = set()
+        for row in cur.fetchall():
+            tablenames.add(row.tablename.lower())
+            if row.indexname:
+                indexnames.add(row.indexname.lower())
+        return tablenames, indexnames
+
     def get_translation_handling(self) -> tuple[bool, str]:
         return self._table_exists(NLS_TABLE) and self._lang != "", self._lang
 
@@ -12,7 +12,9 @@ License:
 """
 
 import ast
+import concurrent.futures
 import logging
+import os
 import re
 from typing import Optional
 
@@ -21,6 +23,8 @@ import psycopg2.extras
 from psycopg2 import OperationalError, sql
 from qgis.core import Qgis
 
+from .config import BULK_LOAD_JOURNAL_TABLE
+from .connection_pool import connection_pool
 from .db_connector import DBConnector, DBConnectorError
 
 PG_METADATA_TABLE = "t_ili2db_table_prop"
@@ -38,11 +42,17 @@ class PGConnector(DBConnector):
     def __init__(self, uri, schema):
         DBConnector.__init__(self, uri, schema)
 
+        self._pool_key = "pg:{}".format(uri)
         try:
-            self.conn = psycopg2.connect(uri)
+            self.conn = connection_pool.acquire(
+                self._pool_key,
+                lambda: psycopg2.connect(uri),
+                self._connection_alive,
+            )
         except OperationalError as e:
             raise DBConnectorError(str(e), e)
 
+        self.uri = uri
         self.schema = schema
         self._bMetadataTable = self._metadata_exists()
         self.iliCodeName = "ilicode"
@@ -55,6 +65,30 @@ class PGConnector(DBConnector):
         self.dataset_table_name = PG_DATASET_TABLE
         self.enum_table_name = PG_ENUM_TABLE
 
+    def close(self) -> None:
+        conn = getattr(self, "conn", None)
+        if conn is not None:
+            self.conn = None
+            connection_pool.release(self._pool_key, conn, self._reset_connection)
+
+    @staticmethod
+    def _connection_alive(conn) -> bool:
+        if conn.closed:
+            return False
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            conn.rollback()
+        except psycopg2.Error:
+            return False
+        return True
+
+    @staticmethod
+    def _reset_connection(conn) -> bool:
+        # end a pending transaction, so the next connector starts on a clean connection
+        conn.rollback()
+        return not conn.closed
+
     def map_data_types(self, data_type: str) -> str:
         if not data_type:
             data_type = ""
@@ -456,203 +490,215 @@ class PGConnector(DBConnector):
 
     def get_fields_info(self, table_name):
         # Get all fields for this table
-        if self.schema:
+        if self.schema and self.metadata_exists():
             fields_cur = self.conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+            fields_cur.execute(self._fields_info_statement(table_name))
+            return fields_cur
 
-            unit_field = ""
-            text_kind_field = ""
-            full_name_field = ""
-            enum_domain_structure = ""
-            oid_domain_field = ""
-            attr_order_field = ""
-            attr_mapping_field = ""
-            translations = ""
-            column_alias = ""
-            unit_join = ""
-            text_kind_join = ""
-            disp_name_join = ""
-            full_name_join = ""
-            enum_domain_join = ""
-            oid_domain_join = ""
-            attr_order_join = ""
-            attr_mapping_join = ""
-            translations_left_join = ""
-            order_by_attr_order = ""
-
-            if self.metadata_exists():
-                tr_enabled, lang = self.get_translation_handling()
+        return []
 
-                unit_field = "unit.setting AS unit,"
-                text_kind_field = "txttype.setting AS texttype,"
-                column_alias = "alias.setting AS column_alias,"
-                full_name_field = "full_name.iliname as fully_qualified_name,"
-                # In Smart1, a field can have multiple types (enum_domains) due to inherited enumerations.
-                # To handle this, we create a JSON dict containing:
-                #   - 'type': The specific type
-                #   - 't_type': The targetable type used for filtering
-                enum_domain_structure = """COALESCE(
-                    json_agg(
-                    json_build_object(enum_domain.setting, enum_domain.subtype)
-                    ) FILTER (WHERE enum_domain.setting IS NOT NULL),
-                    '[]'::json
-                ) AS enum_domain,"""
-                oid_domain_field = "oid_domain.setting as oid_domain,"
-                translations = """nls.label AS column_tr,""" if tr_enabled else ""
-                unit_join = """LEFT JOIN {}.t_ili2db_column_prop unit
-                                                    ON c.table_name=unit.tablename AND
-                                                    c.column_name=unit.columnname AND
-                                                    unit.tag = 'ch.ehi.ili2db.unit'""".format(  # nosec
-                    self.schema
-                )
-                text_kind_join = """LEFT JOIN {}.t_ili2db_column_prop txttype
-                                                        ON c.table_name=txttype.tablename AND
-                                                        c.column_name=txttype.columnname AND
-                                                        txttype.tag = 'ch.ehi.ili2db.textKind'""".format(  # nosec
-                    self.schema
-                )
-                disp_name_join = """LEFT JOIN {}.t_ili2db_column_prop alias
-                                                        ON c.table_name=alias.tablename AND
-                                                        c.column_name=alias.columnname AND
-                                                        alias.tag = 'ch.ehi.ili2db.dispName'""".format(  # nosec
-                    self.schema
-                )
-                full_name_join = """LEFT JOIN {}.t_ili2db_attrname full_name
-                                                            ON full_name.{}='{}' AND
-                                                            c.column_name=full_name.sqlname
-                                                            """.format(  # nosec
-                    self.schema,
-                    "owner" if self.ili_version() == 3 else "colowner",
-                    table_name,
-                )
-                enum_domain_join = """LEFT JOIN {}.t_ili2db_column_prop enum_domain
-                                                    ON c.table_name=enum_domain.tablename AND
-                                                    c.column_name=enum_domain.columnname AND
-                                                    enum_domain.tag = 'ch.ehi.ili2db.enumDomain'""".format(  # nosec
-                    self.schema
-                )
-                oid_domain_join = """LEFT JOIN {}.t_ili2db_column_prop oid_domain
-                                                    ON c.table_name=oid_domain.tablename AND
-                                                    lower(c.column_name)=lower(oid_domain.columnname) AND
-                                                    oid_domain.tag = 'ch.ehi.ili2db.oidDomain'""".format(  # nosec
-                    self.schema
-                )
+    def get_fields_info_bulk(self, table_names: list[str]) -> dict:
+        # Get all fields of all tables in the schema with one single query
+        fields_index = {table_name: [] for table_name in table_names}
+        if self.schema and self.metadata_exists():
+            fields_cur = self.conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+            fields_cur.execute(self._fields_info_statement())
+            for record in fields_cur:
+                my_rec = {key: value for key, value in record.items()}
+                table_name = my_rec.pop("tablename")
+                if table_name in fields_index:
+                    fields_index[table_name].append(my_rec)
+
+        return fields_index
+
+    def _fields_info_statement(self, table_name: Optional[str] = None) -> str:
+        """
+        Returns the statement to get the fields info of the given table or, when no table is given, of all the tables in the schema.
+        In the second case the table name is additionally selected as `tablename`.
+        """
+        tablename_field = ""
+        attr_order_field = ""
+        attr_mapping_field = ""
+        attr_order_join = ""
+        attr_mapping_join = ""
+        translations_left_join = ""
+        order_by_attr_order = ""
+
+        tr_enabled, lang = self.get_translation_handling()
+
+        # In Smart1, a field can have multiple types (enum_domains) due to inherited enumerations.
+        # To handle this, we create a JSON dict containing:
+        #   - 'type': The specific type
+        #   - 't_type': The targetable type used for filtering
+        enum_domain_structure = """COALESCE(
+            json_agg(
+            json_build_object(enum_domain.setting, enum_domain.subtype)
+            ) FILTER (WHERE enum_domain.setting IS NOT NULL),
+            '[]'::json
+        ) AS enum_domain,"""
+        translations = """nls.label AS column_tr,""" if tr_enabled else ""
+        unit_join = """LEFT JOIN {}.t_ili2db_column_prop unit
+                                            ON c.table_name=unit.tablename AND
+                                            c.column_name=unit.columnname AND
+                                            unit.tag = 'ch.ehi.ili2db.unit'""".format(  # nosec
+            self.schema
+        )
+        text_kind_join = """LEFT JOIN {}.t_ili2db_column_prop txttype
+                                                ON c.table_name=txttype.tablename AND
+                                                c.column_name=txttype.columnname AND
+                                                txttype.tag = 'ch.ehi.ili2db.textKind'""".format(  # nosec
+            self.schema
+        )
+        disp_name_join = """LEFT JOIN {}.t_ili2db_column_prop alias
+                                                ON c.table_name=alias.tablename AND
+                                                c.column_name=alias.columnname AND
+                                                alias.tag = 'ch.ehi.ili2db.dispName'""".format(  # nosec
+            self.schema
+        )
+        full_name_join = """LEFT JOIN {}.t_ili2db_attrname full_name
+                                                    ON full_name.{}={} AND
+                                                    c.column_name=full_name.sqlname
+                                                    """.format(  # nosec
+            self.schema,
+            "owner" if self.ili_version() == 3 else "colowner",
+            "'{}'".format(table_name) if table_name else "c.table_name",
+        )
+        enum_domain_join = """LEFT JOIN {}.t_ili2db_column_prop enum_domain
+                                            ON c.table_name=enum_domain.tablename AND
+                                            c.column_name=enum_domain.columnname AND
+                                            enum_domain.tag = 'ch.ehi.ili2db.enumDomain'""".format(  # nosec
+            self.schema
+        )
+        oid_domain_join = """LEFT JOIN {}.t_ili2db_column_prop oid_domain
+                                            ON c.table_name=oid_domain.tablename AND
+                                            lower(c.column_name)=lower(oid_domain.columnname) AND
+                                            oid_domain.tag = 'ch.ehi.ili2db.oidDomain'""".format(  # nosec
+            self.schema
+        )
 
-                metaattr_groupby_part = ""
-                if self._table_exists(PG_METAATTRS_TABLE):
-                    attr_order_field = "COALESCE(to_number(form_order.attr_value, '999'), 999) as attr_order,"
-                    attr_order_join = """LEFT JOIN {schema}.{t_ili2db_meta_attrs} form_order
-                                                            ON full_name.iliname=form_order.ilielement AND
-                                                            form_order.attr_name IN (
-                                                                'form_order', --obsolete
-                                                                'qgis.modelbaker.form_order', --obsolete
-                                                                'qgis.modelbaker.formOrder')
-                                                            """.format(  # nosec
-                        schema=self.schema, t_ili2db_meta_attrs=PG_METAATTRS_TABLE
-                    )
-                    order_by_attr_order = """ORDER BY attr_order, ordinal_position --to keep the sort of the occurence"""
+        metaattr_groupby_part = ""
+        if self._table_exists(PG_METAATTRS_TABLE):
+            attr_order_field = "COALESCE(to_number(form_order.attr_value, '999'), 999) as attr_order,"
+            attr_order_join = """LEFT JOIN {schema}.{t_ili2db_meta_attrs} form_order
+                                                    ON full_name.iliname=form_order.ilielement AND
+                                                    form_order.attr_name IN (
+                                                        'form_order', --obsolete
+                                                        'qgis.modelbaker.form_order', --obsolete
+                                                        'qgis.modelbaker.formOrder')
+                                                    """.format(  # nosec
+                schema=self.schema, t_ili2db_meta_attrs=PG_METAATTRS_TABLE
+            )
+            order_by_attr_order = """attr_order, ordinal_position --to keep the sort of the occurence"""
+
+            attr_mapping_field = "meta_attr_mapping_value.attr_value as attr_mapping,"
+            attr_mapping_join = """LEFT JOIN {schema}.{t_ili2db_meta_attrs} meta_attr_mapping_value
+                                                    ON full_name.iliname=meta_attr_mapping_value.ilielement AND
+                                                    meta_attr_mapping_value.attr_name='ili2db.mapping'
+                                                    """.format(  # nosec
+                schema=self.schema, t_ili2db_meta_attrs=PG_METAATTRS_TABLE
+            )
 
-                    attr_mapping_field = (
-                        "meta_attr_mapping_value.attr_value as attr_mapping,"
-                    )
-                    attr_mapping_join = """LEFT JOIN {schema}.{t_ili2db_meta_attrs} meta_attr_mapping_value
-                                                            ON full_name.iliname=meta_attr_mapping_value.ilielement AND
-                                                            meta_attr_mapping_value.attr_name='ili2db.mapping'
-                                                            """.format(  # nosec
-                        schema=self.schema, t_ili2db_meta_attrs=PG_METAATTRS_TABLE
-                    )
+            translations_left_join = (
+                """LEFT JOIN {}.t_ili2db_nls nls
+                                  ON full_name.iliname = nls.ilielement
+                                  AND nls.lang = '{}'
+                            """.format(  # nosec
+                    self.schema, lang
+                )
+                if tr_enabled
+                else ""
+            )
 
-                    translations_left_join = (
-                        """LEFT JOIN {}.t_ili2db_nls nls
-                                          ON full_name.iliname = nls.ilielement
-                                          AND nls.lang = '{}'
-                                    """.format(  # nosec
-                            self.schema, lang
-                        )
-                        if tr_enabled
-                        else ""
-                    )
+            metaattr_groupby_part = """form_order.attr_value,
+                meta_attr_mapping_value.attr_value,"""
 
-                    metaattr_groupby_part = """form_order.attr_value,
-                        meta_attr_mapping_value.attr_value,"""
-
-                # group by because of coalesce in the enum domain
-                group_by = """GROUP BY
-                    c.column_name,
-                    c.data_type,
-                    c.numeric_scale,
-                    unit.setting,
-                    txttype.setting,
-                    alias.setting,
-                    full_name.iliname,
-                    oid_domain.setting,
-                    {metaattr_part}
-                    pgd.description,
-                    {translation_label}
-                    c.ordinal_position
-                """.format(  # nosec
-                    metaattr_part=metaattr_groupby_part,
-                    translation_label="nls.label," if tr_enabled else "",
-                )
+        if table_name:
+            table_where = """st.relid = '{schema}."{table}"'::regclass""".format(  # nosec
+                schema=self.schema, table=table_name
+            )
+            order_by = (
+                "ORDER BY {}".format(order_by_attr_order) if order_by_attr_order else ""
+            )
+        else:
+            # all the tables of the schema - the order per table stays the same as when querying a single table
+            tablename_field = "c.table_name AS tablename,"
+            table_where = "st.schemaname = '{schema}'".format(  # nosec
+                schema=self.schema
+            )
+            order_by = "ORDER BY c.table_name, {}".format(
+                order_by_attr_order or "ordinal_position"
+            )
 
-                fields_cur.execute(
-                    """
-                    SELECT
-                      c.column_name,
-                      c.data_type,
-                      c.numeric_scale,
-                      {unit_field}
-                      {text_kind_field}
-                      {column_alias}
-                      {full_name_field}
-                      {enum_domain_structure}
-                      {oid_domain_field}
-                      {attr_order_field}
-                      {attr_mapping_field}
-                      {translations}
-                      pgd.description AS comment
-                    FROM pg_catalog.pg_statio_all_tables st
-                    LEFT JOIN information_schema.columns c ON c.table_schema=st.schemaname AND c.table_name=st.relname
-                    LEFT JOIN pg_catalog.pg_description pgd ON pgd.objoid=st.relid AND pgd.objsubid=c.ordinal_position
-                    {unit_join}
-                    {text_kind_join}
-                    {disp_name_join}
-                    {full_name_join}
-                    {enum_domain_join}
-                    {oid_domain_join}
-                    {attr_order_join}
-                    {attr_mapping_join}
-                    {translations_left_join}
-                    WHERE st.relid = '{schema}."{table}"'::regclass
-                    {group_by}
-                    {order_by_attr_order};
-                    """.format(  # nosec
-                        schema=self.schema,
-                        table=table_name,
-                        unit_field=unit_field,
-                        text_kind_field=text_kind_field,
-                        column_alias=column_alias,
-                        full_name_field=full_name_field,
-                        enum_domain_structure=enum_domain_structure,
-                        oid_domain_field=oid_domain_field,
-                        attr_order_field=attr_order_field,
-                        attr_mapping_field=attr_mapping_field,
-                        translations=translations,
-                        unit_join=unit_join,
-                        text_kind_join=text_kind_join,
-                        disp_name_join=disp_name_join,
-                        full_name_join=full_name_join,
-                        enum_domain_join=enum_domain_join,
-                        oid_domain_join=oid_domain_join,
-                        attr_order_join=attr_order_join,
-                        attr_mapping_join=attr_mapping_join,
-                        translations_left_join=translations_left_join,
-                        group_by=group_by,
-                        order_by_attr_order=order_by_attr_order,
-                    )
-                )
-                return fields_cur
+        # group by because of coalesce in the enum domain
+        group_by = """GROUP BY
+            c.table_name,
+            c.column_name,
+            c.data_type,
+            c.numeric_scale,
+            unit.setting,
+            txttype.setting,
+            alias.setting,
+            full_name.iliname,
+            oid_domain.setting,
+            {metaattr_part}
+            pgd.description,
+            {translation_label}
+            c.ordinal_position
+        """.format(  # nosec
+            metaattr_part=metaattr_groupby_part,
+            translation_label="nls.label," if tr_enabled else "",
+        )
 
-        return []
+        return """
+            SELECT
+              {tablename_field}
+              c.column_name,
+              c.data_type,
+              c.numeric_scale,
+              unit.setting AS unit,
+              txttype.setting AS texttype,
+              alias.setting AS column_alias,
+              full_name.iliname as fully_qualified_name,
+              {enum_domain_structure}
+              oid_domain.setting as oid_domain,
+              {attr_order_field}
+              {attr_mapping_field}
+              {translations}
+              pgd.description AS comment
+            FROM pg_catalog.pg_statio_all_tables st
+            LEFT JOIN information_schema.columns c ON c.table_schema=st.schemaname AND c.table_name=st.relname
+            LEFT JOIN pg_catalog.pg_description pgd ON pgd.objoid=st.relid AND pgd.objsubid=c.ordinal_position
+            {unit_join}
+            {text_kind_join}
+            {disp_name_join}
+            {full_name_join}
+            {enum_domain_join}
+            {oid_domain_join}
+            {attr_order_join}
+            {attr_mapping_join}
+            {translations_left_join}
+            WHERE {table_where}
+            {group_by}
+            {order_by};
+            """.format(  # nosec
+            tablename_field=tablename_field,
+            enum_domain_structure=enum_domain_structure,
+            attr_order_field=attr_order_field,
+            attr_mapping_field=attr_mapping_field,
+            translations=translations,
+            unit_join=unit_join,
+            text_kind_join=text_kind_join,
+            disp_name_join=disp_name_join,
+            full_name_join=full_name_join,
+            enum_domain_join=enum_domain_join,
+            oid_domain_join=oid_domain_join,
+            attr_order_join=attr_order_join,
+            attr_mapping_join=attr_mapping_join,
+            translations_left_join=translations_left_join,
+            table_where=table_where,
+            group_by=group_by,
+            order_by=order_by,
+        )
 
     def get_min_max_info(self, table_name):
         # Get all 'c'heck constraints for this table
@@ -686,6 +732,38 @@ class PGConnector(DBConnector):
 
         return {}
 
+    def get_min_max_info_bulk(self, table_names: list[str]) -> dict:
+        # Get all 'c'heck constraints of all tables in the schema with one single query
+        constraints_index = {table_name: dict() for table_name in table_names}
+        if self.schema:
+            constraints_cur = self.conn.cursor(
+                cursor_factory=psycopg2.extras.DictCursor
+            )
+            constraints_cur.execute(
+                r"""
+                SELECT
+                  cls.relname AS tablename,
+                  regexp_matches(pg_get_constraintdef(con.oid), 'CHECK \(\(\((.*) >= [\'']?([-]?[\d\.]+)[\''::integer|numeric]*\) AND \((.*) <= [\'']?([-]?[\d\.]+)[\''::integer|numeric]*\)\)\)') AS check_details
+                FROM pg_constraint con
+                JOIN pg_class cls ON cls.oid = con.conrelid
+                JOIN pg_namespace nsp ON nsp.oid = cls.relnamespace
+                WHERE nsp.nspname = %s
+                AND con.contype = 'c'
+                """,
+                (self.schema,),
+            )
+
+            for constraint in constraints_cur:
+                if constraint["tablename"] in constraints_index:
+                    constraints_index[constraint["tablename"]][
+                        constraint["check_details"][0]
+                    ] = (
+                        constraint["check_details"][1],
+                        constraint["check_details"][3],
+                    )
+
+        return constraints_index
+
     _ValueMapRegExp = re.compile(".*'(.*)'::.*")
 
     def get_value_map_info(self, table_name) -> dict:
@@ -719,6 +797,40 @@ class PGConnector(DBConnector):
 
         return {}
 
+    def get_value_map_info_bulk(self, table_names: list[str]) -> dict:
+        constraints_index = {table_name: dict() for table_name in table_names}
+        if self.schema:
+            constraints_cur = self.conn.cursor(
+                cursor_factory=psycopg2.extras.DictCursor
+            )
+            constraints_cur.execute(
+                r"""
+                SELECT
+                  cls.relname AS tablename,
+                  regexp_matches(pg_get_constraintdef(con.oid), 'CHECK \(\(\((.*)\)::text = ANY \(\(ARRAY\[(.*)\]\)::text\[\]\)\)\)') AS check_details
+                FROM pg_constraint con
+                JOIN pg_class cls ON cls.oid = con.conrelid
+                JOIN pg_namespace nsp ON nsp.oid = cls.relnamespace
+                WHERE nsp.nspname = %s
+                AND con.contype = 'c'
+                """,
+                (self.schema,),
+            )
+
+            for constraint in constraints_cur:
+                if constraint["tablename"] not in constraints_index:
+                    continue
+                values = list()
+                for value in constraint["check_details"][1].split(","):
+                    match = re.match(PGConnector._ValueMapRegExp, value)
+                    values.append(match.group(1))
+
+                constraints_index[constraint["tablename"]][
+                    constraint["check_details"][0]
+                ] = values
+
+        return constraints_index
+
     def get_t_type_map_info(self, table_name: str) -> dict:
         if self.schema and self.metadata_exists():
             cur = self.conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
@@ -742,6 +854,27 @@ class PGConnector(DBConnector):
             return types_mapping
         return {}
 
+    def get_t_type_map_info_bulk(self, table_names: list[str]) -> dict:
+        types_index = {table_name: dict() for table_name in table_names}
+        if self.schema and self.metadata_exists():
+            cur = self.conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+            cur.execute(
+                sql.SQL(
+                    """
+                    SELECT *
+                    FROM {}.t_ili2db_column_prop
+                    WHERE tag = 'ch.ehi.ili2db.types'
+                    """
+                ).format(sql.Identifier(self.schema))
+            )
+            for types_entry in cur.fetchall():
+                if types_entry["tablename"] in types_index:
+                    values = ast.literal_eval(types_entry["setting"])
+                    types_index[types_entry["tablename"]][
+                        types_entry["columnname"].lower()
+                    ] = values
+        return types_index
+
     def get_relations_info(self, filter_layer_list: list[str] = []) -> list[dict]:
         if self.schema:
             cur = self.conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
@@ -1452,6 +1585,23 @@ class PGConnector(DBConnector):
             result = cur.fetchall()
         return result
 
+    def get_meta_table_counts(self) -> dict:
+        counts = {}
+        if self.schema:
+            cur = self.conn.cursor()
+            for tablename in ["t_ili2db_attrname", "t_ili2db_classname"]:
+                if not self._table_exists(tablename):
+                    continue
+                cur.execute(
+                    sql.SQL(
+                        """
+                        SELECT count(*) FROM {}.{};
+                        """
+                    ).format(sql.Identifier(self.schema), sql.Identifier(tablename))
+                )
+                counts[tablename] = cur.fetchone()[0]
+        return counts
+
     def get_ili2db_sequence_value(self) -> str:
         if self.schema:
             cur = self.conn.cursor()
@@ -1510,6 +1660,521 @@ class PGConnector(DBConnector):
 
         return False, self.tr("Could not reset sequence")
 
+    def get_missing_indexes(self) -> list[dict]:
+        if not self.schema:
+            return []
+
+        # foreign key and basket columns and the references known by ili2db (even when created without --createFk)
+        candidates = [
+            sql.SQL(
+                """
+                SELECT c.relname::text, a.attname::text
+                FROM pg_catalog.pg_constraint con
+                JOIN pg_catalog.pg_class c ON c.oid = con.conrelid
+                JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+                JOIN pg_catalog.pg_attribute a
+                  ON a.attrelid = con.conrelid AND a.attnum = con.conkey[1]
+                WHERE con.contype = 'f' AND array_length(con.conkey, 1) = 1
+                  AND n.nspname = {schema}
+                UNION
+                SELECT table_name::text, column_name::text
+                FROM information_schema.columns
+                WHERE table_schema = {schema} AND column_name = 't_basket'
+                """
+            ).format(schema=sql.Literal(self.schema))
+        ]
+        if self._table_exists("t_ili2db_attrname"):
+            candidates.append(
+                sql.SQL(
+                    """
+                    SELECT {colowner}::text, sqlname::text
+                    FROM {schema}.t_ili2db_attrname
+                    WHERE target IS NOT NULL
+                    """
+                ).format(
+                    colowner=sql.Identifier(
+                        "owner" if self.ili_version() == 3 else "colowner"
+                    ),
+                    schema=sql.Identifier(self.schema),
+                )
+            )
+
+        cur = self.conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+        cur.execute(
+            sql.SQL(
+                """
+                WITH candidates(tablename, columnname) AS ({candidates})
+                SELECT DISTINCT cand.tablename, cand.columnname, 'btree' AS kind
+                FROM candidates cand
+                JOIN pg_catalog.pg_namespace n ON n.nspname = %(schema)s
+                JOIN pg_catalog.pg_class c
+                  ON c.relnamespace = n.oid AND c.relname = cand.tablename AND c.relkind = 'r'
+                JOIN pg_catalog.pg_attribute a
+                  ON a.attrelid = c.oid AND a.attname = cand.columnname AND NOT a.attisdropped
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM pg_catalog.pg_index i
+                    WHERE i.indrelid = c.oid AND i.indkey[0] = a.attnum
+                )
+                ORDER BY cand.tablename, cand.columnname
+                """
+            ).format(candidates=sql.SQL(" UNION ").join(candidates)),
+            {"schema": self.schema},
+        )
+        missing_indexes = [dict(record) for record in cur.fetchall()]
+
+        if self._postgis_exists():
+            cur.execute(
+                """
+                SELECT g.f_table_name AS tablename, g.f_geometry_column AS columnname, 'spatial' AS kind
+                FROM public.geometry_columns g
+                JOIN pg_catalog.pg_namespace n ON n.nspname = g.f_table_schema
+                JOIN pg_catalog.pg_class c
+                  ON c.relnamespace = n.oid AND c.relname = g.f_table_name AND c.relkind = 'r'
+                JOIN pg_catalog.pg_attribute a
+                  ON a.attrelid = c.oid AND a.attname = g.f_geometry_column
+                WHERE g.f_table_schema = %s AND NOT EXISTS (
+                    SELECT 1 FROM pg_catalog.pg_index i
+                    JOIN pg_catalog.pg_class ic ON ic.oid = i.indexrelid
+                    JOIN pg_catalog.pg_am am ON am.oid = ic.relam
+                    WHERE i.indrelid = c.oid AND i.indkey[0] = a.attnum AND am.amname = 'gist'
+                )
+                ORDER BY g.f_table_name, g.f_geometry_column
+                """,
+                (self.schema,),
+            )
+            missing_indexes += [dict(record) for record in cur.fetchall()]
+
+        return missing_indexes
+
+    def create_index(self, index: dict) -> tuple[bool, str]:
+        if self.schema:
+            index_name = self.index_name(index["tablename"], [index["columnname"]])
+            cur = self.conn.cursor()
+            try:
+                # without IF NOT EXISTS an index of the same name on another column is reported
+                cur.execute(
+                    sql.SQL(
+                        """
+                        CREATE INDEX {} ON {}.{} USING {} ({});
+                        """
+                    ).format(
+                        sql.Identifier(index_name),
+                        sql.Identifier(self.schema),
+                        sql.Identifier(index["tablename"]),
+                        sql.SQL("gist" if index["kind"] == "spatial" else "btree"),
+                        sql.Identifier(index["columnname"]),
+                    )
+                )
+                self.conn.commit()
+                return True, self.tr('Created index "{}" on {}.{}.').format(
+                    index_name, index["tablename"], index["columnname"]
+                )
+            except psycopg2.errors.Error as e:
+                self.conn.rollback()
+                error_message = " ".join(e.args)
+                return False, self.tr("Could not create index on {}.{}: {}").format(
+                    index["tablename"], index["columnname"], error_message
+                )
+
+        return False, self.tr("Could not create index")
+
+    def update_statistics(self) -> tuple[bool, str]:
+        if self.schema:
+            cur = self.conn.cursor()
+            try:
+                cur.execute(
+                    """
+                    SELECT tablename FROM pg_catalog.pg_tables WHERE schemaname = %s;
+                    """,
+                    (self.schema,),
+                )
+                tablenames = [record[0] for record in cur.fetchall()]
+                for tablename in tablenames:
+                    cur.execute(
+                        sql.SQL("ANALYZE {}.{};").format(
+                            sql.Identifier(self.schema), sql.Identifier(tablename)
+                        )
+                    )
+                self.conn.commit()
+                return True, self.tr('Analyzed {} tables of schema "{}".').format(
+                    len(tablenames), self.schema
+                )
+            except psycopg2.errors.Error as e:
+                self.conn.rollback()
+                error_message = " ".join(e.args)
+                return False, self.tr("Could not analyze schema: {}").format(
+                    error_message
+                )
+
+        return False, self.tr("Could not analyze schema")
+
+    def get_missing_metadata_indexes(self) -> list[dict]:
+        if not self.schema:
+            return []
+
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            SELECT tablename FROM pg_catalog.pg_tables WHERE schemaname = %s;
+            """,
+            (self.schema,),
+        )
+        tablenames = {record[0] for record in cur.fetchall()}
+        cur.execute(
+            """
+            SELECT indexname FROM pg_catalog.pg_indexes WHERE schemaname = %s;
+            """,
+            (self.schema,),
+        )
+        indexnames = {record[0] for record in cur.fetchall()}
+        return [
+            index
+            for index in self.get_metadata_indexes()
+            if index["tablename"] in tablenames and index["name"] not in indexnames
+        ]
+
+    def create_metadata_indexes(self) -> tuple[bool, list[str]]:
+        if not self.schema:
+            return False, [self.tr("Could not create the meta table indexes")]
+
+        missing_indexes = self.get_missing_metadata_indexes()
+        cur = self.conn.cursor()
+        try:
+            for index in missing_indexes:
+                cur.execute(
+                    sql.SQL("CREATE INDEX IF NOT EXISTS {} ON {}.{} ({});").format(
+                        sql.Identifier(index["name"]),
+                        sql.Identifier(self.schema),
+                        sql.Identifier(index["tablename"]),
+                        sql.SQL(", ").join(map(sql.Identifier, index["columns"])),
+                    )
+                )
+            self.conn.commit()
+        except psycopg2.errors.Error as e:
+            self.conn.rollback()
+            error_message = " ".join(e.args)
+            return False, [
+                self.tr("Could not create the meta table indexes: {}").format(
+                    error_message
+                )
+            ]
+
+        return True, [
+            self.tr('Created index "{}" on {}.').format(
+                index["name"], index["tablename"]
+            )
+            for index in missing_indexes
+        ]
+
+    def drop_metadata_indexes(self) -> tuple[bool, list[str]]:
+        if not self.schema:
+            return False, [self.tr("Could not drop the meta table indexes")]
+
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            SELECT indexname FROM pg_catalog.pg_indexes WHERE schemaname = %s;
+            """,
+            (self.schema,),
+        )
+        indexnames = {record[0] for record in cur.fetchall()}
+        existing_indexes = [
+            index
+            for index in self.get_metadata_indexes()
+            if index["name"] in indexnames
+        ]
+        try:
+            for index in existing_indexes:
+                cur.execute(
+                    sql.SQL("DROP INDEX IF EXISTS {}.{};").format(
+                        sql.Identifier(self.schema), sql.Identifier(index["name"])
+                    )
+                )
+            self.conn.commit()
+        except psycopg2.errors.Error as e:
+            self.conn.rollback()
+            error_message = " ".join(e.args)
+            return False, [
+                self.tr("Could not drop the meta table indexes: {}").format(
+                    error_message
+                )
+            ]
+
+        return True, [
+            self.tr('Dropped index "{}" on {}.').format(
+                index["name"], index["tablename"]
+            )
+            for index in existing_indexes
+        ]
+
+    def get_bulk_load_objects(self) -> dict:
+        if not self.schema:
+            return {"indexes": [], "constraints": []}
+
+        cur = self.conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+        # the unique and primary key indexes are kept, they are part of the data model
+        cur.execute(
+            """
+            SELECT ic.relname AS name, c.relname AS tablename, pg_get_indexdef(i.indexrelid) AS definition
+            FROM pg_catalog.pg_index i
+            JOIN pg_catalog.pg_class ic ON ic.oid = i.indexrelid
+            JOIN pg_catalog.pg_class c ON c.oid = i.indrelid
+            JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = %s AND NOT i.indisprimary AND NOT i.indisunique
+              AND c.relname NOT LIKE 't\\_ili2db\\_%%'
+              AND NOT EXISTS (
+                SELECT 1 FROM pg_catalog.pg_constraint con WHERE con.conindid = i.indexrelid
+              )
+            ORDER BY c.relname, ic.relname
+            """,
+            (self.schema,),
+        )
+        indexes = [dict(record) for record in cur.fetchall()]
+        cur.execute(
+            """
+            SELECT con.conname AS name, c.relname AS tablename, pg_get_constraintdef(con.oid) AS definition
+            FROM pg_catalog.pg_constraint con
+            JOIN pg_catalog.pg_class c ON c.oid = con.conrelid
+            JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = %s AND con.contype = 'f'
+              AND c.relname NOT LIKE 't\\_ili2db\\_%%'
+            ORDER BY c.relname, con.conname
+            """,
+            (self.schema,),
+        )
+        constraints = [dict(record) for record in cur.fetchall()]
+        return {"indexes": indexes, "constraints": constraints}
+
+    def drop_bulk_load_objects(self, objects: dict) -> tuple[bool, str]:
+        if self.schema:
+            cur = self.conn.cursor()
+            try:
+                # the definitions are committed together with the drops, so they are not lost on a crash
+                cur.execute(
+                    sql.SQL(
+                        """
+                        CREATE TABLE IF NOT EXISTS {}.{} (
+                            kind text NOT NULL,
+                            name text NOT NULL,
+                            tablename text NOT NULL,
+                            definition text NOT NULL
+                        );
+                        """
+                    ).format(
+                        sql.Identifier(self.schema),
+                        sql.Identifier(BULK_LOAD_JOURNAL_TABLE),
+                    )
+                )
+                for kind in ("indexes", "constraints"):
+                    for bulk_load_object in objects[kind]:
+                        cur.execute(
+                            sql.SQL(
+                                """
+                                INSERT INTO {}.{} (kind, name, tablename, definition)
+                                VALUES (%s, %s, %s, %s);
+                                """
+                            ).format(
+                                sql.Identifier(self.schema),
+                                sql.Identifier(BULK_LOAD_JOURNAL_TABLE),
+                            ),
+                            (
+                                kind,
+                                bulk_load_object["name"],
+                                bulk_load_object["tablename"],
+                                bulk_load_object["definition"],
+                            ),
+                        )
+                for constraint in objects["constraints"]:
+                    cur.execute(
+                        sql.SQL("ALTER TABLE {}.{} DROP CONSTRAINT {};").format(
+                            sql.Identifier(self.schema),
+                            sql.Identifier(constraint["tablename"]),
+                            sql.Identifier(constraint["name"]),
+                        )
+                    )
+                for index in objects["indexes"]:
+                    cur.execute(
+                        sql.SQL("DROP INDEX {}.{};").format(
+                            sql.Identifier(self.schema), sql.Identifier(index["name"])
+                        )
+                    )
+                self.conn.commit()
+                return True, self.tr(
+                    "Dropped {} indexes and {} foreign key constraints."
+                ).format(len(objects["indexes"]), len(objects["constraints"]))
+            except psycopg2.errors.Error as e:
+                self.conn.rollback()
+                error_message = " ".join(e.args)
+                return False, self.tr(
+                    "Could not drop the indexes and constraints: {}"
+                ).format(error_message)
+
+        return False, self.tr("Could not drop the indexes and constraints")
+
+    def get_bulk_load_journal(self) -> dict:
+        objects = {"indexes": [], "constraints": []}
+        if not self.schema or not self._table_exists(BULK_LOAD_JOURNAL_TABLE):
+            return objects
+
+        cur = self.conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+        cur.execute(
+            sql.SQL(
+                """
+                SELECT kind, name, tablename, definition FROM {}.{}
+                ORDER BY tablename COLLATE "C", name COLLATE "C";
+                """
+            ).format(
+                sql.Identifier(self.schema), sql.Identifier(BULK_LOAD_JOURNAL_TABLE)
+            )
+        )
+        for record in cur.fetchall():
+            if record["kind"] in objects:
+                objects[record["kind"]].append(
+                    {
+                        "name": record["name"],
+                        "tablename": record["tablename"],
+                        "definition": record["definition"],
+                    }
+                )
+        return objects
+
+    def clear_bulk_load_journal(self, objects: dict) -> tuple[bool, str]:
+        if not self.schema or not self._table_exists(BULK_LOAD_JOURNAL_TABLE):
+            return True, None
+
+        cur = self.conn.cursor()
+        try:
+            for kind in ("indexes", "constraints"):
+                for bulk_load_object in objects[kind]:
+                    cur.execute(
+                        sql.SQL(
+                            """
+                            DELETE FROM {}.{} WHERE kind = %s AND name = %s;
+                            """
+                        ).format(
+                            sql.Identifier(self.schema),
+                            sql.Identifier(BULK_LOAD_JOURNAL_TABLE),
+                        ),
+                        (kind, bulk_load_object["name"]),
+                    )
+            cur.execute(
+                sql.SQL("SELECT count(*) FROM {}.{};").format(
+                    sql.Identifier(self.schema),
+                    sql.Identifier(BULK_LOAD_JOURNAL_TABLE),
+                )
+            )
+            if cur.fetchone()[0] == 0:
+                cur.execute(
+                    sql.SQL("DROP TABLE {}.{};").format(
+                        sql.Identifier(self.schema),
+                        sql.Identifier(BULK_LOAD_JOURNAL_TABLE),
+                    )
+                )
+            self.conn.commit()
+            return True, None
+        except psycopg2.errors.Error as e:
+            self.conn.rollback()
+            error_message = " ".join(e.args)
+            return False, self.tr("Could not update the bulk load journal: {}").format(
+                error_message
+            )
+
+    def restore_bulk_load_indexes(
+        self, indexes: list[dict], max_workers: Optional[int] = None
+    ) -> tuple[bool, list[str]]:
+        statements = [sql.SQL(index["definition"]) for index in indexes]
+        errors = self._execute_in_parallel(statements, max_workers)
+        messages = [
+            self.tr('Could not recreate index "{}": {}').format(index["name"], error)
+            for index, error in zip(indexes, errors)
+            if error
+        ]
+        return not messages, messages
+
+    def restore_bulk_load_constraints(
+        self, constraints: list[dict], max_workers: Optional[int] = None
+    ) -> tuple[bool, list[str]]:
+        # the constraints are added without checking the existing rows (keeping the locks short) and are
+        # validated in parallel afterwards
+        cur = self.conn.cursor()
+        try:
+            for constraint in constraints:
+                definition = constraint["definition"]
+                if not definition.endswith("NOT VALID"):
+                    definition += " NOT VALID"
+                cur.execute(
+                    sql.SQL("ALTER TABLE {}.{} ADD CONSTRAINT {} ").format(
+                        sql.Identifier(self.schema),
+                        sql.Identifier(constraint["tablename"]),
+                        sql.Identifier(constraint["name"]),
+                    )
+                    + sql.SQL(definition)
+                )
+            self.conn.commit()
+        except psycopg2.errors.Error as e:
+            self.conn.rollback()
+            error_message = " ".join(e.args)
+            return False, [
+                self.tr("Could not restore the foreign key constraints: {}").format(
+                    error_message
+                )
+            ]
+
+        # constraints which were not valid before stay so
+        constraints = [
+            constraint
+            for constraint in constraints
+            if not constraint["definition"].endswith("NOT VALID")
+        ]
+        statements = [
+            sql.SQL("ALTER TABLE {}.{} VALIDATE CONSTRAINT {};").format(
+                sql.Identifier(self.schema),
+                sql.Identifier(constraint["tablename"]),
+                sql.Identifier(constraint["name"]),
+            )
+            for constraint in constraints
+        ]
+        errors = self._execute_in_parallel(statements, max_workers)
+        messages = [
+            self.tr('Could not validate constraint "{}": {}').format(
+                constraint["name"], error
+            )
+            for constraint, error in zip(constraints, errors)
+            if error
+        ]
+        return not messages, messages
+
+    def _execute_in_parallel(
+        self, statements: list[sql.Composable], max_workers: Optional[int] = None
+    ) -> list[Optional[str]]:
+        """
+        Executes every statement in its own transaction on up to `max_workers` connections at the same time.
+        Returns the error message of every statement (None if it succeeded).
+        """
+
+        def execute(statement: sql.Composable) -> Optional[str]:
+            conn = connection_pool.acquire(
+                self._pool_key,
+                lambda: psycopg2.connect(self.uri),
+                self._connection_alive,
+            )
+            try:
+                cur = conn.cursor()
+                cur.execute(statement)
+                conn.commit()
+                return None
+            except psycopg2.errors.Error as e:
+                conn.rollback()
+                return " ".join(e.args)
+            finally:
+                connection_pool.release(self._pool_key, conn, self._reset_connection)
+
+        if not statements:
+            return []
+        max_workers = max_workers or min(4, os.cpu_count() or 1)
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+            return list(executor.map(execute, statements))
+
     def get_all_schemas(self) -> list[str]:
         cursor = self.conn.cursor()
         try:
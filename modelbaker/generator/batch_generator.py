@@ -0,0 +1,226 @@
+"""
+Metadata:
+    Creation Date: 2026-10-18
+    Copyright: (C) 2026 by OPENGIS.ch
+    Contact: info@opengis.ch
+
+License:
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the **GNU General Public License** as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+"""
+
+from __future__ import annotations
+
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from qgis.core import QgsApplication, QgsProject
+from qgis.PyQt.QtCore import QObject, pyqtSignal
+
+from ..dataobjects.layers import Layer
+from ..dataobjects.legend import LegendGroup
+from ..dataobjects.project import Project
+from ..dataobjects.relations import Relation
+from ..db_factory.db_simple_factory import DbSimpleFactory
+from ..utils.db_utils import get_schema_identificator_from_configuration
+from .generator import Generator
+
+if TYPE_CHECKING:
+    from ..iliwrapper.ili2dbconfig import Ili2DbCommandConfiguration
+
+
+class BatchGenerationResult:
+    """The outcome of the project generation for one configuration of a `BatchGenerator` run."""
+
+    def __init__(self, configuration: Ili2DbCommandConfiguration) -> None:
+        self.configuration = configuration
+        self.identificator = (
+            get_schema_identificator_from_configuration(configuration)
+            or configuration.dbschema
+            or configuration.dbfile
+        )
+        self.layers: list[Layer] = []
+        self.relations: list[Relation] = []
+        self.bags_of_enum: dict = {}
+        self.legend: Optional[LegendGroup] = None
+        self.project: Optional[Project] = None
+        self.qgis_project: Optional[QgsProject] = None
+        self.messages: list[str] = []
+        # seconds spent in the metadata phase (database) and the creation phase (QGIS objects)
+        self.metadata_time = 0.0
+        self.create_time = 0.0
+        self.error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+class BatchGenerator(QObject):
+    """
+    Generates the projects of multiple databases / schemas.
+
+    The database bound metadata phase (`layers`, `relations` and `legend` of the `Generator`) runs in a pool of
+    worker threads with a bounded number of concurrent connections. The creation of the QGIS objects
+    (`Project.create`) stays in the calling thread. A failing configuration does not abort the batch,
+    the error is reported in its `BatchGenerationResult`.
+    """
+
+    stdout = pyqtSignal(str)
+    result_ready = pyqtSignal(str, bool)
+
+    def __init__(
+        self,
+        configurations: list[Ili2DbCommandConfiguration],
+        max_workers: int = 4,
+        generator_kwargs: dict[str, Any] = {},
+        project_kwargs: dict[str, Any] = {},
+        parent: Optional[QObject] = None,
+    ) -> None:
+        """
+        Args:
+            configurations: The configurations of the databases / schemas to generate the projects for.
+            max_workers: The maximum number of metadata phases (and therefore database connections) running at the same time.
+            generator_kwargs: Additional keyword arguments passed to each `Generator` (e.g. `optimize_strategy` or `bulk_introspection`).
+            project_kwargs: Additional keyword arguments passed to each `Project`.
+        """
+        QObject.__init__(self, parent)
+        self.configurations = configurations
+        self.max_workers = max(1, max_workers)
+        self.generator_kwargs = generator_kwargs
+        self.project_kwargs = project_kwargs
+        self.db_simple_factory = DbSimpleFactory()
+
+    def run(
+        self,
+        create_projects: bool = True,
+        qgis_project_factory: Callable[
+            [Ili2DbCommandConfiguration], QgsProject
+        ] = lambda configuration: QgsProject(),
+        path_resolver: Callable[[Ili2DbCommandConfiguration], Optional[str]] = (
+            lambda configuration: None
+        ),
+    ) -> list[BatchGenerationResult]:
+        """
+        Runs the generation for all the configurations and returns the results in the same order.
+
+        Args:
+            create_projects: If False, only the metadata phase is done and the results contain the layers, relations and legend but no project.
+            qgis_project_factory: Returns the QgsProject the project of a configuration is created in.
+            path_resolver: Returns the path passed to `Project.create` for a configuration.
+        """
+        results = [
+            BatchGenerationResult(configuration)
+            for configuration in self.configurations
+        ]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = []
+            for result in results:
+                # the uris are resolved in the calling thread since it might access the authentication manager
+                try:
+                    uri, mgmt_uri = self._uris(result.configuration)
+                except Exception as e:
+                    result.error = "{}: {}".format(type(e).__name__, e)
+                    futures.append(None)
+                    continue
+                futures.append(
+                    executor.submit(self._generate_metadata, result, uri, mgmt_uri)
+                )
+
+            for result, future in zip(results, futures):
+                if future:
+                    future.result()
+                if result.success and create_projects:
+                    self._create_project(
+                        result,
+                        qgis_project_factory(result.configuration),
+                        path_resolver(result.configuration),
+                    )
+                self._report(result)
+
+        return results
+
+    def _uris(self, configuration: Ili2DbCommandConfiguration) -> tuple[str, str]:
+        db_factory = self.db_simple_factory.create_factory(configuration.tool)
+        config_manager = db_factory.get_db_command_config_manager(configuration)
+        uri = config_manager.get_uri(qgis=True)
+        mgmt_uri = config_manager.get_uri(
+            su=configuration.db_use_super_login,
+            fallback_user=QgsApplication.userLoginName(),
+        )
+        return uri, mgmt_uri
+
+    def _generate_metadata(
+        self, result: BatchGenerationResult, uri: str, mgmt_uri: str
+    ) -> None:
+        start = time.perf_counter()
+        configuration = result.configuration
+        try:
+            generator = Generator(
+                configuration.tool,
+                uri,
+                configuration.inheritance,
+                configuration.dbschema,
+                mgmt_uri=mgmt_uri,
+                consider_basket_handling=True,
+                **self.generator_kwargs,
+            )
+            # the generator lives in the worker thread, so the signals are delivered directly
+            generator.stdout.connect(result.messages.append)
+            result.layers = generator.layers()
+            result.relations, result.bags_of_enum = generator.relations(result.layers)
+            result.legend = generator.legend(result.layers)
+            # lazy fields are created here as well, since the connection belongs to the worker thread
+            for layer in result.layers:
+                if not layer.fields_loaded:
+                    layer.fields = list(layer.fields)
+        except Exception as e:
+            result.error = "{}: {}".format(type(e).__name__, e)
+            result.messages.append(traceback.format_exc())
+        result.metadata_time = time.perf_counter() - start
+
+    def _create_project(
+        self,
+        result: BatchGenerationResult,
+        qgis_project: QgsProject,
+        path: Optional[str],
+    ) -> None:
+        start = time.perf_counter()
+        try:
+            project = Project(**self.project_kwargs)
+            project.layers = result.layers
+            project.relations = result.relations
+            project.bags_of_enum = result.bags_of_enum
+            project.legend = result.legend
+            project.post_generate()
+            project.create(path, qgis_project)
+            result.project = project
+            result.qgis_project = qgis_project
+        except Exception as e:
+            result.error = "{}: {}".format(type(e).__name__, e)
+            result.messages.append(traceback.format_exc())
+        result.create_time = time.perf_counter() - start
+
+    def _report(self, result: BatchGenerationResult) -> None:
+        if result.success:
+            self.stdout.emit(
+                self.tr(
+                    "Generated project of {identificator} (metadata {metadata_time:.2f}s, creation {create_time:.2f}s)."
+                ).format(
+                    identificator=result.identificator,
+                    metadata_time=result.metadata_time,
+                    create_time=result.create_time,
+                )
+            )
+        else:
+            self.stdout.emit(
+                self.tr("Generating project of {identificator} failed: {error}").format(
+                    identificator=result.identificator, error=result.error
+                )
+            )
+        self.result_ready.emit(result.identificator, result.success)
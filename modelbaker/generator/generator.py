@@ -14,6 +14,7 @@ License:
 from __future__ import annotations
 
 import re
+from functools import partial
 from typing import Callable, Optional
 
 from qgis.core import Qgis, QgsApplication, QgsRelation, QgsWkbTypes
@@ -29,6 +30,8 @@ from ..utils.globals import OptimizeStrategy
 from ..utils.qt_utils import slugify
 from .config import BASKET_FIELDNAMES, IGNORED_FIELDNAMES, READONLY_FIELDNAMES
 from .domain_relations_generator import DomainRelationGenerator
+from .metadata_cache import MetadataCache
+from .snapshot import read_snapshot, write_snapshot
 
 
 class Generator(QObject):
@@ -50,13 +53,19 @@ class Generator(QObject):
         optimize_strategy: OptimizeStrategy = OptimizeStrategy.NONE,
         preferred_language: str = "__",
         raw_naming=False,
+        bulk_introspection: bool = False,
+        use_metadata_cache: bool = False,
+        lazy_fields: bool = False,
     ) -> None:
         """
                 Creates a new Generator objects.
 
         Args:
             mgmt_uri: The uri that should be used to create schemas, tables and query meta information. Does not support authcfg but a fallback username.
-            uri: The uri that should be used in the resulting project. If authcfg is used, make sure the mgmt_uri is set as well."""
+            uri: The uri that should be used in the resulting project. If authcfg is used, make sure the mgmt_uri is set as well.
+            bulk_introspection: If True, the fields and constraints of all the tables are fetched at once instead of per table.
+            use_metadata_cache: If True, the tables, relations and bags of info are loaded from the on-disk metadata cache when the schema did not change since it has been stored.
+            lazy_fields: If True, the fields of a layer are not created by `layers()` but on first access of `Layer.fields` (e.g. on `Layer.create()`). The generator must be kept until then."""
         QObject.__init__(self, parent)
         self.tool = tool
         self.uri = uri
@@ -73,6 +82,10 @@ class Generator(QObject):
         self.basket_handling = consider_basket_handling and self.get_basket_handling()
         self.optimize_strategy = optimize_strategy
         self.raw_naming = raw_naming
+        self.bulk_introspection = bulk_introspection
+        self.lazy_fields = lazy_fields
+        self._metadata_cache = MetadataCache() if use_metadata_cache else None
+        self._cached_metadata = None
 
         self._db_connector.set_preferred_translation(preferred_language)
 
@@ -119,6 +132,14 @@ class Generator(QObject):
                 table_appearance_count.get(record["tablename"], 0) + 1
             )
 
+        # On bulk introspection the fields and constraints of all the tables are fetched at once and indexed by table name
+        bulk_info = (
+            self._bulk_introspection_info(list(table_appearance_count.keys()))
+            if self.bulk_introspection
+            else None
+        )
+        tables_relevance_cache = {}
+
         for record in tables_info:
             # When in PostGIS mode, leaving schema blank should load tables from
             # all schemas, except the ignored ones
@@ -209,7 +230,11 @@ class Generator(QObject):
                         and "geometry_column" in record
                     ):
                         # table loaded multiple times (because of multiple geometry columns) - append geometry column to name (for PG source layers)
-                        fields_info = self.get_fields_info(record["tablename"])
+                        fields_info = (
+                            bulk_info["fields"].get(record["tablename"], [])
+                            if bulk_info
+                            else self.get_fields_info(record["tablename"])
+                        )
                         for field_info in fields_info:
                             if field_info["column_name"] == record["geometry_column"]:
                                 if (
@@ -324,203 +349,255 @@ class Generator(QObject):
 
             # CONFIGURE FIELDS FOR THE CURRENT TABLE
 
-            fields_info = self.get_fields_info(record["tablename"])
-            min_max_info = self.get_min_max_info(record["tablename"])
-            # We get the value map values from the check-constraints (only pg support) and additionally we check the t_type values in the ili2db-meta-tables
-            value_map_info = self.get_value_map_info(record["tablename"])
-            t_type_map_info = self.get_t_type_map_info(record["tablename"])
-            value_map_info.update(t_type_map_info)
-
-            re_iliname = re.compile(r".*\.(.*)$")
-            for fielddef in fields_info:
-                # FIELD NAMING
-                column_name = fielddef["column_name"]
-
-                # If raw_naming is True, the fieldname should be the columnname
-                # Otherwise get field name in this order:
-                # - translation if exists,
-                # - alias (dispName) if exists
-                # - otherwise get_iliname
-                alias = None
-                if self.raw_naming:
-                    alias = column_name
-                if not alias:
-                    alias = fielddef.get("column_tr", None)
-                if not alias:
-                    alias = fielddef.get("column_alias", None)
-
-                if not alias:
-                    fully_qualified_name = (
-                        fielddef["fully_qualified_name"]
-                        if "fully_qualified_name" in fielddef
-                        else None
-                    )
-                    m = (
-                        re_iliname.match(fully_qualified_name)
-                        if fully_qualified_name
-                        else None
+            if self.lazy_fields:
+                # the fields are created on first access (e.g. when the layer is created)
+                layer.set_fields_loader(
+                    partial(
+                        self._create_fields,
+                        layer,
+                        record["tablename"],
+                        db_factory,
+                        bulk_info,
+                        tables_relevance_cache,
                     )
-                    if m:
-                        alias = m.group(1)
+                )
+            else:
+                layer.fields = self._create_fields(
+                    layer,
+                    record["tablename"],
+                    db_factory,
+                    bulk_info,
+                    tables_relevance_cache,
+                )
 
-                field = Field(column_name)
-                field.alias = alias
+            layers.append(layer)
 
-                # HIDDEN FIELD
+        if not self.raw_naming:
+            # append topic name to ambiguous layers
+            self._rename_ambiguous_layers(layers)
+            # append model name to still ambiguous layers
+            self._rename_ambiguous_layers(layers, second_pass=True)
 
-                hide_attribute = False
+        self.print_messages()
 
-                if "fully_qualified_name" in fielddef:
-                    fully_qualified_name = fielddef["fully_qualified_name"]
-                    if fully_qualified_name:
-                        meta_attrs_column = self.get_meta_attrs(fully_qualified_name)
+        return layers
 
-                        for attr_record in meta_attrs_column:
-                            if attr_record["attr_name"] == "hidden":
-                                if attr_record["attr_value"] == "True":
-                                    hide_attribute = True
-                                    break
+    def _create_fields(
+        self,
+        layer: Layer,
+        table_name: str,
+        db_factory,
+        bulk_info: Optional[dict],
+        tables_relevance_cache: dict,
+    ) -> list[Field]:
+        """
+        Creates the fields of a layer with their aliases, widgets and default values.
+        The relevance info of the tables is only fetched when needed and kept in the passed cache.
+        """
+        if bulk_info:
+            fields_info = bulk_info["fields"].get(table_name, [])
+            min_max_info = bulk_info["min_max"].get(table_name, {})
+            value_map_info = dict(bulk_info["value_map"].get(table_name, {}))
+            t_type_map_info = bulk_info["t_type_map"].get(table_name, {})
+        else:
+            fields_info = self.get_fields_info(table_name)
+            min_max_info = self.get_min_max_info(table_name)
+            # We get the value map values from the check-constraints (only pg support) and additionally we check the t_type values in the ili2db-meta-tables
+            value_map_info = self.get_value_map_info(table_name)
+            t_type_map_info = self.get_t_type_map_info(table_name)
+        value_map_info.update(t_type_map_info)
+
+        fields = []
+        re_iliname = re.compile(r".*\.(.*)$")
+        for fielddef in fields_info:
+            # FIELD NAMING
+            column_name = fielddef["column_name"]
+
+            # If raw_naming is True, the fieldname should be the columnname
+            # Otherwise get field name in this order:
+            # - translation if exists,
+            # - alias (dispName) if exists
+            # - otherwise get_iliname
+            alias = None
+            if self.raw_naming:
+                alias = column_name
+            if not alias:
+                alias = fielddef.get("column_tr", None)
+            if not alias:
+                alias = fielddef.get("column_alias", None)
 
-                if column_name in IGNORED_FIELDNAMES:
-                    hide_attribute = True
+            if not alias:
+                fully_qualified_name = (
+                    fielddef["fully_qualified_name"]
+                    if "fully_qualified_name" in fielddef
+                    else None
+                )
+                m = (
+                    re_iliname.match(fully_qualified_name)
+                    if fully_qualified_name
+                    else None
+                )
+                if m:
+                    alias = m.group(1)
 
-                if not self.basket_handling and column_name in BASKET_FIELDNAMES:
-                    hide_attribute = True
+            field = Field(column_name)
+            field.alias = alias
 
-                field.hidden = hide_attribute
+            # HIDDEN FIELD
 
-                # READ-ONLY FIELD
+            hide_attribute = False
 
-                if column_name in READONLY_FIELDNAMES:
-                    field.read_only = True
+            if "fully_qualified_name" in fielddef:
+                fully_qualified_name = fielddef["fully_qualified_name"]
+                if fully_qualified_name:
+                    meta_attrs_column = self.get_meta_attrs(fully_qualified_name)
 
-                # WIDGET CONFIGURATION
+                    for attr_record in meta_attrs_column:
+                        if attr_record["attr_name"] == "hidden":
+                            if attr_record["attr_value"] == "True":
+                                hide_attribute = True
+                                break
 
-                if column_name in min_max_info:
-                    field.widget = "Range"
-                    field.widget_config["Min"] = min_max_info[column_name][0]
-                    field.widget_config["Max"] = min_max_info[column_name][1]
-                    if "numeric_scale" in fielddef:
-                        field.widget_config["Step"] = pow(
-                            10, -1 * fielddef["numeric_scale"]
-                        )
-                    # field.widget_config['Suffix'] = fielddef['unit'] if 'unit' in fielddef else ''
-                    if "unit" in fielddef and fielddef["unit"] is not None:
-                        field.alias = "{alias} [{unit}]".format(
-                            alias=alias or column_name, unit=fielddef["unit"]
-                        )
+            if column_name in IGNORED_FIELDNAMES:
+                hide_attribute = True
 
-                if column_name in value_map_info:
-                    field.widget = "ValueMap"
+            if not self.basket_handling and column_name in BASKET_FIELDNAMES:
+                hide_attribute = True
 
-                    # if it's the t_type column, then handle concerning relevance
-                    if column_name.lower() == "t_type":
-                        tables_relevance_info = self.get_tables_relevance()
-                        field.widget_config["map"] = []
-                        for val in value_map_info[column_name]:
-                            if (
-                                not tables_relevance_info[val]["relevance"]
-                                and self.optimize_strategy == OptimizeStrategy.HIDE
-                            ):
-                                continue
-                            field.widget_config["map"].append(
-                                {tables_relevance_info[val]["iliname"]: val}
-                            )
-                            field.default_value_expression = f"'{val}'"
-                    else:
-                        field.widget_config["map"] = [
-                            {val: val} for val in value_map_info[column_name]
-                        ]
+            field.hidden = hide_attribute
 
-                if "attr_mapping" in fielddef and fielddef["attr_mapping"] == "ARRAY":
-                    field.widget = "List"
+            # READ-ONLY FIELD
 
-                if "texttype" in fielddef and fielddef["texttype"] == "MTEXT":
-                    field.widget = "TextEdit"
-                    field.widget_config["IsMultiline"] = True
+            if column_name in READONLY_FIELDNAMES:
+                field.read_only = True
 
-                data_type = self._db_connector.map_data_types(fielddef["data_type"])
-                if "time" in data_type or "date" in data_type:
-                    field.widget = "DateTime"
-                    field.widget_config["calendar_popup"] = True
+            # WIDGET CONFIGURATION
 
-                    dateFormat = QLocale(QgsApplication.instance().locale()).dateFormat(
-                        QLocale.FormatType.ShortFormat
+            if column_name in min_max_info:
+                field.widget = "Range"
+                field.widget_config["Min"] = min_max_info[column_name][0]
+                field.widget_config["Max"] = min_max_info[column_name][1]
+                if "numeric_scale" in fielddef:
+                    field.widget_config["Step"] = pow(10, -1 * fielddef["numeric_scale"])
+                # field.widget_config['Suffix'] = fielddef['unit'] if 'unit' in fielddef else ''
+                if "unit" in fielddef and fielddef["unit"] is not None:
+                    field.alias = "{alias} [{unit}]".format(
+                        alias=alias or column_name, unit=fielddef["unit"]
                     )
-                    timeFormat = QLocale(QgsApplication.instance().locale()).timeFormat(
-                        QLocale.FormatType.ShortFormat
-                    )
-                    dateTimeFormat = QLocale(
-                        QgsApplication.instance().locale()
-                    ).dateTimeFormat(QLocale.FormatType.ShortFormat)
-
-                    if data_type == self._db_connector.QGIS_TIME_TYPE:
-                        field.widget_config["display_format"] = timeFormat
-                    elif data_type == self._db_connector.QGIS_DATE_TIME_TYPE:
-                        field.widget_config["display_format"] = dateTimeFormat
-                    elif data_type == self._db_connector.QGIS_DATE_TYPE:
-                        field.widget_config["display_format"] = dateFormat
 
-                db_factory.customize_widget_editor(field, data_type)
+            if column_name in value_map_info:
+                field.widget = "ValueMap"
 
-                if "enum_domain" in fielddef and fielddef["enum_domain"]:
-                    field.enum_domain = fielddef["enum_domain"]
+                # if it's the t_type column, then handle concerning relevance
+                if column_name.lower() == "t_type":
+                    if "info" not in tables_relevance_cache:
+                        tables_relevance_cache["info"] = self.get_tables_relevance()
+                    tables_relevance_info = tables_relevance_cache["info"]
+                    field.widget_config["map"] = []
+                    for val in value_map_info[column_name]:
+                        if (
+                            not tables_relevance_info[val]["relevance"]
+                            and self.optimize_strategy == OptimizeStrategy.HIDE
+                        ):
+                            continue
+                        field.widget_config["map"].append(
+                            {tables_relevance_info[val]["iliname"]: val}
+                        )
+                        field.default_value_expression = f"'{val}'"
+                else:
+                    field.widget_config["map"] = [
+                        {val: val} for val in value_map_info[column_name]
+                    ]
 
-                # DEFAULT VALUE EXPRESSION:
+            if "attr_mapping" in fielddef and fielddef["attr_mapping"] == "ARRAY":
+                field.widget = "List"
 
-                ## we have this to provide e.g. the T_Id expression for GPKG defined in the db_connector
-                if "default_value_expression" in fielddef:
-                    field.default_value_expression = fielddef[
-                        "default_value_expression"
-                    ]
+            if "texttype" in fielddef and fielddef["texttype"] == "MTEXT":
+                field.widget = "TextEdit"
+                field.widget_config["IsMultiline"] = True
 
-                ## oid (t_ili_tid)
-                # trying to set reasonable default default-expressions:
-                if column_name == self._db_connector.tilitid:
-                    field.oid_domain = fielddef.get("oid_domain", None)
-                    if field.oid_domain == "INTERLIS.UUIDOID":
-                        # clear case
-                        field.default_value_expression = "uuid('WithoutBraces')"
-                    elif field.oid_domain == "INTERLIS.I32OID":
-                        # taking the tid as stable serial
-                        field.default_value_expression = self._db_connector.tid
-                    elif field.oid_domain == "INTERLIS.STANDARDOID":
-                        # taking the example prefix + the tid as stable serial in 8 chars
-                        field.default_value_expression = (
-                            f"'ch100000' || lpad( {self._db_connector.tid}, 8, 0 )"
-                        )
-                    else:
-                        # ANY, user- or not-defined (mostly OID TEXT, means no leading digits allowed)
-                        field.default_value_expression = "'_' || uuid('WithoutBraces')"
-
-                ## basket (t_basket)
-                if self.basket_handling and column_name in BASKET_FIELDNAMES:
-                    # on NONE strategy those should be all topics the class could be in. On optimized strategies GROUP/HIDE only the relevant topics should be listed.
-                    interlis_topics = ",".join(
-                        sorted(layer.all_topics)
-                        if self.optimize_strategy == OptimizeStrategy.NONE
-                        else sorted(layer.relevant_topics)
-                    )
+            data_type = self._db_connector.map_data_types(fielddef["data_type"])
+            if "time" in data_type or "date" in data_type:
+                field.widget = "DateTime"
+                field.widget_config["calendar_popup"] = True
 
-                    # and set the default value (to be used from the projet variables)
-                    default_basket_topic = slugify(
-                        f"default_basket{'_' if interlis_topics else ''}{interlis_topics}"
+                dateFormat = QLocale(QgsApplication.instance().locale()).dateFormat(
+                    QLocale.FormatType.ShortFormat
+                )
+                timeFormat = QLocale(QgsApplication.instance().locale()).timeFormat(
+                    QLocale.FormatType.ShortFormat
+                )
+                dateTimeFormat = QLocale(
+                    QgsApplication.instance().locale()
+                ).dateTimeFormat(QLocale.FormatType.ShortFormat)
+
+                if data_type == self._db_connector.QGIS_TIME_TYPE:
+                    field.widget_config["display_format"] = timeFormat
+                elif data_type == self._db_connector.QGIS_DATE_TIME_TYPE:
+                    field.widget_config["display_format"] = dateTimeFormat
+                elif data_type == self._db_connector.QGIS_DATE_TYPE:
+                    field.widget_config["display_format"] = dateFormat
+
+            db_factory.customize_widget_editor(field, data_type)
+
+            if "enum_domain" in fielddef and fielddef["enum_domain"]:
+                field.enum_domain = fielddef["enum_domain"]
+
+            # DEFAULT VALUE EXPRESSION:
+
+            ## we have this to provide e.g. the T_Id expression for GPKG defined in the db_connector
+            if "default_value_expression" in fielddef:
+                field.default_value_expression = fielddef["default_value_expression"]
+
+            ## oid (t_ili_tid)
+            # trying to set reasonable default default-expressions:
+            if column_name == self._db_connector.tilitid:
+                field.oid_domain = fielddef.get("oid_domain", None)
+                if field.oid_domain == "INTERLIS.UUIDOID":
+                    # clear case
+                    field.default_value_expression = "uuid('WithoutBraces')"
+                elif field.oid_domain == "INTERLIS.I32OID":
+                    # taking the tid as stable serial
+                    field.default_value_expression = self._db_connector.tid
+                elif field.oid_domain == "INTERLIS.STANDARDOID":
+                    # taking the example prefix + the tid as stable serial in 8 chars
+                    field.default_value_expression = (
+                        f"'ch100000' || lpad( {self._db_connector.tid}, 8, 0 )"
                     )
-                    field.default_value_expression = f"@{default_basket_topic}"
-
-                layer.fields.append(field)
+                else:
+                    # ANY, user- or not-defined (mostly OID TEXT, means no leading digits allowed)
+                    field.default_value_expression = "'_' || uuid('WithoutBraces')"
+
+            ## basket (t_basket)
+            if self.basket_handling and column_name in BASKET_FIELDNAMES:
+                # on NONE strategy those should be all topics the class could be in. On optimized strategies GROUP/HIDE only the relevant topics should be listed.
+                interlis_topics = ",".join(
+                    sorted(layer.all_topics)
+                    if self.optimize_strategy == OptimizeStrategy.NONE
+                    else sorted(layer.relevant_topics)
+                )
 
-            layers.append(layer)
+                # and set the default value (to be used from the projet variables)
+                default_basket_topic = slugify(
+                    f"default_basket{'_' if interlis_topics else ''}{interlis_topics}"
+                )
+                field.default_value_expression = f"@{default_basket_topic}"
 
-        if not self.raw_naming:
-            # append topic name to ambiguous layers
-            self._rename_ambiguous_layers(layers)
-            # append model name to still ambiguous layers
-            self._rename_ambiguous_layers(layers, second_pass=True)
+            fields.append(field)
 
-        self.print_messages()
+        return fields
 
-        return layers
+    def _bulk_introspection_info(self, table_names: list[str]) -> dict:
+        """
+        Returns the fields, range constraints, value map constraints and t_type maps of the given tables,
+        each of them fetched with set-based queries and indexed by table name.
+        """
+        return {
+            "fields": self._db_connector.get_fields_info_bulk(table_names),
+            "min_max": self._db_connector.get_min_max_info_bulk(table_names),
+            "value_map": self._db_connector.get_value_map_info_bulk(table_names),
+            "t_type_map": self._db_connector.get_t_type_map_info_bulk(table_names),
+        }
 
     def _rename_ambiguous_layers(
         self, layers: list[Layer], second_pass: bool = False
@@ -1070,6 +1147,53 @@ class Generator(QObject):
             )
         return resolved_layouts
 
+    def snapshot(
+        self,
+        path: str,
+        layers: Optional[list[Layer]] = None,
+        relations: Optional[list[Relation]] = None,
+        bags_of_enum: Optional[dict] = None,
+        legend: Optional[LegendGroup] = None,
+    ) -> None:
+        """
+        Writes the layers, relations, bags of enum and legend to a snapshot file that can be loaded with `from_snapshot` without any database connection.
+        What is not passed is generated with the default parameters.
+        """
+        if layers is None:
+            layers = self.layers()
+        if relations is None or bags_of_enum is None:
+            generated_relations, generated_bags_of_enum = self.relations(layers)
+            relations = generated_relations if relations is None else relations
+            bags_of_enum = (
+                generated_bags_of_enum if bags_of_enum is None else bags_of_enum
+            )
+        if legend is None:
+            legend = self.legend(layers)
+
+        info = {
+            "tool": int(self.tool),
+            "uri": self.uri,
+            "schema": self.schema,
+            "inheritance": self.inheritance,
+            "optimize_strategy": int(self.optimize_strategy),
+            "basket_handling": self.basket_handling,
+        }
+        write_snapshot(path, layers, relations, bags_of_enum, legend, info)
+
+    @staticmethod
+    def from_snapshot(
+        path: str, uri: Optional[str] = None, schema: Optional[str] = None
+    ) -> tuple[list[Layer], list[Relation], dict, LegendGroup]:
+        """
+        Loads the layers, relations, bags of enum and legend from a file written by `snapshot`.
+
+        Args:
+            uri: If set, it replaces the uri the snapshot has been generated with in the layer sources.
+            schema: If set, it replaces the schema the snapshot has been generated with in the layer sources (to reuse the snapshot for identical schemas).
+        """
+        layers, relations, bags_of_enum, legend, _ = read_snapshot(path, uri, schema)
+        return layers, relations, bags_of_enum, legend
+
     def db_or_schema_exists(self) -> bool:
         return self._db_connector.db_or_schema_exists()
 
@@ -1080,12 +1204,25 @@ class Generator(QObject):
         self._additional_ignored_layers = layer_list
 
     def get_ignored_layers(self, ignore_basket_tables: bool = True) -> list[str]:
+        metadata = self._get_cached_metadata()
+        if metadata:
+            return (
+                self._db_connector.get_ignored_layers(
+                    ignore_basket_tables,
+                    metadata["tables_info"],
+                    metadata["relations_info"],
+                )
+                + self._additional_ignored_layers
+            )
         return (
             self._db_connector.get_ignored_layers(ignore_basket_tables)
             + self._additional_ignored_layers
         )
 
     def get_tables_info(self) -> list[dict]:
+        metadata = self._get_cached_metadata()
+        if metadata:
+            return metadata["tables_info"]
         return self._db_connector.get_tables_info()
 
     def get_meta_attrs_info(self) -> list[dict]:
@@ -1138,11 +1275,60 @@ class Generator(QObject):
         return self._db_connector.get_t_type_map_info(table_name)
 
     def get_relations_info(self, filter_layer_list: list[str] = []) -> list[dict]:
+        metadata = self._get_cached_metadata()
+        if metadata:
+            return [
+                record
+                for record in metadata["relations_info"]
+                if not filter_layer_list
+                or record["referencing_table"] in filter_layer_list
+            ]
         return self._db_connector.get_relations_info(filter_layer_list)
 
     def get_bags_of_info(self) -> list[dict]:
+        metadata = self._get_cached_metadata()
+        if metadata:
+            return metadata["bags_of_info"]
         return self._db_connector.get_bags_of_info()
 
+    def _get_cached_metadata(self) -> Optional[dict]:
+        """
+        Returns the tables, relations and bags of info from the metadata cache (when enabled).
+        If there is no entry matching the current fingerprint of the schema, they are fetched from the database and stored.
+        """
+        if self._metadata_cache is None:
+            return None
+
+        if self._cached_metadata is None:
+            fingerprint = self._db_connector.get_metadata_fingerprint()
+            if not fingerprint:
+                return None
+
+            _, lang = self._db_connector.get_translation_handling()
+            key = MetadataCache.key(self.tool, self.schema, lang, fingerprint)
+            metadata = self._metadata_cache.load(key)
+            if metadata is None:
+                # the tables info has to be fetched first, since some connectors use it for the relations info
+                metadata = {
+                    "tables_info": self._records_as_dicts(
+                        self._db_connector.get_tables_info()
+                    ),
+                    "relations_info": self._records_as_dicts(
+                        self._db_connector.get_relations_info()
+                    ),
+                    "bags_of_info": self._records_as_dicts(
+                        self._db_connector.get_bags_of_info()
+                    ),
+                }
+                self._metadata_cache.store(key, metadata)
+            self._cached_metadata = metadata
+
+        return self._cached_metadata
+
+    @staticmethod
+    def _records_as_dicts(records) -> list[dict]:
+        return [{key: record[key] for key in record.keys()} for record in records]
+
     def get_iliname_dbname_mapping(self) -> list[dict]:
         return self._db_connector.get_iliname_dbname_mapping()
 
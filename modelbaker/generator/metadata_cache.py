@@ -0,0 +1,119 @@
+"""
+Metadata:
+    Creation Date: 2026-10-18
+    Copyright: (C) 2026 by OPENGIS.ch
+    Contact: info@opengis.ch
+
+License:
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the **GNU General Public License** as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+from contextlib import closing
+from typing import Optional
+
+from ..iliwrapper.globals import DbIliMode
+
+
+class MetadataCache:
+    """
+    Persistent on-disk cache of the schema metadata (tables info, relations info and bags of info).
+
+    The entries are stored in a SQLite database and are keyed by the fingerprint of the ili2db meta tables
+    (see `DBConnector.get_metadata_fingerprint`), so an entry stays valid as long as the schema does not change.
+    """
+
+    CACHE_PATH = os.path.expanduser("~/.modelbakercache")
+    CACHE_FILE = "metadata.sqlite"
+
+    # increase when the structure of the cached records changes
+    VERSION = 1
+
+    def __init__(self, cache_path: Optional[str] = None) -> None:
+        self.cache_path = cache_path or self.CACHE_PATH
+        self.cache_file = os.path.join(self.cache_path, self.CACHE_FILE)
+
+    @staticmethod
+    def key(
+        tool: DbIliMode, schema: Optional[str], lang: str, fingerprint: str
+    ) -> str:
+        """
+        Returns the key of an entry. Besides the fingerprint, it considers the things the metadata depends on
+        but are not stored in the meta tables (like the schema name or the preferred translation).
+        """
+        return hashlib.sha256(
+            "{version}|{tool}|{schema}|{lang}|{fingerprint}".format(
+                version=MetadataCache.VERSION,
+                tool=DbIliMode(tool & ~DbIliMode.ili).name,
+                schema=schema or "",
+                lang=lang or "",
+                fingerprint=fingerprint,
+            ).encode("utf-8")
+        ).hexdigest()
+
+    def load(self, key: str) -> Optional[dict]:
+        """
+        Returns the cached metadata (a dict with the keys `tables_info`, `relations_info` and `bags_of_info`)
+        or `None` if there is no valid entry for this key.
+        """
+        if not os.path.isfile(self.cache_file):
+            return None
+
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute(
+                    "SELECT content FROM metadata WHERE key = ?;", (key,)
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+
+        if not row:
+            return None
+
+        try:
+            return json.loads(row[0])
+        except ValueError:
+            return None
+
+    def store(self, key: str, metadata: dict) -> bool:
+        """
+        Stores the metadata (a dict with the keys `tables_info`, `relations_info` and `bags_of_info`) and returns whether it succeeded.
+        """
+        try:
+            os.makedirs(self.cache_path, exist_ok=True)
+            with closing(self._connect()) as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO metadata (key, content) VALUES (?, ?);",
+                    (key, json.dumps(metadata, default=str)),
+                )
+                conn.commit()
+        except (OSError, sqlite3.Error):
+            return False
+        return True
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.cache_file)
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS metadata (
+                key TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                created TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );"""
+        )
+        conn.commit()
+        return conn
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        if os.path.isdir(cls.CACHE_PATH):
+            shutil.rmtree(cls.CACHE_PATH, ignore_errors=True)
@@ -0,0 +1,330 @@
+"""
+Metadata:
+    Creation Date: 2026-10-18
+    Copyright: (C) 2026 by OPENGIS.ch
+    Contact: info@opengis.ch
+
+License:
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the **GNU General Public License** as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Any, Optional, Union
+
+from qgis.core import QgsRelation, QgsWkbTypes
+
+from ..dataobjects.fields import Field
+from ..dataobjects.layers import Layer
+from ..dataobjects.legend import LegendGroup
+from ..dataobjects.relations import Relation
+
+SNAPSHOT_MAGIC = b"MBSNAP"
+# increase when the structure of the snapshot changes
+SNAPSHOT_VERSION = 1
+
+
+class SnapshotError(Exception):
+    """This error is raised when a generator snapshot cannot be read."""
+
+
+def write_snapshot(
+    path: str,
+    layers: list[Layer],
+    relations: list[Relation],
+    bags_of_enum: dict,
+    legend: LegendGroup,
+    info: dict[str, Any] = {},
+) -> None:
+    """
+    Writes the output of the generator (layers, relations, bags of enum and legend) as compressed binary file.
+    The layers are stored once and referenced by their index from the relations, the bags of enum and the legend.
+    """
+    layer_count = len(layers)
+    layers = list(layers)
+    layer_indices = {id(layer): index for index, layer in enumerate(layers)}
+
+    def layer_index(layer: Layer) -> int:
+        # e.g. dummy layers created by the legend that are not in the layer list
+        if id(layer) not in layer_indices:
+            layer_indices[id(layer)] = len(layers)
+            layers.append(layer)
+        return layer_indices[id(layer)]
+
+    content = {
+        "info": info,
+        "layer_count": layer_count,
+        "legend": _dump_legend_group(legend, layer_index),
+        "relations": [
+            _dump_relation(relation, layer_index) for relation in relations
+        ],
+        "bags_of_enum": {
+            layer_name: {
+                attribute: [
+                    layer_index(item) if isinstance(item, Layer) else item
+                    for item in bag_of_enum
+                ]
+                for attribute, bag_of_enum in bags.items()
+            }
+            for layer_name, bags in bags_of_enum.items()
+        },
+    }
+    # dump the layers at the end, since the legend can add some
+    content["layers"] = [_dump_layer(layer) for layer in layers]
+
+    with open(path, "wb") as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(bytes([SNAPSHOT_VERSION]))
+        f.write(zlib.compress(json.dumps(content).encode("utf-8")))
+
+
+def read_snapshot(
+    path: str, uri: Optional[str] = None, schema: Optional[str] = None
+) -> tuple[list[Layer], list[Relation], dict, LegendGroup, dict[str, Any]]:
+    """
+    Reads a file written by `write_snapshot` and returns the layers, relations, bags of enum, legend and the info.
+    If `uri` or `schema` are passed, they replace the ones stored in the info in the layer sources.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if not data.startswith(SNAPSHOT_MAGIC):
+        raise SnapshotError(f"{path} is not a generator snapshot.")
+    version = data[len(SNAPSHOT_MAGIC)]
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(
+            f"The snapshot version {version} of {path} is not supported (expected {SNAPSHOT_VERSION})."
+        )
+    try:
+        content = json.loads(
+            zlib.decompress(data[len(SNAPSHOT_MAGIC) + 1 :]).decode("utf-8")
+        )
+    except (zlib.error, ValueError) as e:
+        raise SnapshotError(f"{path} is corrupted: {e}")
+
+    all_layers = [_load_layer(definition) for definition in content["layers"]]
+    _relocate_layers(all_layers, content["info"], uri, schema)
+    relations = [
+        _load_relation(definition, all_layers) for definition in content["relations"]
+    ]
+    bags_of_enum = {
+        layer_name: {
+            attribute: [
+                all_layers[item] if index in (0, 2) else item
+                for index, item in enumerate(bag_of_enum)
+            ]
+            for attribute, bag_of_enum in bags.items()
+        }
+        for layer_name, bags in content["bags_of_enum"].items()
+    }
+    legend = _load_legend_group(content["legend"], all_layers)
+
+    # the layers only referenced by the legend are not part of the layer list
+    return (
+        all_layers[: content["layer_count"]],
+        relations,
+        bags_of_enum,
+        legend,
+        content["info"],
+    )
+
+
+def _relocate_layers(
+    layers: list[Layer],
+    info: dict[str, Any],
+    uri: Optional[str],
+    schema: Optional[str],
+) -> None:
+    snapshot_uri = info.get("uri")
+    snapshot_schema = info.get("schema")
+    for layer in layers:
+        if not layer.uri:
+            continue
+        if uri and snapshot_uri and layer.uri.startswith(snapshot_uri):
+            layer.uri = uri + layer.uri[len(snapshot_uri) :]
+        if schema and snapshot_schema:
+            layer.uri = layer.uri.replace(
+                'table="{}".'.format(snapshot_schema), 'table="{}".'.format(schema)
+            )
+
+
+def _dump_field(field: Field) -> dict[str, Any]:
+    return {
+        "name": field.name,
+        "alias": field.alias,
+        "hidden": getattr(field, "hidden", False),
+        "read_only": field.read_only,
+        "widget": field.widget,
+        "widget_config": field.widget_config,
+        "default_value_expression": field.default_value_expression,
+        "enum_domain": field.enum_domain,
+        "oid_domain": field.oid_domain,
+    }
+
+
+def _load_field(definition: dict[str, Any]) -> Field:
+    field = Field(definition["name"])
+    field.alias = definition["alias"]
+    field.hidden = definition["hidden"]
+    field.read_only = definition["read_only"]
+    field.widget = definition["widget"]
+    field.widget_config = definition["widget_config"]
+    field.default_value_expression = definition["default_value_expression"]
+    field.enum_domain = definition["enum_domain"]
+    field.oid_domain = definition["oid_domain"]
+    return field
+
+
+def _dump_layer(layer: Layer) -> dict[str, Any]:
+    extent = None
+    if layer.extent is not None:
+        extent = "{};{};{};{}".format(
+            layer.extent.xMinimum(),
+            layer.extent.yMinimum(),
+            layer.extent.xMaximum(),
+            layer.extent.yMaximum(),
+        )
+    return {
+        "provider": layer.provider,
+        "uri": layer.uri,
+        "name": layer.name,
+        "srid": layer.srid,
+        "extent": extent,
+        "geometry_column": layer.geometry_column,
+        "wkb_type": int(layer.wkb_type),
+        "alias": layer.alias,
+        "is_domain": layer.is_domain,
+        "is_structure": layer.is_structure,
+        "is_nmrel": layer.is_nmrel,
+        "display_expression": layer.display_expression,
+        "coordinate_precision": layer.coordinate_precision,
+        "is_basket_table": layer.is_basket_table,
+        "is_dataset_table": layer.is_dataset_table,
+        "ili_name": layer.ili_name,
+        "is_relevant": layer.is_relevant,
+        "all_topics": layer.all_topics,
+        "relevant_topics": layer.relevant_topics,
+        "definitionfile": layer.definitionfile,
+        "qmlstylefile": layer.qmlstylefile,
+        "styles": layer.styles,
+        "is_enum": layer.is_enum,
+        "base_class": layer.base_class,
+        "provider_names_map": layer.provider_names_map,
+        "expanded": layer.expanded,
+        "checked": layer.checked,
+        "featurecount": layer.featurecount,
+        "fields": [_dump_field(field) for field in layer.fields],
+    }
+
+
+def _load_layer(definition: dict[str, Any]) -> Layer:
+    layer = Layer(
+        definition["provider"],
+        definition["uri"],
+        definition["name"],
+        definition["srid"],
+        definition["extent"],
+        definition["geometry_column"],
+        QgsWkbTypes.Type(definition["wkb_type"]),
+        definition["alias"],
+        definition["is_domain"],
+        definition["is_structure"],
+        definition["is_nmrel"],
+        definition["display_expression"],
+        definition["coordinate_precision"],
+        definition["is_basket_table"],
+        definition["is_dataset_table"],
+        definition["ili_name"],
+        definition["is_relevant"],
+        definition["all_topics"],
+        definition["relevant_topics"],
+        definition["definitionfile"],
+        definition["qmlstylefile"],
+        definition["styles"],
+        is_enum=definition["is_enum"],
+        base_class=definition["base_class"],
+        provider_names_map=definition["provider_names_map"],
+    )
+    layer.expanded = definition["expanded"]
+    layer.checked = definition["checked"]
+    layer.featurecount = definition["featurecount"]
+    layer.fields = [_load_field(field) for field in definition["fields"]]
+    return layer
+
+
+def _dump_relation(relation: Relation, layer_index) -> dict[str, Any]:
+    return {
+        "referencing_layer": layer_index(relation.referencing_layer),
+        "referenced_layer": layer_index(relation.referenced_layer),
+        "referencing_field": relation.referencing_field,
+        "referenced_field": relation.referenced_field,
+        "name": relation.name,
+        "strength": int(relation.strength),
+        "cardinality_max": relation.cardinality_max,
+        "cardinality_min": relation.cardinality_min,
+        "child_domain_name": relation.child_domain_name,
+        "translate_name": relation.translate_name,
+    }
+
+
+def _load_relation(definition: dict[str, Any], layers: list[Layer]) -> Relation:
+    relation = Relation()
+    relation.referencing_layer = layers[definition["referencing_layer"]]
+    relation.referenced_layer = layers[definition["referenced_layer"]]
+    relation.referencing_field = definition["referencing_field"]
+    relation.referenced_field = definition["referenced_field"]
+    relation.name = definition["name"]
+    relation.strength = QgsRelation.RelationStrength(definition["strength"])
+    relation.cardinality_max = definition["cardinality_max"]
+    relation.cardinality_min = definition["cardinality_min"]
+    relation.child_domain_name = definition["child_domain_name"]
+    relation.translate_name = definition["translate_name"]
+    return relation
+
+
+def _dump_legend_group(group: LegendGroup, layer_index) -> dict[str, Any]:
+    items = []
+    for item in group.items:
+        if isinstance(item, LegendGroup):
+            items.append({"group": _dump_legend_group(item, layer_index)})
+        else:
+            items.append({"layer": layer_index(item)})
+    return {
+        "name": group.name,
+        "expanded": group.expanded,
+        "checked": group.checked,
+        "mutually_exclusive": group.mutually_exclusive,
+        "mutually_exclusive_child": group.mutually_exclusive_child,
+        "definitionfile": group.definitionfile,
+        "static_sorting": group.static_sorting,
+        "ignore_node_names": group.ignore_node_names,
+        "items": items,
+    }
+
+
+def _load_legend_group(
+    definition: dict[str, Any], layers: list[Layer]
+) -> Optional[LegendGroup]:
+    group = LegendGroup(
+        definition["name"],
+        expanded=definition["expanded"],
+        ignore_node_names=definition["ignore_node_names"],
+        static_sorting=definition["static_sorting"],
+    )
+    group.checked = definition["checked"]
+    group.mutually_exclusive = definition["mutually_exclusive"]
+    group.mutually_exclusive_child = definition["mutually_exclusive_child"]
+    group.definitionfile = definition["definitionfile"]
+    for item in definition["items"]:
+        node: Union[LegendGroup, Layer]
+        if "group" in item:
+            node = _load_legend_group(item["group"], layers)
+        else:
+            node = layers[item["layer"]]
+        group.append(node)
+    return group
@@ -10,7 +10,7 @@ License:
     the Free Software Foundation; either version 2 of the License, or
     (at your option) any later version.
 """
-from enum import IntFlag
+from enum import Enum, IntFlag
 
 
 class DbIliMode(IntFlag):
@@ -23,3 +23,16 @@ class DbIliMode(IntFlag):
     ili2pg = ili | pg
     ili2gpkg = ili | gpkg
     ili2mssql = ili | mssql
+
+
+class JvmProfile(Enum):
+    # the defaults of the java virtual machine
+    DEFAULT = "default"
+    # sized by the operation and the size of the transfer file
+    AUTO = "auto"
+    # quick startup without full JIT compilation, for small jobs
+    FAST_STARTUP = "fast_startup"
+    # large heap and throughput garbage collector, for large transfer files
+    LARGE_DATA = "large_data"
+    # the custom java arguments
+    CUSTOM = "custom"
@@ -14,14 +14,27 @@ License:
 from typing import Optional
 
 from qgis.core import QgsNetworkAccessManager
-from qgis.PyQt.QtCore import QSettings
+from qgis.PyQt.QtCore import QProcess, QSettings
 from qgis.PyQt.QtNetwork import QNetworkProxy
 
-from .globals import DbIliMode
-from .ili2dbutils import get_all_modeldir_in_path
+from .globals import DbIliMode, JvmProfile
+from .ili2dbutils import get_all_modeldir_in_path, get_physical_memory_mb
+from .repository_bundle import RepositoryBundle, RepositoryBundleError
 
 
 class BaseConfiguration:
+    # heap sizing of the auto profile
+    MIN_HEAP_MB = 512
+    HEAP_MB_PER_INPUT_MB = 4
+    # transfer files below this size (in MB) are small jobs
+    SMALL_INPUT_MB = 16
+    # the share of the physical memory the heap may use at most
+    MAX_HEAP_SHARE = 0.75
+    # fallback when the physical memory is unknown
+    MAX_HEAP_MB = 4096
+
+    FAST_STARTUP_ARGS = ["-XX:TieredStopAtLevel=1", "-XX:+UseSerialGC"]
+
     def __init__(self):
         self.super_pg_user = "postgres"  # pragma: allowlist secret
         self.super_pg_password = "postgres"  # pragma: allowlist secret
@@ -34,6 +47,16 @@ class BaseConfiguration:
 
         self.debugging_enabled = False
 
+        # run ili2db in a resident worker JVM instead of starting java for every call
+        self.ili2db_worker_enabled = False
+
+        self.jvm_profile = JvmProfile.DEFAULT
+        self.jvm_custom_args = ""
+
+        # offline repository bundle replacing the repositories it contains (see RepositoryBundle)
+        self.repository_bundle_path = ""
+        self._repository_bundle = None
+
     def save(self, settings: QSettings) -> None:
         settings.setValue("SuperUser", self.super_pg_user)
         settings.setValue("SuperPassword", self.super_pg_password)
@@ -45,6 +68,10 @@ class BaseConfiguration:
         settings.setValue("JavaPath", self.java_path)
         settings.setValue("LogfilePath", self.logfile_path)
         settings.setValue("DebuggingEnabled", self.debugging_enabled)
+        settings.setValue("Ili2dbWorkerEnabled", self.ili2db_worker_enabled)
+        settings.setValue("JvmProfile", self.jvm_profile.value)
+        settings.setValue("JvmCustomArgs", self.jvm_custom_args)
+        settings.setValue("RepositoryBundlePath", self.repository_bundle_path)
 
     def restore(self, settings: QSettings) -> None:
         self.super_pg_user = settings.value("SuperUser", "postgres", str)
@@ -61,6 +88,17 @@ class BaseConfiguration:
         self.java_path = settings.value("JavaPath", "", str)
         self.debugging_enabled = settings.value("DebuggingEnabled", False, bool)
         self.logfile_path = settings.value("LogfilePath", "", str)
+        self.ili2db_worker_enabled = settings.value(
+            "Ili2dbWorkerEnabled", False, bool
+        )
+        try:
+            self.jvm_profile = JvmProfile(
+                settings.value("JvmProfile", JvmProfile.DEFAULT.value, str)
+            )
+        except ValueError:
+            self.jvm_profile = JvmProfile.DEFAULT
+        self.jvm_custom_args = settings.value("JvmCustomArgs", "", str)
+        self.repository_bundle_path = settings.value("RepositoryBundlePath", "", str)
 
     def to_ili2db_args(
         self, with_modeldir: bool = True, with_usabilityhub_repo: bool = False
@@ -70,27 +108,122 @@ class BaseConfiguration:
         """
         args = list()
 
+        custom_model_directories_used = (
+            self.custom_model_directories_enabled and self.custom_model_directories
+        )
         if with_modeldir:
-            if self.custom_model_directories_enabled and self.custom_model_directories:
-                str_model_directories = [
-                    get_all_modeldir_in_path(path)
-                    for path in self.custom_model_directories.split(";")
-                ]
-                str_model_directories = ";".join(str_model_directories)
+            if custom_model_directories_used:
+                model_directories = list()
+                for path in self.custom_model_directories.split(";"):
+                    model_directories += get_all_modeldir_in_path(path).split(";")
+                str_model_directories = ";".join(
+                    self.bundled_directories(model_directories)
+                )
                 args += ["--modeldir", str_model_directories]
+            elif not with_usabilityhub_repo and self.repository_bundle():
+                # the default model directories of ili2db contain remote repositories
+                args += [
+                    "--modeldir",
+                    ";".join(self.bundled_directories(self.model_directories)),
+                ]
         if with_usabilityhub_repo:
             if not self.custom_model_directories_enabled:
                 # Workaround for https://github.com/opengisch/QgisModelBaker/issues/784.
                 # Can be removed when ili2db has access to the UsabILIty Hub repository.
+                usabilityhub_directories = [
+                    "%ILI_FROM_DB",
+                    "%XTF_DIR",
+                    "http://models.interlis.ch/",
+                    "%JAR_DIR",
+                    "https://models.opengis.ch/",
+                ]
                 args += [
                     "--modeldir",
-                    "%ILI_FROM_DB;%XTF_DIR;http://models.interlis.ch/;%JAR_DIR;https://models.opengis.ch/",
+                    ";".join(self.bundled_directories(usabilityhub_directories)),
                 ]
         if self.debugging_enabled and self.logfile_path:
             args += ["--trace"]
             args += ["--log", self.logfile_path]
         return args
 
+    def to_jvm_args(
+        self, light_operation: bool = False, input_size: Optional[int] = None
+    ) -> list[str]:
+        """
+        Create the java virtual machine arguments of the profile.
+
+        Args:
+            light_operation: Whether the operation transfers no data (e.g. a delete or a metaconfig export)
+            input_size: The size of the transfer file in bytes if there is one
+
+        Returns:
+            list: java arguments to be placed before the ili2db arguments"""
+        if self.jvm_profile == JvmProfile.FAST_STARTUP:
+            return list(self.FAST_STARTUP_ARGS)
+        if self.jvm_profile == JvmProfile.LARGE_DATA:
+            return ["-Xmx{}m".format(self.max_heap_mb()), "-XX:+UseParallelGC"]
+        if self.jvm_profile == JvmProfile.CUSTOM:
+            # unlike shlex, backslashes are no escapes (e.g. in windows paths)
+            return QProcess.splitCommand(self.jvm_custom_args)
+        if self.jvm_profile == JvmProfile.AUTO:
+            if light_operation:
+                return list(self.FAST_STARTUP_ARGS)
+            if input_size is None:
+                return []
+            input_mb = input_size / 1048576
+            if input_mb < self.SMALL_INPUT_MB:
+                return list(self.FAST_STARTUP_ARGS)
+            heap_mb = min(
+                self.max_heap_mb(),
+                int(self.MIN_HEAP_MB + self.HEAP_MB_PER_INPUT_MB * input_mb),
+            )
+            return ["-Xmx{}m".format(heap_mb), "-XX:+UseParallelGC"]
+        return []
+
+    def max_heap_mb(self) -> int:
+        physical_memory_mb = get_physical_memory_mb()
+        if not physical_memory_mb:
+            return self.MAX_HEAP_MB
+        return max(self.MIN_HEAP_MB, int(physical_memory_mb * self.MAX_HEAP_SHARE))
+
+    def repository_bundle(self) -> Optional[RepositoryBundle]:
+        """
+        Returns the repository bundle of `repository_bundle_path` or None if there is none (or it cannot be read).
+        """
+        if not self.repository_bundle_path:
+            return None
+        if (
+            self._repository_bundle is None
+            or self._repository_bundle.path != self.repository_bundle_path
+        ):
+            try:
+                self._repository_bundle = RepositoryBundle(self.repository_bundle_path)
+            except RepositoryBundleError:
+                return None
+        return self._repository_bundle
+
+    def bundled_directories(self, directories: list[str]) -> list[str]:
+        """
+        Replaces the repositories contained in the repository bundle by the local mirrors of the bundle, so ili2db
+        does not access the network for them. The mirrors of the subsidiary sites are added with the first one.
+        """
+        bundle = self.repository_bundle()
+        if bundle is None:
+            return directories
+        result = list()
+        for directory in directories:
+            local_directory = bundle.local_directory(directory)
+            if local_directory is None:
+                result.append(directory)
+            elif local_directory not in result:
+                result.append(local_directory)
+                result += [
+                    mirror
+                    for mirror in bundle.model_directories
+                    if mirror not in result
+                ]
+        return result
+
     @property
     def model_directories(self) -> list:
         dirs = list()
@@ -272,6 +405,8 @@ class SchemaImportConfiguration(Ili2DbCommandConfiguration):
         self.name_lang = ""
         self.enum_tabs = "tabsid"  # "tabs","singletab"
         self.disable_mandatory = False
+        # create missing indexes and update the statistics after a successful run
+        self.optimize_db = False
 
     def to_ili2db_args(
         self, extra_args: list[str] = [], with_action: bool = True
@@ -399,6 +534,8 @@ class ImportDataConfiguration(SchemaImportConfiguration):
         self.with_importbid = False
         # requires sqlEnableNull on schema:
         self.skip_reference_errors = False
+        # drop the secondary indexes and foreign keys during the import and recreate them afterwards
+        self.bulk_load = False
 
     def to_ili2db_args(
         self, extra_args: list[str] = [], with_action: bool = True
@@ -462,6 +599,8 @@ class UpdateDataConfiguration(Ili2DbCommandConfiguration):
         self.with_importbid = False
         # requires sqlEnableNull on schema:
         self.skip_reference_errors = False
+        # create missing indexes and update the statistics after a successful run
+        self.optimize_db = False
 
     def to_ili2db_args(self, extra_args: list[str] = [], with_action: bool = True):
         args = list()
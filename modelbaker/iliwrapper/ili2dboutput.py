@@ -0,0 +1,141 @@
+"""
+Metadata:
+    Creation Date: 2026-10-18
+    Copyright: (C) 2026 by OPENGIS.ch
+    Contact: info@opengis.ch
+
+License:
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the **GNU General Public License** as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+"""
+from __future__ import annotations
+
+import re
+import time
+from enum import Enum
+from typing import Optional
+
+
+class Ili2dbOutputEventType(Enum):
+    PHASE = 1
+    PROGRESS = 2
+    WARNING = 3
+    ERROR = 4
+    DONE = 5
+
+
+class Ili2dbOutputEvent:
+    """
+    A structured event of the ili2db output.
+
+    `text` is the message without its level prefix, `phase` the current phase and `count` the number of objects
+    reported so far.
+    """
+
+    def __init__(
+        self,
+        type: Ili2dbOutputEventType,
+        text: str,
+        phase: Optional[str] = None,
+        count: int = 0,
+    ) -> None:
+        self.type = type
+        self.text = text
+        self.phase = phase
+        self.count = count
+
+    def __repr__(self) -> str:
+        return "Ili2dbOutputEvent({}, {!r})".format(self.type.name, self.text)
+
+
+class Ili2dbOutputParser:
+    """
+    Line buffered parser turning the ili2db output into structured events.
+
+    Only phases, warnings, errors and the end are reported as events, the informational lines are not. Progress
+    events (the number of written or validated objects) are emitted at most every `progress_interval` seconds.
+    """
+
+    DONE_PATTERN = re.compile(r"Info: \.\.\.([a-zA-Z]+ )?done")
+    FAILED_PATTERN = re.compile(r"Error: \.\.\.([a-zA-Z]+ )?failed")
+    COUNT_PATTERN = re.compile(r"(\d+) objects?\b")
+
+    def __init__(self, progress_interval: float = 0.2) -> None:
+        self.progress_interval = progress_interval
+        self.phase = None
+        self.count = 0
+        self.warning_count = 0
+        self.error_count = 0
+        self.done = False
+        self.failed = False
+        self._buffer = ""
+        self._last_progress = 0.0
+        self._pending_progress = False
+
+    def feed(self, text: str) -> list[Ili2dbOutputEvent]:
+        """
+        Parses the complete lines of the text, a trailing partial line is kept for the next call.
+        """
+        lines = (self._buffer + text).split("\n")
+        self._buffer = lines.pop()
+        events = list()
+        for line in lines:
+            event = self.parse_line(line.rstrip("\r"))
+            if event is not None:
+                events.append(event)
+        return events
+
+    def flush(self) -> list[Ili2dbOutputEvent]:
+        """
+        Parses the remaining partial line and reports the last progress not reported yet.
+        """
+        events = list()
+        if self._buffer:
+            event = self.parse_line(self._buffer.rstrip("\r"))
+            self._buffer = ""
+            if event is not None:
+                events.append(event)
+        if self._pending_progress:
+            self._pending_progress = False
+            events.append(self._event(Ili2dbOutputEventType.PROGRESS, ""))
+        return events
+
+    def parse_line(self, line: str) -> Optional[Ili2dbOutputEvent]:
+        if self.DONE_PATTERN.search(line):
+            self.done = True
+            # the done event reports the final count
+            self._pending_progress = False
+            return self._event(Ili2dbOutputEventType.DONE, line.strip())
+        if line.startswith("Info: "):
+            message = line[6:].strip()
+            count_match = self.COUNT_PATTERN.search(message)
+            if count_match:
+                self.count += int(count_match.group(1))
+                return self._progress_event(message)
+            if message.endswith("...") and not message.startswith("..."):
+                self.phase = message[:-3].strip()
+                return self._event(Ili2dbOutputEventType.PHASE, self.phase)
+            return None
+        if line.startswith("Warning: "):
+            self.warning_count += 1
+            return self._event(Ili2dbOutputEventType.WARNING, line[9:].strip())
+        if line.startswith("Error: "):
+            self.error_count += 1
+            if self.FAILED_PATTERN.match(line):
+                self.failed = True
+            return self._event(Ili2dbOutputEventType.ERROR, line[7:].strip())
+        return None
+
+    def _progress_event(self, message: str) -> Optional[Ili2dbOutputEvent]:
+        now = time.monotonic()
+        if now - self._last_progress < self.progress_interval:
+            self._pending_progress = True
+            return None
+        self._last_progress = now
+        self._pending_progress = False
+        return self._event(Ili2dbOutputEventType.PROGRESS, message)
+
+    def _event(self, type: Ili2dbOutputEventType, text: str) -> Ili2dbOutputEvent:
+        return Ili2dbOutputEvent(type, text, self.phase, self.count)
@@ -12,14 +12,14 @@ License:
 """
 from __future__ import annotations
 
-import glob
+import fnmatch
 import os
 import platform
 import re
 import subprocess
 import tempfile
 import zipfile
-from typing import TYPE_CHECKING, Callable, Optional
+from typing import TYPE_CHECKING, Callable, Iterator, Optional
 
 from qgis.PyQt.QtCore import QCoreApplication, pyqtSignal
 
@@ -128,17 +128,47 @@ def get_ili2db_bin(
     return ili2db_file
 
 
+def iter_ili_files_in_path(path: str) -> Iterator[tuple[str, list[str]]]:
+    """
+    Traverses the directory tree of ``path`` (top-down, not following symlinks) with a single `os.scandir` per
+    directory and yields the directories containing .ili files together with the paths of these files.
+    """
+    directories = [path]
+    while directories:
+        directory = directories.pop()
+        ilifiles = list()
+        subdirs = list()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir() and not entry.is_symlink():
+                            subdirs.append(entry.path)
+                        elif (
+                            not entry.name.startswith(".")
+                            and fnmatch.fnmatch(entry.name, "*.ili")
+                            and entry.is_file()
+                        ):
+                            ilifiles.append(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+        if ilifiles:
+            yield directory, ilifiles
+        # keep the order of os.walk
+        directories.extend(reversed(subdirs))
+
+
 def get_all_modeldir_in_path(
     path: str, lambdafunction: Optional[Callable[[str], None]] = None
 ):
-    all_subdirs = [path[0] for path in os.walk(path)]  # include path
     # Make sure path is included, it can be a special string like `%XTF_DIR`
     modeldirs = [path]
-    for subdir in all_subdirs:
-        if os.path.isdir(subdir) and len(glob.glob(subdir + "/*.ili")) > 0:
-            if lambdafunction is not None:
-                lambdafunction(subdir)
-            modeldirs += [subdir]
+    for subdir, _ in iter_ili_files_in_path(path):
+        if lambdafunction is not None:
+            lambdafunction(subdir)
+        modeldirs += [subdir]
 
     # Remove duplicates
     modeldirs = list(dict.fromkeys(modeldirs))
@@ -252,6 +282,38 @@ def get_java_path(base_configuration: BaseConfiguration) -> str:
         raise JavaNotFoundError(version_output)
 
 
+def get_physical_memory_mb() -> Optional[int]:
+    """
+    Returns the physical memory of the system in megabytes or None if it cannot be determined.
+    """
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // 1048576
+    except (AttributeError, ValueError, OSError):
+        pass
+
+    if platform.system() == "Windows":
+        import ctypes
+
+        class MemoryStatus(ctypes.Structure):
+            _fields_ = [
+                ("dwLength", ctypes.c_ulong),
+                ("dwMemoryLoad", ctypes.c_ulong),
+                ("ullTotalPhys", ctypes.c_ulonglong),
+                ("ullAvailPhys", ctypes.c_ulonglong),
+                ("ullTotalPageFile", ctypes.c_ulonglong),
+                ("ullAvailPageFile", ctypes.c_ulonglong),
+                ("ullTotalVirtual", ctypes.c_ulonglong),
+                ("ullAvailVirtual", ctypes.c_ulonglong),
+                ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+            ]
+
+        status = MemoryStatus()
+        status.dwLength = ctypes.sizeof(MemoryStatus)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullTotalPhys // 1048576
+    return None
+
+
 def is_version_valid(
     current_version: str,
     min_required_version: str,
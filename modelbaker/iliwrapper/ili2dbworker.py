@@ -0,0 +1,402 @@
+"""
+Metadata:
+    Creation Date: 2026-10-18
+    Copyright: (C) 2026 by OPENGIS.ch
+    Contact: info@opengis.ch
+
+License:
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the **GNU General Public License** as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+"""
+from __future__ import annotations
+
+import functools
+import itertools
+import os
+from collections import deque
+from typing import Optional
+
+from qgis.PyQt.QtCore import QObject, QProcess, Qt, QThread, pyqtSignal
+
+READY_MARKER = "@@ili2db-worker-ready"
+DONE_MARKER = "@@ili2db-worker-job-done"
+
+# The resident launcher. It loads the main class of the ili2db jar once and runs the jobs it reads from stdin one
+# after the other. A job is a line "<id> <argument count>" followed by one escaped argument per line. At the end of
+# every job a done marker with the exit status is written to stdout and stderr.
+# It's run as a single source file program (Java 11+), so nothing has to be compiled.
+WORKER_SOURCE = r"""
+import java.io.BufferedReader;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.lang.reflect.InvocationTargetException;
+import java.lang.reflect.Method;
+import java.nio.charset.StandardCharsets;
+import java.security.Permission;
+import java.util.jar.Attributes;
+import java.util.jar.JarFile;
+
+public class Ili2dbWorker {
+    static final String READY_MARKER = "@@ili2db-worker-ready";
+    static final String DONE_MARKER = "@@ili2db-worker-job-done";
+
+    static class ExitException extends SecurityException {
+        final int status;
+
+        ExitException(int status) {
+            this.status = status;
+        }
+    }
+
+    public static void main(String[] args) throws Exception {
+        String mainClassName;
+        try (JarFile jar = new JarFile(args[0])) {
+            mainClassName = jar.getManifest().getMainAttributes().getValue(Attributes.Name.MAIN_CLASS);
+        }
+        Method main = Class.forName(mainClassName).getMethod("main", String[].class);
+        installExitTrap();
+
+        PrintStream out = System.out;
+        PrintStream err = System.err;
+        out.println(READY_MARKER);
+        out.flush();
+
+        BufferedReader in = new BufferedReader(new InputStreamReader(System.in, StandardCharsets.UTF_8));
+        String line;
+        while ((line = in.readLine()) != null) {
+            String[] header = line.trim().split(" ");
+            if (header.length != 2) {
+                continue;
+            }
+            String id = header[0];
+            String[] jobArgs = new String[Integer.parseInt(header[1])];
+            for (int i = 0; i < jobArgs.length; i++) {
+                jobArgs[i] = unescape(in.readLine());
+            }
+
+            int status = 0;
+            try {
+                main.invoke(null, (Object) jobArgs);
+            } catch (InvocationTargetException e) {
+                Throwable cause = e.getCause();
+                if (cause instanceof ExitException) {
+                    status = ((ExitException) cause).status;
+                } else {
+                    cause.printStackTrace();
+                    status = 1;
+                }
+            }
+
+            System.setOut(out);
+            System.setErr(err);
+            out.println(DONE_MARKER + " " + id + " " + status);
+            out.flush();
+            err.println(DONE_MARKER + " " + id + " " + status);
+            err.flush();
+        }
+    }
+
+    @SuppressWarnings({"deprecation", "removal"})
+    static void installExitTrap() {
+        // a job calling System.exit must not end the worker
+        try {
+            System.setSecurityManager(new SecurityManager() {
+                @Override
+                public void checkPermission(Permission permission) {
+                }
+
+                @Override
+                public void checkExit(int status) {
+                    throw new ExitException(status);
+                }
+            });
+        } catch (UnsupportedOperationException | SecurityException e) {
+            // not allowed on newer JVMs, then the worker ends with such a job and is started again
+        }
+    }
+
+    static String unescape(String value) {
+        if (value == null) {
+            return "";
+        }
+        StringBuilder result = new StringBuilder();
+        for (int i = 0; i < value.length(); i++) {
+            char c = value.charAt(i);
+            if (c == '\\' && i + 1 < value.length()) {
+                char next = value.charAt(++i);
+                result.append(next == 'n' ? '\n' : next == 'r' ? '\r' : next);
+            } else {
+                result.append(c);
+            }
+        }
+        return result.toString();
+    }
+}
+"""
+
+
+def worker_source_path() -> Optional[str]:
+    """
+    Returns the path of the launcher source next to the ili2db binaries and writes it if it's missing or outdated.
+    If the plugin directory is read-only, it's written to the cache directory. Returns None if it cannot be written
+    at all.
+    """
+    for directory in (
+        os.path.join(os.path.dirname(os.path.realpath(__file__)), "bin"),
+        os.path.expanduser("~/.ilicache"),
+    ):
+        path = os.path.join(directory, "Ili2dbWorker.java")
+        try:
+            with open(path, encoding="utf-8") as file:
+                if file.read() == WORKER_SOURCE:
+                    return path
+        except OSError:
+            pass
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(WORKER_SOURCE)
+            return path
+        except OSError:
+            continue
+    return None
+
+
+def escaped_worker_arg(argument: str) -> str:
+    return argument.replace("\\", "\\\\").replace("\n", "\\n").replace("\r", "\\r")
+
+
+class Ili2dbWorkerJob(QObject):
+    """
+    An ili2db run queued to a worker. The output of the run is emitted per job.
+    """
+
+    stdout = pyqtSignal(str)
+    stderr = pyqtSignal(str)
+    finished = pyqtSignal(int)
+
+    def __init__(self, job_id: int, args: list[str], parent=None) -> None:
+        QObject.__init__(self, parent)
+        self.job_id = job_id
+        self.args = args
+        self.exit_code = None
+        # the launcher could not be started, the job has to be run in its own process
+        self.worker_unavailable = False
+        self.done_streams = set()
+
+    @property
+    def is_finished(self) -> bool:
+        return self.exit_code is not None
+
+
+class Ili2dbWorker(QObject):
+    """
+    A resident JVM running ili2db jobs of the same ili2db jar one after the other.
+
+    It saves the JVM startup and the class loading of ili2db for every job. The process is started with the first
+    job and started again when it ends (e.g. because a job called `System.exit` on a JVM not allowing to trap it).
+    """
+
+    def __init__(
+        self,
+        java_path: str,
+        ili2db_jar: str,
+        encoding: str = "UTF8",
+        jvm_args: Optional[list[str]] = None,
+        parent=None,
+    ) -> None:
+        QObject.__init__(self, parent)
+        self.java_path = java_path
+        self.ili2db_jar = ili2db_jar
+        self.encoding = encoding
+        self.jvm_args = jvm_args or list()
+        self.process = None
+        self.ready = False
+        self.unavailable = False
+        self.queue = deque()
+        self.current_job = None
+        self.buffers = {"stdout": b"", "stderr": b""}
+        self._job_ids = itertools.count(1)
+
+    def submit(self, args: list[str]) -> Optional[Ili2dbWorkerJob]:
+        """
+        Queues the ili2db arguments as a job and returns it or None if the worker cannot be started.
+        """
+        if self.unavailable:
+            return None
+        job = Ili2dbWorkerJob(next(self._job_ids), args, self)
+        self.queue.append(job)
+        self._start_next_job()
+        return job
+
+    def cancel(self, job: Ili2dbWorkerJob) -> None:
+        """
+        Removes a queued job or terminates the worker running it.
+        """
+        if job in self.queue:
+            self.queue.remove(job)
+            self._finish_job(job, -1)
+        elif job is self.current_job and self.process is not None:
+            self.process.kill()
+
+    def stop(self) -> None:
+        self.queue.clear()
+        if self.process is not None:
+            self.process.closeWriteChannel()
+            if not self.process.waitForFinished(3000):
+                self.process.kill()
+                self.process.waitForFinished(1000)
+
+    def _start_process(self) -> bool:
+        source_path = worker_source_path()
+        if source_path is None:
+            # then every job is run in its own process
+            self._set_unavailable()
+            return False
+        self.process = QProcess(self)
+        self.ready = False
+        self.buffers = {"stdout": b"", "stderr": b""}
+        self.process.readyReadStandardOutput.connect(self._read_stdout)
+        self.process.readyReadStandardError.connect(self._read_stderr)
+        self.process.finished.connect(self._on_process_finished)
+        self.process.start(
+            self.java_path,
+            self.jvm_args
+            + ["-cp", self.ili2db_jar, source_path, self.ili2db_jar],
+        )
+        if not self.process.waitForStarted():
+            self.process = None
+            self._set_unavailable()
+            return False
+        return True
+
+    def _start_next_job(self) -> None:
+        if self.current_job is not None or not self.queue:
+            return
+        if self.process is None and not self._start_process():
+            return
+        job = self.queue.popleft()
+        self.current_job = job
+        lines = ["{} {}".format(job.job_id, len(job.args))]
+        lines += [escaped_worker_arg(arg) for arg in job.args]
+        self.process.write(("\n".join(lines) + "\n").encode("utf-8"))
+
+    def _read_stdout(self) -> None:
+        data = bytes(self.process.readAllStandardOutput())
+        self._process_output("stdout", data)
+
+    def _read_stderr(self) -> None:
+        data = bytes(self.process.readAllStandardError())
+        self._process_output("stderr", data)
+
+    def _process_output(self, stream: str, data: bytes) -> None:
+        # the markers are recognized on complete lines only
+        lines = (self.buffers[stream] + data).split(b"\n")
+        self.buffers[stream] = lines.pop()
+        text = ""
+        for line in lines:
+            decoded_line = line.decode(self.encoding, errors="replace")
+            if decoded_line.startswith(READY_MARKER):
+                self.ready = True
+            elif decoded_line.startswith(DONE_MARKER):
+                self._emit_output(stream, text)
+                text = ""
+                self._on_stream_done(stream, decoded_line)
+            else:
+                text += decoded_line + "\n"
+        self._emit_output(stream, text)
+
+    def _emit_output(self, stream: str, text: str) -> None:
+        # output of the launcher before it's ready (e.g. compiler notes) is not part of a job
+        if text and self.ready and self.current_job is not None:
+            getattr(self.current_job, stream).emit(text)
+
+    def _on_stream_done(self, stream: str, marker_line: str) -> None:
+        job = self.current_job
+        parts = marker_line.split()
+        if job is None or len(parts) != 3 or parts[1] != str(job.job_id):
+            return
+        job.done_streams.add(stream)
+        if job.done_streams == {"stdout", "stderr"}:
+            self.current_job = None
+            self._finish_job(job, int(parts[2]))
+            self._start_next_job()
+
+    def _on_process_finished(self, exit_code: int) -> None:
+        process = self.process
+        self.process = None
+        if process is not None:
+            process.deleteLater()
+
+        if not self.ready:
+            # the launcher itself failed (e.g. the java version cannot run single source file programs)
+            self._set_unavailable()
+            return
+
+        job = self.current_job
+        self.current_job = None
+        if job is not None:
+            self._finish_job(job, exit_code)
+        self._start_next_job()
+
+    def _set_unavailable(self) -> None:
+        self.unavailable = True
+        jobs = list(self.queue)
+        if self.current_job is not None:
+            jobs.insert(0, self.current_job)
+        self.queue.clear()
+        self.current_job = None
+        for job in jobs:
+            job.worker_unavailable = True
+            self._finish_job(job, -1)
+
+    def _finish_job(self, job: Ili2dbWorkerJob, exit_code: int) -> None:
+        job.exit_code = exit_code
+        job.finished.emit(exit_code)
+
+
+class Ili2dbWorkerPool:
+    """
+    The resident workers keyed by the thread, the java executable, the ili2db jar and the java arguments.
+
+    A worker and its process belong to the thread creating them (e.g. the thread of a processing task), so every
+    thread gets its own workers. They are stopped when their thread finishes.
+    """
+
+    def __init__(self) -> None:
+        self.workers = dict()
+
+    def worker(
+        self,
+        java_path: str,
+        ili2db_jar: str,
+        encoding: str = "UTF8",
+        jvm_args: Optional[list[str]] = None,
+    ) -> Ili2dbWorker:
+        # the thread is kept in the key, so it's the same wrapper for every call from it
+        thread = QThread.currentThread()
+        key = (thread, java_path, ili2db_jar, tuple(jvm_args or ()))
+        if key not in self.workers:
+            if not any(worker_key[0] is thread for worker_key in self.workers):
+                thread.finished.connect(
+                    functools.partial(self.stop_thread_workers, thread),
+                    Qt.ConnectionType.DirectConnection,
+                )
+            self.workers[key] = Ili2dbWorker(
+                java_path, ili2db_jar, encoding, jvm_args
+            )
+        return self.workers[key]
+
+    def stop_thread_workers(self, thread: QThread) -> None:
+        for key in [key for key in self.workers if key[0] is thread]:
+            self.workers.pop(key).stop()
+
+    def stop_all(self) -> None:
+        for worker in self.workers.values():
+            worker.stop()
+        self.workers.clear()
+
+
+ili2db_worker_pool = Ili2dbWorkerPool()
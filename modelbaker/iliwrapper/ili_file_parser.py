@@ -0,0 +1,114 @@
+"""
+Metadata:
+    Creation Date: 2026-10-18
+    Copyright: (C) 2026 by OPENGIS.ch
+    Contact: info@opengis.ch
+
+License:
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the **GNU General Public License** as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+"""
+from __future__ import annotations
+
+import io
+import multiprocessing
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Optional
+
+# This module does not import Qt/QGIS, so the worker processes parsing the ili files start fast.
+
+RE_MODEL = re.compile(r"\s*MODEL\s*([\w\d_-]+).*")
+RE_MODEL_VERSION = re.compile(r'VERSION "([ \w\d\._-]+)".*')
+
+
+def parse_ili_lines(ilipath: str, lines: Iterable[str]) -> list:
+    """
+    Returns the models with their version defined in the lines of an ili file.
+    """
+    models = list()
+    model = None
+    for lineno, line in enumerate(lines):
+        # the regular expressions only match lines containing the keywords
+        if "MODEL" not in line and "VERSION" not in line:
+            continue
+        line = line.split("!!")[0]
+        result = RE_MODEL.search(line)
+        if result:
+            model = dict()
+            model["name"] = result.group(1)
+            model["version"] = ""
+            model["repository"] = ilipath
+            models += [model]
+
+        result = RE_MODEL_VERSION.search(line)
+        if result:
+            if not model:
+                raise RuntimeError(
+                    "VERSION tag found in file {}:{} without previous MODEL definition.".format(
+                        ilipath, lineno
+                    )
+                )
+            model["version"] = result.group(1)
+            model = None
+
+    return models
+
+
+def decode_ili_file(ilifile: str) -> tuple[str, str]:
+    """
+    Reads the ili file once and returns the encoding (UTF-8 or else Latin-1) and the text.
+    """
+    with open(ilifile, "rb") as file:
+        content = file.read()
+    try:
+        encoding = "utf-8"
+        text = content.decode(encoding)
+    except UnicodeDecodeError:
+        encoding = "latin1"
+        text = content.decode(encoding)
+    return encoding, text
+
+
+def read_ili_file(ilifile: str) -> tuple[str, list]:
+    """
+    Returns the encoding and the models of the ili file.
+    """
+    encoding, text = decode_ili_file(ilifile)
+    return encoding, parse_ili_lines(ilifile, io.StringIO(text, newline=None))
+
+
+def python_executable() -> Optional[str]:
+    """
+    Returns the python interpreter to start worker processes with. When python is embedded (e.g. in QGIS),
+    `sys.executable` is the application itself and the interpreter is looked up in the python installation.
+    """
+    if os.path.basename(sys.executable).lower().startswith("python"):
+        return sys.executable
+    for path in (
+        os.path.join(sys.exec_prefix, "python.exe"),
+        os.path.join(sys.exec_prefix, "pythonw.exe"),
+        os.path.join(sys.exec_prefix, "bin", "python3"),
+    ):
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def ili_file_process_pool(
+    max_workers: Optional[int] = None,
+) -> Optional[ProcessPoolExecutor]:
+    """
+    Returns a pool of processes parsing ili files or None if no python interpreter is found to start them.
+    The processes are spawned (not forked), so they do not inherit the threads of the application.
+    """
+    executable = python_executable()
+    if executable is None:
+        return None
+    context = multiprocessing.get_context("spawn")
+    context.set_executable(executable)
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
@@ -0,0 +1,233 @@
+"""
+Metadata:
+    Creation Date: 2026-10-18
+    Copyright: (C) 2026 by OPENGIS.ch
+    Contact: info@opengis.ch
+
+License:
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the **GNU General Public License** as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+"""
+from __future__ import annotations
+
+import copy
+import functools
+import os
+import time
+from collections import Counter
+from typing import Optional
+
+from qgis.PyQt.QtCore import QEventLoop, QObject, QProcess, pyqtSignal
+
+from .globals import DbIliMode
+from .ili2dbutils import JavaNotFoundError
+from .ilideleter import Deleter
+from .iliexecutable import IliExecutable
+from .iliimporter import Importer
+from .iliupdater import Updater
+
+# executables writing to the database
+WRITING_EXECUTABLES = (Importer, Updater, Deleter)
+
+
+def database_lock_key(executable: IliExecutable) -> Optional[tuple]:
+    """
+    Returns a key identifying the database (or schema) the executable runs against.
+    """
+    configuration = executable.configuration
+    if executable.tool is not None and executable.tool & DbIliMode.gpkg:
+        return ("gpkg", os.path.normcase(os.path.abspath(configuration.dbfile)))
+    return (
+        "db",
+        configuration.dbservice,
+        configuration.dbhost,
+        configuration.dbport,
+        configuration.dbinstance,
+        configuration.database,
+        configuration.dbschema,
+    )
+
+
+def copy_executable(executable: IliExecutable) -> IliExecutable:
+    """
+    Returns a new executable of the same type with a copy of the configuration.
+    The base configuration is shared, the copy constructors of the configurations would reset the operation
+    specific settings.
+    """
+    configuration = executable.configuration
+    executable_copy = type(executable)()
+    executable_copy.tool = executable.tool
+    executable_copy.light_operation = executable.light_operation
+    executable_copy.configuration = copy.deepcopy(
+        configuration,
+        {id(configuration.base_configuration): configuration.base_configuration},
+    )
+    return executable_copy
+
+
+class IliBatchJob:
+    """
+    An ili2db run of a batch with its result, exit code, log and duration (in seconds).
+    """
+
+    def __init__(self, executable: IliExecutable, name: Optional[str] = None) -> None:
+        self.executable = executable
+        self.name = name or getattr(executable.configuration, "xtffile", "") or ""
+        self.writes = isinstance(executable, WRITING_EXECUTABLES)
+        self.lock_key = database_lock_key(executable)
+        self.process = None
+        self.result = None
+        self.exit_code = None
+        self.error = None
+        self.log = list()
+        self.duration = None
+        self.started_at = None
+
+        executable.stdout.connect(self.log.append)
+        executable.stderr.connect(self.log.append)
+
+    @property
+    def succeeded(self) -> bool:
+        return self.result == IliExecutable.SUCCESS
+
+
+class IliBatchRunner(QObject):
+    """
+    Runs the ili2db jobs of a batch (e.g. the import or validation of many transfer files) concurrently.
+
+    At most `max_workers` ili2db processes run at the same time. Jobs writing to the same database (schema) are run
+    one after the other and on GeoPackages (allowing only one writer) no job runs while another is writing to it.
+    """
+
+    job_started = pyqtSignal(int)
+    job_finished = pyqtSignal(int, int)
+    finished = pyqtSignal()
+
+    def __init__(self, max_workers: Optional[int] = None, parent=None) -> None:
+        QObject.__init__(self, parent)
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.jobs = list()
+        self.pending = list()
+        self.running = list()
+        self.canceled = False
+
+    def add(self, executable: IliExecutable, name: Optional[str] = None) -> IliBatchJob:
+        job = IliBatchJob(executable, name)
+        self.jobs.append(job)
+        return job
+
+    def add_xtffiles(
+        self,
+        executable: IliExecutable,
+        xtffiles: list[str],
+        datasets: Optional[list[str]] = None,
+    ) -> list[IliBatchJob]:
+        """
+        Adds a job per transfer file (and dataset if given) with a copy of the executable and its configuration.
+        """
+        jobs = list()
+        for index, xtffile in enumerate(xtffiles):
+            job_executable = copy_executable(executable)
+            job_executable.configuration.xtffile = xtffile
+            if datasets:
+                job_executable.configuration.dataset = datasets[index]
+            jobs.append(self.add(job_executable, xtffile))
+        return jobs
+
+    def run(self) -> list[IliBatchJob]:
+        """
+        Runs all the added jobs and returns them when they are finished.
+        """
+        self.canceled = False
+        self.pending = [job for job in self.jobs if job.result is None]
+        if self.pending:
+            loop = QEventLoop()
+            self.finished.connect(loop.quit)
+            self._start_jobs()
+            if self.pending or self.running:
+                loop.exec()
+            self.finished.disconnect(loop.quit)
+        return self.jobs
+
+    def cancel(self) -> None:
+        """
+        Skips the jobs not started yet and terminates the running ones.
+        """
+        self.canceled = True
+        self.pending.clear()
+        for job in self.running:
+            job.executable.cancel_process.emit()
+
+    @property
+    def succeeded(self) -> bool:
+        return all(job.succeeded for job in self.jobs)
+
+    @property
+    def summary(self) -> Counter:
+        """
+        Returns the number of jobs per result.
+        """
+        return Counter(job.result for job in self.jobs)
+
+    def _can_start(
+        self, job: IliBatchJob, writing_keys: set, reading_keys: set
+    ) -> bool:
+        if job.lock_key in writing_keys:
+            return False
+        if job.writes and job.lock_key in reading_keys:
+            # only GeoPackages need to be free of readers for writing
+            return job.lock_key[0] != "gpkg"
+        return True
+
+    def _start_jobs(self) -> None:
+        writing_keys = {job.lock_key for job in self.running if job.writes}
+        reading_keys = {job.lock_key for job in self.running if not job.writes}
+        for job in list(self.pending):
+            if len(self.running) >= self.max_workers:
+                break
+            if not self._can_start(job, writing_keys, reading_keys):
+                # the following jobs on the same database wait as well to keep their order
+                writing_keys.add(job.lock_key)
+                continue
+            self.pending.remove(job)
+            if self._start_job(job):
+                (writing_keys if job.writes else reading_keys).add(job.lock_key)
+
+        if not self.pending and not self.running:
+            self.finished.emit()
+
+    def _start_job(self, job: IliBatchJob) -> bool:
+        index = self.jobs.index(job)
+        job.started_at = time.monotonic()
+        try:
+            job.process = job.executable.start_process()
+        except JavaNotFoundError as e:
+            job.error = e
+        if job.process is None:
+            job.result = (
+                IliExecutable.ERROR if job.error else IliExecutable.ILI2DB_NOT_FOUND
+            )
+            job.duration = time.monotonic() - job.started_at
+            self.job_finished.emit(index, job.result)
+            return False
+
+        self.running.append(job)
+        job.process.finished.connect(functools.partial(self._on_job_finished, job))
+        self.job_started.emit(index)
+        return True
+
+    def _on_job_finished(
+        self, job: IliBatchJob, exit_code: int, exit_status: QProcess.ExitStatus
+    ) -> None:
+        process = job.process
+        job.process = None
+        job.exit_code = exit_code
+        job.result = job.executable.finish_process(process)
+        if exit_status == QProcess.ExitStatus.CrashExit or self.canceled:
+            job.result = IliExecutable.ERROR
+        job.duration = time.monotonic() - job.started_at
+        self.running.remove(job)
+        self.job_finished.emit(self.jobs.index(job), job.result)
+        self._start_jobs()
@@ -12,19 +12,26 @@ License:
 """
 from __future__ import annotations
 
+import functools
 import glob
+import io
+import json
 import logging
 import os
 import re
 import shutil
 import urllib.parse
 import xml.etree.ElementTree as ET  # nosec
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
 from enum import Enum
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Callable, Iterable, Optional, Union
 
 from qgis.core import Qgis, QgsMessageLog
 from qgis.PyQt.QtCore import (
     QDir,
+    QModelIndex,
+    QCoreApplication,
     QObject,
     QSortFilterProxyModel,
     Qt,
@@ -32,10 +39,26 @@ from qgis.PyQt.QtCore import (
     pyqtSignal,
 )
 from qgis.PyQt.QtGui import QPalette, QRegion, QStandardItem, QStandardItemModel
-from qgis.PyQt.QtWidgets import QGridLayout, QItemDelegate, QLabel, QStyle, QWidget
+from qgis.PyQt.QtWidgets import (
+    QCompleter,
+    QGridLayout,
+    QItemDelegate,
+    QLabel,
+    QStyle,
+    QWidget,
+)
 
-from ..utils.qt_utils import download_file
-from .ili2dbutils import get_all_modeldir_in_path
+from ..utils.qt_utils import HttpValidatorStore, download_file
+from .ili2dbutils import iter_ili_files_in_path
+from .ili_file_parser import (
+    decode_ili_file,
+    ili_file_process_pool,
+    parse_ili_lines,
+    read_ili_file,
+)
+from .model_name_index import ModelNameIndex
+from .repository_bundle import RepositoryBundle
+from .repository_index import IliFileIndex, RepositoryIndex, file_hash
 
 if TYPE_CHECKING:
     # only needed for type checking to avoid circular imports
@@ -46,25 +69,59 @@ class IliCache(QObject):
     ns = {"ili23": "http://www.interlis.ch/INTERLIS2.3"}
 
     new_message = pyqtSignal(int, str)
+    # emitted when all the repositories (including the subsidiary sites) of a refresh are resolved
+    repositories_resolved = pyqtSignal()
+    # progress of the parsing of local ili files (parsed files, total files)
+    ili_files_parsed = pyqtSignal(int, int)
 
     CACHE_PATH = os.path.expanduser("~/.ilicache")
+    # maximum number of concurrent downloads while crawling the repositories
+    MAX_PARALLEL_DOWNLOADS = 6
 
     def __init__(
-        self, configuration: BaseConfiguration, single_ili_file: Optional[str] = None
+        self,
+        configuration: BaseConfiguration,
+        single_ili_file: Optional[str] = None,
+        parallel_parsing: bool = False,
     ):
         QObject.__init__(self)
         self.information_file = "ilimodels.xml"
         self.repositories = dict()
         self.base_configuration = configuration
         self.single_ili_file = single_ili_file
+        # parse the ili files of local model directories concurrently
+        self.parallel_parsing = parallel_parsing
         self.model = IliModelItemModel()
-        self.sorted_model = QSortFilterProxyModel()
+        self.sorted_model = ModelSearchProxyModel()
         self.sorted_model.setSourceModel(self.model)
         self.sorted_model.sort(0, Qt.SortOrder.AscendingOrder)
         self.directories = None
         if self.base_configuration:
             self.directories = self.base_configuration.model_directories
 
+        # crawling state: the visited repositories and the queued and running downloads
+        self.visited_urls = set()
+        self.download_queue = deque()
+        self.running_downloads = 0
+        # the repositories are not resolved before the refresh has queued all its downloads
+        self.refreshing = False
+        # validators of the downloaded repository files to revalidate them on refresh
+        self.validator_store = HttpValidatorStore(
+            os.path.join(self.CACHE_PATH, "validators.json")
+        )
+        # the parsed informationfiles to not parse unchanged files again
+        self.repository_index = RepositoryIndex(
+            os.path.join(self.CACHE_PATH, "repository_index.sqlite")
+        )
+        # the models of the local ili files to not open unchanged files again
+        self.ili_file_index = IliFileIndex(
+            os.path.join(self.CACHE_PATH, "ili_file_index.json")
+        )
+        # offline bundle replacing the repositories it contains
+        self.bundle = None
+        if self.base_configuration:
+            self.bundle = self.base_configuration.repository_bundle()
+
         # refresh the models on changing values but avoid massive db connects by timer
         self.modelReposTimer = QTimer()
         self.modelReposTimer.setSingleShot(True)
@@ -72,18 +129,39 @@ class IliCache(QObject):
             lambda: self.model.set_repositories(self.repositories)
         )
 
+    def mount_bundle(self, bundle: Union[RepositoryBundle, str, None]) -> None:
+        """
+        Mounts an offline repository bundle (or its path). The repositories contained in the bundle are read from
+        their local mirror instead of being downloaded. Pass None to unmount it.
+        """
+        if isinstance(bundle, str):
+            bundle = RepositoryBundle(bundle)
+        self.bundle = bundle
+        if self.base_configuration:
+            # ili2db reads the models from the mirrors as well
+            self.base_configuration.repository_bundle_path = (
+                bundle.path if bundle else ""
+            )
+
     def set_repositories_to_model(self) -> None:
         # hold refresh back
         self.modelReposTimer.start(500)
 
     def refresh(self) -> None:
-        if not self.directories is None:
-            for directory in self.directories:
-                self.process_model_directory(directory)
+        self.visited_urls.clear()
+        self.refreshing = True
+        try:
+            if not self.directories is None:
+                for directory in self.directories:
+                    self.process_model_directory(directory)
+
+            if not self.single_ili_file is None:
+                if os.path.exists(self.single_ili_file):
+                    self.process_single_ili_file()
+        finally:
+            self.refreshing = False
 
-        if not self.single_ili_file is None:
-            if os.path.exists(self.single_ili_file):
-                self.process_single_ili_file()
+        self._check_repositories_resolved()
 
     def process_model_directory(self, path: str) -> None:
         if path[0] == "%":
@@ -94,10 +172,72 @@ class IliCache(QObject):
 
             if os.path.isdir(path):
                 # additional recursive search of paths containing ili files (without ilimodel.xml)
-                get_all_modeldir_in_path(path, self.process_local_ili_folder)
+                modeldirs = list(iter_ili_files_in_path(path))
+                if self.parallel_parsing:
+                    self.parse_ili_files_concurrently(
+                        [ilifile for _, ilifiles in modeldirs for ilifile in ilifiles]
+                    )
+                for subdir, ilifiles in modeldirs:
+                    self.process_local_ili_folder(subdir, ilifiles)
+                self.ili_file_index.save()
+
+    def parse_ili_files_concurrently(
+        self, ilifiles: list[str], max_workers: Optional[int] = None
+    ) -> None:
+        """
+        Reads and parses the ili files not yet in the ili file index with a pool of processes (not limited by the
+        GIL) and adds them to the index. While waiting for the processes, the events are processed, so the progress
+        is shown and the application stays responsive.
+        The results are added in the order of ``ilifiles``, so the following (sequential) processing of the files
+        takes them from the index and the resulting repositories do not depend on the order the processes finish.
+        Files that cannot be parsed (or all if no process can be started) are left to the sequential processing,
+        which reports the problem.
+        """
+        pending_files = list()
+        for ilifile in ilifiles:
+            try:
+                stat = os.stat(ilifile)
+            except OSError:
+                continue
+            if not self.ili_file_index.get(ilifile, stat):
+                pending_files.append((ilifile, stat))
+        if not pending_files:
+            return
+
+        executor = ili_file_process_pool(max_workers)
+        if executor is None:
+            return
+
+        results = [None] * len(pending_files)
+        with executor:
+            futures = {
+                executor.submit(read_ili_file, ilifile): index
+                for index, (ilifile, _) in enumerate(pending_files)
+            }
+            pending_futures = set(futures)
+            parsed_count = 0
+            while pending_futures:
+                done_futures, pending_futures = wait(
+                    pending_futures, timeout=0.05, return_when=FIRST_COMPLETED
+                )
+                for future in done_futures:
+                    try:
+                        results[futures[future]] = future.result()
+                    except (OSError, RuntimeError, UnicodeDecodeError):
+                        pass
+                    parsed_count += 1
+                if done_futures:
+                    self.ili_files_parsed.emit(parsed_count, len(pending_files))
+                QCoreApplication.processEvents()
+
+        for (ilifile, stat), result in zip(pending_files, results):
+            if result is not None:
+                encoding, models = result
+                self.ili_file_index.put(ilifile, stat, encoding, models)
 
     def process_single_ili_file(self) -> None:
         models = self.process_ili_file(self.single_ili_file)
+        self.ili_file_index.save()
         self.repositories["no_repo"] = sorted(
             models, key=lambda m: m["version"], reverse=True
         )
@@ -124,7 +264,21 @@ class IliCache(QObject):
         """
         Downloads the informationfile (default: ilimodels.xml) and ilisite.xml files from the provided url
         and updates the local cache.
+        Repositories already visited during the current refresh are skipped and the remote files are queued to be
+        downloaded concurrently (see `MAX_PARALLEL_DOWNLOADS`).
+        Repositories contained in a mounted bundle are taken from the bundle index and their local mirror.
         """
+        if self.bundle is not None:
+            local_directory = self.bundle.local_directory(url)
+            if local_directory is not None:
+                self._load_bundled_repository(url, local_directory)
+                return
+
+        visited_url = os.path.normpath(url) if os.path.isdir(url) else url.rstrip("/")
+        if visited_url in self.visited_urls:
+            return
+        self.visited_urls.add(visited_url)
+
         parsed_url = urllib.parse.urlparse(url)
         netloc = parsed_url.netloc + parsed_url.path if not os.path.isdir(url) else url
 
@@ -135,7 +289,7 @@ class IliCache(QObject):
         if os.path.isdir(url):
             # continue with the local file
             if os.path.exists(information_file_url):
-                self._process_informationfile(information_file_url, netloc, url)
+                self._load_informationfile(information_file_url, netloc, url)
             else:
                 logger.warning(
                     self.tr("Could not find local file {}").format(information_file_url)
@@ -153,30 +307,111 @@ class IliCache(QObject):
             ilisite_path = os.path.join(self.CACHE_PATH, netloc, "ilisite.xml")
 
             # download ilimodels.xml
-            download_file(
+            self._queue_download(
                 information_file_url,
                 information_file_path,
-                on_success=lambda: self._process_informationfile(
+                lambda: self._load_informationfile(information_file_path, netloc, url),
+                lambda: self._process_unmodified_informationfile(
                     information_file_path, netloc, url
                 ),
-                on_error=lambda error, error_string: logger.warning(
-                    self.tr("Could not download {url} ({message})").format(
-                        url=information_file_url, message=error_string
-                    )
-                ),
             )
 
             # download ilisite.xml
+            self._queue_download(
+                ilisite_url, ilisite_path, lambda: self._process_ilisite(ilisite_path)
+            )
+
+    def _load_bundled_repository(self, url: str, local_directory: str) -> None:
+        visited_url = self.bundle.repository_key(url)
+        if visited_url in self.visited_urls:
+            return
+        self.visited_urls.add(visited_url)
+
+        parsed_url = urllib.parse.urlparse(url)
+        netloc = parsed_url.netloc + parsed_url.path if not os.path.isdir(url) else url
+
+        self._process_bundled_repository(netloc, url, local_directory)
+
+        # follow the subsidiary sites (bundled or not)
+        ilisite_path = os.path.join(local_directory, "ilisite.xml")
+        if os.path.exists(ilisite_path):
+            self._process_ilisite(ilisite_path)
+
+    def _process_bundled_repository(
+        self, netloc: str, url: str, local_directory: str
+    ) -> None:
+        """
+        Updates the local repositories cache with the models of the repository in the bundle index.
+        """
+        self.repositories[netloc] = sorted(
+            (
+                {
+                    "name": model["name"],
+                    "version": model["version"],
+                    "repository": netloc,
+                }
+                for model in self.bundle.repository_models(url)
+            ),
+            key=lambda m: m["version"] if m["version"] else "0",
+            reverse=True,
+        )
+        self.set_repositories_to_model()
+
+    def _queue_download(
+        self,
+        url: str,
+        path: str,
+        on_success: Callable[[], None],
+        on_not_modified: Optional[Callable[[], None]] = None,
+        on_error: Optional[Callable[[str, str], None]] = None,
+    ) -> None:
+        self.download_queue.append(
+            (url, path, on_success, on_not_modified, on_error)
+        )
+        self._start_downloads()
+
+    def _start_downloads(self) -> None:
+        while (
+            self.download_queue
+            and self.running_downloads < self.MAX_PARALLEL_DOWNLOADS
+        ):
+            (
+                url,
+                path,
+                on_success,
+                on_not_modified,
+                on_error,
+            ) = self.download_queue.popleft()
+            self.running_downloads += 1
             download_file(
-                ilisite_url,
-                ilisite_path,
-                on_success=lambda: self._process_ilisite(ilisite_path),
-                on_error=lambda error, error_string: logger.warning(
-                    self.tr("Could not download {url} ({message})").format(
-                        url=ilisite_url, message=error_string
-                    )
-                ),
+                url,
+                path,
+                on_success=on_success,
+                validator_store=self.validator_store,
+                on_not_modified=on_not_modified,
+                on_error=on_error or functools.partial(self._log_download_error, url),
+                on_finished=self._on_download_finished,
+            )
+
+    def _log_download_error(self, url: str, error, error_string: str) -> None:
+        logging.getLogger(__name__).warning(
+            self.tr("Could not download {url} ({message})").format(
+                url=url, message=error_string
             )
+        )
+
+    def _on_download_finished(self) -> None:
+        self.running_downloads -= 1
+        self._start_downloads()
+        self._check_repositories_resolved()
+
+    def _check_repositories_resolved(self) -> None:
+        if (
+            not self.refreshing
+            and not self.running_downloads
+            and not self.download_queue
+        ):
+            self.repositories_resolved.emit()
 
     @classmethod
     def clear_cache(cls) -> None:
@@ -276,13 +511,56 @@ class IliCache(QObject):
 
         self.set_repositories_to_model()
 
-    def process_local_ili_folder(self, path: str) -> None:
+    def _process_unmodified_informationfile(
+        self, file: str, netloc: str, url: str
+    ) -> None:
+        """
+        Called when the server confirms that the cached informationfile did not change.
+        The already parsed repository is reused and the file is only parsed when it is not yet known.
+        """
+        if netloc not in self.repositories:
+            self._load_informationfile(file, netloc, url)
+
+    def _load_informationfile(self, file: str, netloc: str, url: str) -> None:
+        """
+        Loads the repository of the informationfile from the repository index and only parses the file with
+        `_process_informationfile` when it is not indexed yet (or has changed).
+        """
+        context = self._index_context(netloc, url)
+        content_hash = file_hash(file) if context else None
+        if content_hash:
+            entries = self.repository_index.get(content_hash, context)
+            if entries is not None:
+                self.repositories[netloc] = entries
+                self.set_repositories_to_model()
+                return
+
+        former_entries = self.repositories.get(netloc)
+        self._process_informationfile(file, netloc, url)
+        entries = self.repositories.get(netloc)
+        # on parse errors the repository is not updated
+        if content_hash and entries is not None and entries is not former_entries:
+            self.repository_index.put(content_hash, context, entries)
+
+    def _index_context(self, netloc: str, url: str) -> Optional[str]:
+        """
+        Returns the key describing everything the parsed repository depends on beside the file content.
+        None means the repository is not indexed.
+        """
+        return json.dumps([type(self).__name__, netloc, url])
+
+    def process_local_ili_folder(
+        self, path: str, ilifiles: Optional[list[str]] = None
+    ) -> None:
         """
         Parses all .ili files in the given ``path`` (non-recursively)
+        or the given ``ilifiles`` if they are already known.
         """
         models = list()
         fileModels = list()
-        for ilifile in glob.iglob(os.path.join(path, "*.ili")):
+        if ilifiles is None:
+            ilifiles = glob.iglob(os.path.join(path, "*.ili"))
+        for ilifile in ilifiles:
             fileModels = self.process_ili_file(ilifile)
             models.extend(fileModels)
 
@@ -293,20 +571,22 @@ class IliCache(QObject):
         self.set_repositories_to_model()
 
     def process_ili_file(self, ilifile: str) -> list:
-        fileModels = list()
+        """
+        Returns the models of the ili file. The file is read only once (decoded as UTF-8 or else Latin-1)
+        and unchanged files are taken from the ili file index without opening them.
+        """
         try:
-            fileModels = self.parse_ili_file(ilifile, "utf-8")
-        except UnicodeDecodeError:
+            stat = os.stat(ilifile)
+        except OSError:
+            stat = None
+
+        indexed_file = self.ili_file_index.get(ilifile, stat) if stat else None
+        if indexed_file:
+            encoding = indexed_file["encoding"]
+            fileModels = [dict(model) for model in indexed_file["models"]]
+        else:
             try:
-                fileModels = self.parse_ili_file(ilifile, "latin1")
-                self.new_message.emit(
-                    Qgis.MessageLevel.Warning,
-                    self.tr(
-                        "Even though the ili file `{}` could be read, it is not in UTF-8. Please encode your ili models in UTF-8.".format(
-                            os.path.basename(ilifile)
-                        )
-                    ),
-                )
+                encoding, fileModels = self._read_ili_file(ilifile)
             except UnicodeDecodeError as e:
                 self.new_message.emit(
                     Qgis.MessageLevel.Critical,
@@ -324,41 +604,39 @@ class IliCache(QObject):
                     ),
                     self.tr("modelbaker"),
                 )
-                fileModels = list()
+                return list()
+            if stat:
+                self.ili_file_index.put(ilifile, stat, encoding, fileModels)
+
+        if encoding != "utf-8":
+            self.new_message.emit(
+                Qgis.MessageLevel.Warning,
+                self.tr(
+                    "Even though the ili file `{}` could be read, it is not in UTF-8. Please encode your ili models in UTF-8.".format(
+                        os.path.basename(ilifile)
+                    )
+                ),
+            )
 
         return fileModels
 
+    def _read_ili_file(self, ilifile: str) -> tuple[str, list]:
+        """
+        Reads the ili file once (decoded as UTF-8 or else Latin-1) and returns the encoding and the models.
+        """
+        encoding, text = decode_ili_file(ilifile)
+        models = self._parse_ili_lines(ilifile, io.StringIO(text, newline=None))
+        return encoding, models
+
     def parse_ili_file(self, ilipath: str, encoding: str) -> list:
         """
         Parses an ili file returning models and version data
         """
-        models = list()
-        re_model = re.compile(r"\s*MODEL\s*([\w\d_-]+).*")
-        re_model_version = re.compile(r'VERSION "([ \w\d\._-]+)".*')
         with open(ilipath, encoding=encoding) as file:
-            model = None
-            for lineno, line in enumerate(file):
-                line = line.split("!!")[0]
-                result = re_model.search(line)
-                if result:
-                    model = dict()
-                    model["name"] = result.group(1)
-                    model["version"] = ""
-                    model["repository"] = ilipath
-                    models += [model]
-
-                result = re_model_version.search(line)
-                if result:
-                    if not model:
-                        raise RuntimeError(
-                            "VERSION tag found in file {}:{} without previous MODEL definition.".format(
-                                ilipath, lineno
-                            )
-                        )
-                    model["version"] = result.group(1)
-                    model = None
+            return self._parse_ili_lines(ilipath, file)
 
-        return models
+    def _parse_ili_lines(self, ilipath: str, lines: Iterable[str]) -> list:
+        return parse_ili_lines(ilipath, lines)
 
     @property
     def model_names(self) -> list:
@@ -384,28 +662,167 @@ class IliModelItemModel(QStandardItemModel):
 
     def __init__(self, parent=None):
         super().__init__(0, 1, parent)
+        self.name_index = ModelNameIndex()
+        # the models of each repository as set the last time to detect the changed repositories
+        self._repository_models = dict()
+        # model name -> item
+        self._items = dict()
 
     def set_repositories(self, repositories: dict) -> None:
-        self.clear()
-        names = list()
-
-        for repository in repositories.values():
+        """
+        Updates the items to the models of the repositories. Only when repositories changed, the items are updated
+        incrementally (models added, removed or taken from another repository). The views are notified with a single
+        reset instead of a signal per changed model.
+        """
+        repository_models = {
+            key: [
+                (model["name"], model["repository"], model["version"])
+                for model in repository
+            ]
+            for key, repository in repositories.items()
+        }
+        if repository_models == self._repository_models:
+            return
+        self._repository_models = repository_models
 
-            for model in repository:
-                # in case there is more than one version of the model with the same name, it shouldn't load it twice
-                if any(model["name"] == s for s in names):
-                    continue
+        # in case there is more than one version of the model with the same name, the first one is taken
+        models = dict()
+        for repository in repository_models.values():
+            for name, repository_name, version in repository:
+                if name not in models:
+                    models[name] = (repository_name, version)
 
+        self.beginResetModel()
+        self.blockSignals(True)
+        try:
+            self._update_items(models)
+        finally:
+            self.blockSignals(False)
+            self.endResetModel()
+
+    def _update_items(self, models: dict) -> None:
+        removed_rows = sorted(
+            (item.row() for name, item in self._items.items() if name not in models),
+            reverse=True,
+        )
+        for row in removed_rows:
+            name = self.item(row).data(int(Qt.ItemDataRole.EditRole))
+            self.removeRow(row)
+            del self._items[name]
+            self.name_index.remove(name)
+
+        for name, (repository_name, version) in models.items():
+            item = self._items.get(name)
+            if item is None:
                 item = QStandardItem()
-                item.setData(model["name"], int(Qt.ItemDataRole.DisplayRole))
+                item.setData(name, int(Qt.ItemDataRole.DisplayRole))
                 item.setData(
-                    model["name"], int(Qt.ItemDataRole.EditRole)
+                    name, int(Qt.ItemDataRole.EditRole)
                 )  # considered in completer
-                item.setData(model["repository"], int(IliModelItemModel.Roles.ILIREPO))
-                item.setData(model["version"], int(IliModelItemModel.Roles.VERSION))
-
-                names.append(model["name"])
+                item.setData(repository_name, int(IliModelItemModel.Roles.ILIREPO))
+                item.setData(version, int(IliModelItemModel.Roles.VERSION))
+                self._items[name] = item
                 self.appendRow(item)
+            else:
+                if item.data(int(IliModelItemModel.Roles.ILIREPO)) != repository_name:
+                    item.setData(
+                        repository_name, int(IliModelItemModel.Roles.ILIREPO)
+                    )
+                if item.data(int(IliModelItemModel.Roles.VERSION)) != version:
+                    item.setData(version, int(IliModelItemModel.Roles.VERSION))
+            self.name_index.add(name, version, repository_name)
+
+    def search(self, text: str, limit: Optional[int] = None) -> list[QModelIndex]:
+        """
+        Returns the indexes of the models matching the text, ranked by exact, prefix, substring and fuzzy matches.
+        """
+        return [
+            self._items[entry["name"]].index()
+            for entry in self.name_index.search(text, limit)
+        ]
+
+
+class ModelSearchProxyModel(QSortFilterProxyModel):
+    """
+    Sorted proxy of an `IliModelItemModel`. When a search text is set, only the models found by the name index
+    are accepted, ranked by exact, prefix, substring and fuzzy matches.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.search_text = ""
+        # model name -> rank of the current search
+        self._ranks = dict()
+
+    def setSourceModel(self, source_model: IliModelItemModel) -> None:
+        super().setSourceModel(source_model)
+        # the source is reset once per change of the repositories
+        source_model.modelReset.connect(self._on_source_reset)
+
+    def set_search_text(self, text: str) -> None:
+        if text == self.search_text:
+            return
+        self.search_text = text
+        self._update_ranks()
+        self.invalidate()
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        if not self.search_text.strip():
+            return True
+        index = self.sourceModel().index(source_row, 0, source_parent)
+        return index.data(int(Qt.ItemDataRole.EditRole)) in self._ranks
+
+    def lessThan(self, left: QModelIndex, right: QModelIndex) -> bool:
+        if not self.search_text.strip():
+            return super().lessThan(left, right)
+        # unranked models go last
+        left_rank = self._ranks.get(
+            left.data(int(Qt.ItemDataRole.EditRole)), len(self._ranks)
+        )
+        right_rank = self._ranks.get(
+            right.data(int(Qt.ItemDataRole.EditRole)), len(self._ranks)
+        )
+        return left_rank < right_rank
+
+    def _on_source_reset(self) -> None:
+        # without a search text nothing depends on the ranks
+        if self.search_text.strip():
+            self._update_ranks()
+            self.invalidate()
+
+    def _update_ranks(self) -> None:
+        self._ranks = dict()
+        if self.search_text.strip():
+            self._ranks = {
+                entry["name"]: rank
+                for rank, entry in enumerate(
+                    self.sourceModel().name_index.search(self.search_text)
+                )
+            }
+
+
+class ModelCompleter(QCompleter):
+    """
+    A completer for the model names of an `IliModelItemModel`.
+    Instead of the prefix filter of the completer, the typed text is searched in the name index of the model,
+    so substring and fuzzy matches are proposed as well.
+    """
+
+    def __init__(self, model: IliModelItemModel, parent=None):
+        super().__init__(parent)
+        self.search_model = ModelSearchProxyModel(self)
+        self.search_model.setSourceModel(model)
+        self.search_model.sort(0, Qt.SortOrder.AscendingOrder)
+        self.setModel(self.search_model)
+        # the search model is already filtered
+        self.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.delegate = ModelCompleterDelegate()
+        self.popup().setItemDelegate(self.delegate)
+
+    def splitPath(self, path: str) -> list[str]:
+        self.search_model.set_search_text(path)
+        return super().splitPath(path)
 
 
 class ModelCompleterDelegate(QItemDelegate):
@@ -487,11 +904,25 @@ class IliDataCache(IliCache):
             else []
         )
         self.datasources = datasources
+        # local file path -> dataset ids waiting for the download of the file
+        self.pending_file_downloads = dict()
 
     def process_model_directory(self, path: str) -> None:
         # download remote and local repositories
         self.download_repository(path)
 
+    def _index_context(self, netloc: str, url: str) -> Optional[str]:
+        return json.dumps(
+            [
+                type(self).__name__,
+                netloc,
+                url,
+                self.type,
+                self.filter_models,
+                self.datasources,
+            ]
+        )
+
     def _process_informationfile(self, file: str, netloc: str, url: str) -> None:
         """
         Parses ilidata.xml provided in ``file`` and updates the local repositories cache.
@@ -698,13 +1129,29 @@ class IliDataCache(IliCache):
 
         self.set_repositories_to_model()
 
+    def _process_bundled_repository(
+        self, netloc: str, url: str, local_directory: str
+    ) -> None:
+        # the bundle index does not contain the metadata of the datasets, so the mirrored ilidata.xml is parsed
+        information_file = os.path.join(local_directory, self.information_file)
+        if os.path.exists(information_file):
+            self._load_informationfile(information_file, netloc, local_directory)
+
     def download_file(
-        self, netloc: str, url: str, file: str, dataset_id: Optional[str] = None
+        self,
+        netloc: str,
+        url: str,
+        file: str,
+        dataset_id: Optional[str] = None,
+        md5: Optional[str] = None,
     ) -> str:
         """
         Downloads the given file from the given url to the local cache.
         passes the local file path or the id (for information) to signals.
         Returns the file path immediately (might not be downloaded yet)
+
+        Files already in the cache matching the given ``md5`` are not downloaded again and requests of a file
+        that is already being downloaded are joined. The downloads run concurrently (see `MAX_PARALLEL_DOWNLOADS`).
         """
         file_url = self.file_url(url, file)
 
@@ -720,18 +1167,24 @@ class IliDataCache(IliCache):
                 )
         else:
             file_path = os.path.normpath(os.path.join(self.CACHE_PATH, netloc, file))
+            if md5 and file_hash(file_path, "md5") == md5.lower():
+                self.file_download_succeeded.emit(dataset_id, file_path)
+                return file_path
+            if file_path in self.pending_file_downloads:
+                self.pending_file_downloads[file_path].append(dataset_id)
+                return file_path
+            self.pending_file_downloads[file_path] = [dataset_id]
+
             file_dir = os.path.dirname(file_path)
             os.makedirs(file_dir, exist_ok=True)
             # in case there are backslashes in the url, remove them
             file_url = file_url.replace("\\", "/")
-            download_file(
+            self._queue_download(
                 file_url,
                 file_path,
-                on_success=lambda: self.file_download_succeeded.emit(
-                    dataset_id, file_path
-                ),
-                on_error=lambda error, error_string: self.file_download_failed.emit(
-                    dataset_id,
+                on_success=lambda: self._on_file_downloaded(file_path, file_url, md5),
+                on_error=lambda error, error_string: self._on_file_download_failed(
+                    file_path,
                     self.tr("Could not download file {url} ({message})").format(
                         url=file_url, message=error_string
                     ),
@@ -739,6 +1192,24 @@ class IliDataCache(IliCache):
             )
         return file_path
 
+    def _on_file_downloaded(
+        self, file_path: str, file_url: str, md5: Optional[str]
+    ) -> None:
+        if md5 and file_hash(file_path, "md5") != md5.lower():
+            QgsMessageLog.logMessage(
+                self.tr(
+                    "The md5 checksum of the downloaded file {url} does not match the one in the repository."
+                ).format(url=file_url),
+                self.tr("modelbaker"),
+                Qgis.MessageLevel.Warning,
+            )
+        for dataset_id in self.pending_file_downloads.pop(file_path, []):
+            self.file_download_succeeded.emit(dataset_id, file_path)
+
+    def _on_file_download_failed(self, file_path: str, message: str) -> None:
+        for dataset_id in self.pending_file_downloads.pop(file_path, []):
+            self.file_download_failed.emit(dataset_id, message)
+
 
 class IliDataItemModel(QStandardItemModel):
     class Roles(Enum):
@@ -889,19 +1360,17 @@ class IliToppingFileCache(IliDataCache):
             if tool_dir
             else os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
         )
-        self.downloaded_files = list()
-        self.file_download_succeeded.connect(
-            lambda dataset_id, path: self.on_download_status(dataset_id)
-        )
-        self.file_download_failed.connect(
-            lambda dataset_id, path: self.on_download_status(dataset_id)
-        )
-        self.model.rowsInserted.connect(lambda: self.on_download_status(None))
+        self.repositories_resolved.connect(self._on_repositories_resolved)
 
     def refresh(self) -> None:
-        if not self.directories is None:
-            for directory in self.directories:
-                self.process_model_directory(directory)
+        self.visited_urls.clear()
+        self.refreshing = True
+        try:
+            if not self.directories is None:
+                for directory in self.directories:
+                    self.process_model_directory(directory)
+        finally:
+            self.refreshing = False
 
         # collect local files
         netloc = "local_files"
@@ -935,13 +1404,57 @@ class IliToppingFileCache(IliDataCache):
         self.repositories[netloc] = repo_files
         self.set_repositories_to_model()
 
-    def on_download_status(self, dataset_id: str) -> None:
-        # here we could add some more logic
-        if dataset_id is not None:
-            self.downloaded_files.append(dataset_id)
-        # ensure all the files are downloaded and contained in the model
-        if len(self.downloaded_files) == len(self.file_ids) == self.model.rowCount():
-            self.download_finished_and_model_fresh.emit()
+        self._check_repositories_resolved()
+
+    def _index_context(self, netloc: str, url: str) -> Optional[str]:
+        # the files are downloaded while parsing, so it is parsed on every refresh
+        return None
+
+    def _process_bundled_repository(
+        self, netloc: str, url: str, local_directory: str
+    ) -> None:
+        """
+        Updates the local repositories cache with the files of the datasets in the bundle index. The files are
+        taken from the bundle, so nothing is downloaded.
+        """
+        repository_key = self.bundle.repository_key(url)
+        repo_files = list()
+        for dataset_id in self.file_ids:
+            if dataset_id[0:8] != "ilidata:":
+                continue
+            for dataset in self.bundle.dataset(dataset_id[8:]):
+                if self.bundle.repository_key(dataset["repository"]) != repository_key:
+                    continue
+                for local_file_path in dataset["files"]:
+                    toppingfile = dict()
+                    toppingfile["id"] = dataset_id
+                    toppingfile["version"] = dataset["version"]
+                    # the owner is not contained in the bundle index
+                    toppingfile["owner"] = None
+                    toppingfile["repository"] = netloc
+                    toppingfile["relative_file_path"] = os.path.relpath(
+                        local_file_path, local_directory
+                    ).replace("\\", "/")
+                    toppingfile["url"] = local_directory
+                    toppingfile["local_file_path"] = local_file_path
+                    self.file_download_succeeded.emit(dataset_id, local_file_path)
+                    repo_files.append(toppingfile)
+
+        self.repositories[netloc] = sorted(
+            repo_files,
+            key=lambda m: m["version"] if m["version"] else "0",
+            reverse=True,
+        )
+        self.set_repositories_to_model()
+
+    def _on_repositories_resolved(self) -> None:
+        """
+        All the queued and running downloads (including the files) have finished, so the model is updated right
+        away instead of waiting for the timer and the completion is signalled once.
+        """
+        self.modelReposTimer.stop()
+        self.model.set_repositories(self.repositories)
+        self.download_finished_and_model_fresh.emit()
 
     def _process_informationfile(self, file: str, netloc: str, url: str) -> None:
         """
@@ -1004,7 +1517,13 @@ class IliToppingFileCache(IliDataCache):
                                     # url like http://models.opengis.ch or /home/nyuki/folder
                                     toppingfile["url"] = url
                                     toppingfile["local_file_path"] = self.download_file(
-                                        netloc, url, path, dataset_id
+                                        netloc,
+                                        url,
+                                        path,
+                                        dataset_id,
+                                        self.get_element_text(
+                                            file.find("ili23:md5", self.ns)
+                                        ),
                                     )
                                     repo_files.append(toppingfile)
 
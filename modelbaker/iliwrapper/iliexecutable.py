@@ -10,18 +10,80 @@ License:
     the Free Software Foundation; either version 2 of the License, or
     (at your option) any later version.
 """
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
 import functools
 import locale
+import os
 import re
 from abc import abstractmethod
-from typing import Optional
+from typing import Callable, Optional
 
-from qgis.PyQt.QtCore import QEventLoop, QObject, QProcess, pyqtSignal
+from qgis.PyQt.QtCore import QEventLoop, QObject, QProcess, QTimer, pyqtSignal
 
+from ..utils.db_utils import get_db_connector
 from ..utils.qt_utils import AbstractQObjectMeta
 from .ili2dbargs import get_ili2db_args
 from .ili2dbconfig import Ili2DbCommandConfiguration
+from .ili2dboutput import Ili2dbOutputParser
 from .ili2dbutils import JavaNotFoundError, get_ili2db_bin, get_java_path
+from .ili2dbworker import Ili2dbWorkerJob, ili2db_worker_pool
+
+
+class IliExecutableFuture:
+    """
+    The pending result of an ili2db run started by *IliExecutable.start*.
+
+    The result is delivered by the Qt event loop. The future can be awaited in an asyncio event loop running on the Qt
+    event loop (like qasync), waited for with *wait* (running a nested event loop) or handled by a done callback.
+    """
+
+    def __init__(self, executable: IliExecutable) -> None:
+        self.executable = executable
+        self.future = concurrent.futures.Future()
+        self.future.set_running_or_notify_cancel()
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self) -> int:
+        """
+        Returns the result of the finished run or raises its error (like *JavaNotFoundError*).
+        """
+        return self.future.result(timeout=0)
+
+    def cancel(self) -> None:
+        """
+        Terminates the ili2db run, it finishes with an error result.
+        """
+        if not self.done():
+            self.executable.cancel_process.emit()
+
+    def add_done_callback(
+        self, callback: Callable[[IliExecutableFuture], None]
+    ) -> None:
+        """
+        Calls the callback with this future when the run finished (or immediately if it already did).
+        """
+        self.future.add_done_callback(lambda future: callback(self))
+
+    def wait(self) -> int:
+        if not self.done():
+            loop = QEventLoop()
+            self.add_done_callback(lambda future: loop.exit())
+            loop.exec()
+        return self.result()
+
+    def set_result(self, result: int) -> None:
+        self.future.set_result(result)
+
+    def set_exception(self, exception: Exception) -> None:
+        self.future.set_exception(exception)
+
+    def __await__(self):
+        return asyncio.wrap_future(self.future).__await__()
 
 
 class IliExecutable(QObject, metaclass=AbstractQObjectMeta):
@@ -35,8 +97,12 @@ class IliExecutable(QObject, metaclass=AbstractQObjectMeta):
     process_started = pyqtSignal(str)
     process_finished = pyqtSignal(int, int)
     cancel_process = pyqtSignal()
+    # structured events (Ili2dbOutputEvent) parsed from the ili2db output
+    output_event = pyqtSignal(object)
+
+    # operations transferring no data (e.g. delete) profit from a quick java startup in the auto jvm profile
+    light_operation = False
 
-    __done_pattern = re.compile(r"Info: \.\.\.([a-zA-Z]+ )?done")
     __result = None
 
     def __init__(self, parent=None):
@@ -55,6 +121,17 @@ class IliExecutable(QObject, metaclass=AbstractQObjectMeta):
         if not self.encoding:
             self.encoding = "UTF8"
 
+        # forward the raw output at most every given milliseconds (0 forwards every chunk)
+        self.raw_output_interval = 0
+        # write the raw output to this file instead of emitting it by stdout and stderr
+        self.spool_path = None
+        self.output_parser = None
+        self._spool_file = None
+        self._raw_output = {"stdout": list(), "stderr": list()}
+        self._raw_output_timer = QTimer(self)
+        self._raw_output_timer.setSingleShot(True)
+        self._raw_output_timer.timeout.connect(self._flush_raw_output)
+
     @abstractmethod
     def _create_config(self) -> Ili2DbCommandConfiguration:
         """Creates the configuration that will be used by *run* method.
@@ -85,6 +162,19 @@ class IliExecutable(QObject, metaclass=AbstractQObjectMeta):
             return self.ILI2DB_NOT_FOUND
         return ["-jar", ili2db_bin]
 
+    def _jvm_args(self) -> list[str]:
+        """Gets the java arguments of the jvm profile of the base configuration.
+
+        Returns:
+            list: java arguments list."""
+        input_size = None
+        xtffile = getattr(self.configuration, "xtffile", None)
+        if xtffile and os.path.isfile(xtffile):
+            input_size = os.path.getsize(xtffile)
+        return self.configuration.base_configuration.to_jvm_args(
+            self.light_operation and input_size is None, input_size
+        )
+
     def _escaped_arg(self, argument=str) -> str:
         if '"' in argument:
             argument = argument.replace('"', '"""')
@@ -101,7 +191,7 @@ class IliExecutable(QObject, metaclass=AbstractQObjectMeta):
         java_path = self._escaped_arg(
             get_java_path(self.configuration.base_configuration)
         )
-        command_args = ili2db_jar_arg + args
+        command_args = self._jvm_args() + ili2db_jar_arg + args
         valid_args = []
         for command_arg in command_args:
             valid_args.append(self._escaped_arg(command_arg))
@@ -129,6 +219,51 @@ class IliExecutable(QObject, metaclass=AbstractQObjectMeta):
         return edited_command
 
     def run(self, edited_command: Optional[str] = None) -> int:
+        return self.start(edited_command).wait()
+
+    def start(self, edited_command: Optional[str] = None) -> IliExecutableFuture:
+        """
+        Starts ili2db without blocking and returns the future of its result.
+        """
+        future = IliExecutableFuture(self)
+        if (
+            not edited_command
+            and self.configuration.base_configuration.ili2db_worker_enabled
+            and self._start_in_worker(future)
+        ):
+            return future
+        self._start_in_process(future, edited_command)
+        return future
+
+    def _start_in_process(
+        self, future: IliExecutableFuture, edited_command: Optional[str] = None
+    ) -> None:
+        try:
+            proc = self.start_process(edited_command)
+        except JavaNotFoundError as e:
+            future.set_exception(e)
+            return
+        if proc is None:
+            future.set_result(self.ILI2DB_NOT_FOUND)
+            return
+        proc.finished.connect(
+            functools.partial(self._on_process_finished, future, proc)
+        )
+
+    def _on_process_finished(
+        self,
+        future: IliExecutableFuture,
+        proc: QProcess,
+        exit_code: int,
+        exit_status: QProcess.ExitStatus,
+    ) -> None:
+        future.set_result(self.finish_process(proc))
+
+    def start_process(self, edited_command: Optional[str] = None) -> Optional[QProcess]:
+        """
+        Starts ili2db in its own process without waiting for it.
+        Returns None if the ili2db tool is not found. Call *finish_process* when the process finished.
+        """
         proc = QProcess()
         self.cancel_process.connect(proc.terminate)
         proc.readyReadStandardError.connect(
@@ -141,38 +276,177 @@ class IliExecutable(QObject, metaclass=AbstractQObjectMeta):
         if not edited_command:
             ili2db_jar_arg = self._ili2db_jar_arg()
             if ili2db_jar_arg == self.ILI2DB_NOT_FOUND:
-                return self.ILI2DB_NOT_FOUND
+                self._after_run(self.ILI2DB_NOT_FOUND)
+                return None
             args = self._args(False)
             java_path = get_java_path(self.configuration.base_configuration)
-            proc.start(java_path, ili2db_jar_arg + args)
+            self._before_run()
+            proc.start(java_path, self._jvm_args() + ili2db_jar_arg + args)
         else:
+            self._before_run()
             proc.start(self.command_with_password(edited_command))
 
         if not proc.waitForStarted():
             proc = None
 
         if not proc:
+            self._after_run(self.ERROR)
             raise JavaNotFoundError()
 
         self.process_started.emit(self.command_without_password(edited_command))
 
         self.__result = self.ERROR
-
-        loop = QEventLoop()
-        proc.finished.connect(loop.exit)
-        loop.exec()
-
+        self._start_output()
+        return proc
+
+    def finish_process(self, proc: QProcess) -> int:
+        """
+        Emits the end of the process started by *start_process* and returns the result.
+        """
+        self.cancel_process.disconnect(proc.terminate)
+        self._finish_output()
+        self._after_run(self.__result)
         self.process_finished.emit(proc.exitCode(), self.__result)
         return self.__result
 
+    def _before_run(self) -> None:
+        """
+        Called right before ili2db is started.
+        """
+
+    def _after_run(self, result: int) -> None:
+        """
+        Called when ili2db finished (or could not be started), before the end of the run is emitted.
+        Optimizes the database after a successful run when the configuration asks for it.
+        """
+        if result == self.SUCCESS and getattr(self.configuration, "optimize_db", False):
+            self.optimize_db()
+
+    def optimize_db(self) -> bool:
+        """
+        Creates the missing foreign key, basket and spatial indexes and updates the statistics of the database (schema).
+        What has been changed is reported on stdout, failures on stderr.
+
+        Returns:
+            bool: *True* if everything succeeded, *False* otherwise."""
+        self.configuration.tool = self.tool
+        db_connector = get_db_connector(self.configuration)
+        if not db_connector:
+            self.stderr.emit(
+                self.tr("Could not connect to the database to optimize it.\n")
+            )
+            return False
+
+        self.stdout.emit(self.tr("Optimizing the database...\n"))
+        success, messages = db_connector.optimize()
+        db_connector.close()
+        for message in messages:
+            self.stdout.emit(message + "\n")
+        if not success:
+            self.stderr.emit(self.tr("The optimization of the database failed.\n"))
+        return success
+
+    def _start_in_worker(self, future: IliExecutableFuture) -> bool:
+        """
+        Starts ili2db as a job of the resident worker.
+        Returns False if the worker is not available, so ili2db has to be run in its own process.
+        """
+        ili2db_jar_arg = self._ili2db_jar_arg()
+        if ili2db_jar_arg == self.ILI2DB_NOT_FOUND:
+            future.set_result(self.ILI2DB_NOT_FOUND)
+            return True
+        try:
+            java_path = get_java_path(self.configuration.base_configuration)
+        except JavaNotFoundError as e:
+            future.set_exception(e)
+            return True
+        # the resident worker serves all operations, so it's not sized per job
+        jvm_args = self.configuration.base_configuration.to_jvm_args()
+        worker = ili2db_worker_pool.worker(
+            java_path, ili2db_jar_arg[1], self.encoding, jvm_args
+        )
+        self._before_run()
+        job = worker.submit(self._args(False))
+        if job is None or job.is_finished:
+            return False
+
+        self.__result = self.ERROR
+        self._start_output()
+        job.stdout.connect(self._process_stdout_text)
+        job.stderr.connect(self._process_stderr_text)
+        cancel = functools.partial(worker.cancel, job)
+        self.cancel_process.connect(cancel)
+        job.finished.connect(
+            functools.partial(self._on_job_finished, future, job, cancel)
+        )
+        self.process_started.emit(self.command_without_password())
+        return True
+
+    def _on_job_finished(
+        self,
+        future: IliExecutableFuture,
+        job: Ili2dbWorkerJob,
+        cancel: functools.partial,
+        exit_code: int,
+    ) -> None:
+        self.cancel_process.disconnect(cancel)
+        job.deleteLater()
+        self._finish_output()
+        if job.worker_unavailable:
+            self._start_in_process(future)
+            return
+
+        self._after_run(self.__result)
+        self.process_finished.emit(exit_code, self.__result)
+        future.set_result(self.__result)
+
     def stderr_ready(self, proc: QProcess) -> None:
         text = bytes(proc.readAllStandardError()).decode(self.encoding)
+        self._process_stderr_text(text)
 
-        if self.__done_pattern.search(text):
+    def _process_stderr_text(self, text: str) -> None:
+        for event in self.output_parser.feed(text):
+            self.output_event.emit(event)
+        if self.output_parser.done:
             self.__result = self.SUCCESS
 
-        self.stderr.emit(text)
+        self._forward_output("stderr", text)
 
     def stdout_ready(self, proc: QProcess) -> None:
         text = bytes(proc.readAllStandardOutput()).decode(self.encoding)
-        self.stdout.emit(text)
+        self._process_stdout_text(text)
+
+    def _process_stdout_text(self, text: str) -> None:
+        self._forward_output("stdout", text)
+
+    def _start_output(self) -> None:
+        self.output_parser = Ili2dbOutputParser()
+        if self.spool_path:
+            self._spool_file = open(self.spool_path, "a", encoding="utf-8")
+
+    def _forward_output(self, stream: str, text: str) -> None:
+        if self._spool_file is not None:
+            self._spool_file.write(text)
+        elif self.raw_output_interval > 0:
+            self._raw_output[stream].append(text)
+            if not self._raw_output_timer.isActive():
+                self._raw_output_timer.start(self.raw_output_interval)
+        else:
+            getattr(self, stream).emit(text)
+
+    def _flush_raw_output(self) -> None:
+        for stream, texts in self._raw_output.items():
+            if texts:
+                getattr(self, stream).emit("".join(texts))
+                texts.clear()
+
+    def _finish_output(self) -> None:
+        for event in self.output_parser.flush():
+            self.output_event.emit(event)
+        if self.output_parser.done:
+            self.__result = self.SUCCESS
+        self._raw_output_timer.stop()
+        self._flush_raw_output()
+        if self._spool_file is not None:
+            self._spool_file.close()
+            self._spool_file = None
@@ -10,6 +10,9 @@ License:
     the Free Software Foundation; either version 2 of the License, or
     (at your option) any later version.
 """
+import time
+
+from ..utils.db_utils import get_db_connector
 from .ili2dbconfig import (
     Ili2DbCommandConfiguration,
     ImportDataConfiguration,
@@ -22,6 +25,11 @@ class Importer(IliExecutable):
     def __init__(self, dataImport=False, parent=None):
         self.__data_import = dataImport
         super().__init__(parent)
+        self.light_operation = not dataImport
+        # the indexes and constraints dropped for a bulk load and the wall-clock seconds per phase
+        self.bulk_load_objects = None
+        self.bulk_load_timings = dict()
+        self._bulk_load_started = None
 
     def _create_config(self) -> Ili2DbCommandConfiguration:
         if self.__data_import:
@@ -30,3 +38,160 @@ class Importer(IliExecutable):
             configuration = SchemaImportConfiguration()
 
         return configuration
+
+    def _before_run(self) -> None:
+        if (
+            getattr(self.configuration, "bulk_load", False)
+            and self.bulk_load_objects is None
+        ):
+            self._start_bulk_load()
+
+    def _after_run(self, result: int) -> None:
+        if self.bulk_load_objects is not None:
+            self._finish_bulk_load(result)
+        super()._after_run(result)
+
+    def _start_bulk_load(self) -> None:
+        """
+        Records and drops the secondary indexes and foreign key constraints of the data tables, so ili2db does
+        not have to maintain and check them per row.
+        """
+        self.bulk_load_timings = dict()
+        self.configuration.tool = self.tool
+        db_connector = get_db_connector(self.configuration)
+        if not db_connector:
+            self.stderr.emit(
+                self.tr("Could not connect to the database for the bulk load.\n")
+            )
+            return
+
+        # a former bulk load has been interrupted (e.g. the application was killed)
+        if self._has_bulk_load_journal(db_connector):
+            self._restore_bulk_load_journal(db_connector)
+
+        start = time.monotonic()
+        objects = db_connector.get_bulk_load_objects()
+        if objects["indexes"] or objects["constraints"]:
+            result, message = db_connector.drop_bulk_load_objects(objects)
+            if result:
+                self.bulk_load_objects = objects
+                self.stdout.emit(message + "\n")
+            else:
+                self.stderr.emit(message + "\n")
+        db_connector.close()
+        self.bulk_load_timings["drop"] = time.monotonic() - start
+        self._bulk_load_started = time.monotonic()
+
+    def _finish_bulk_load(self, result: int) -> None:
+        """
+        Recreates the dropped indexes and constraints in parallel, after a failed import as well.
+        """
+        objects = self.bulk_load_objects
+        self.bulk_load_objects = None
+        self.bulk_load_timings["ili2db"] = time.monotonic() - self._bulk_load_started
+        if result != self.SUCCESS:
+            self.stdout.emit(
+                self.tr("Restoring the indexes and constraints after the failure...\n")
+            )
+
+        db_connector = get_db_connector(self.configuration)
+        if not db_connector:
+            self.stderr.emit(
+                self.tr(
+                    "Could not connect to the database to restore the indexes and constraints.\n"
+                )
+            )
+            return
+
+        restored = self._restore_bulk_load_objects(db_connector, objects)
+        db_connector.close()
+
+        self.stdout.emit(
+            self.tr(
+                "Bulk load: dropping {drop:.2f}s, ili2db {ili2db:.2f}s, recreating {indexes_count} indexes {indexes:.2f}s, restoring {constraints_count} constraints {constraints:.2f}s\n"
+            ).format(
+                indexes_count=len(objects["indexes"]),
+                constraints_count=len(objects["constraints"]),
+                **self.bulk_load_timings,
+            )
+        )
+        if not restored:
+            self.stderr.emit(
+                self.tr("Not all the indexes and constraints could be restored.\n")
+            )
+
+    def restore_bulk_load(self) -> bool:
+        """
+        Restores the indexes and constraints of an interrupted bulk load (e.g. when the application was killed during
+        the import) from the journal in the database. It's done as well before the next bulk load.
+
+        Returns:
+            bool: *True* if there was nothing to restore or everything has been restored, *False* otherwise."""
+        self.configuration.tool = self.tool
+        db_connector = get_db_connector(self.configuration)
+        if not db_connector:
+            self.stderr.emit(
+                self.tr(
+                    "Could not connect to the database to restore the indexes and constraints.\n"
+                )
+            )
+            return False
+
+        restored = True
+        if self._has_bulk_load_journal(db_connector):
+            restored = self._restore_bulk_load_journal(db_connector)
+        db_connector.close()
+        return restored
+
+    def _has_bulk_load_journal(self, db_connector) -> bool:
+        journal = db_connector.get_bulk_load_journal()
+        return bool(journal["indexes"] or journal["constraints"])
+
+    def _restore_bulk_load_journal(self, db_connector) -> bool:
+        journal = db_connector.get_bulk_load_journal()
+        # objects restored before the interruption exist already
+        existing_objects = db_connector.get_bulk_load_objects()
+        missing_objects = dict()
+        for kind in ("indexes", "constraints"):
+            existing_names = {
+                bulk_load_object["name"] for bulk_load_object in existing_objects[kind]
+            }
+            missing_objects[kind] = [
+                bulk_load_object
+                for bulk_load_object in journal[kind]
+                if bulk_load_object["name"] not in existing_names
+            ]
+        self.stdout.emit(
+            self.tr(
+                "Restoring {indexes_count} indexes and {constraints_count} constraints of an interrupted bulk load...\n"
+            ).format(
+                indexes_count=len(missing_objects["indexes"]),
+                constraints_count=len(missing_objects["constraints"]),
+            )
+        )
+        return self._restore_bulk_load_objects(db_connector, missing_objects)
+
+    def _restore_bulk_load_objects(self, db_connector, objects: dict) -> bool:
+        """
+        Recreates the indexes and constraints in parallel and removes the recreated ones from the journal.
+        """
+        start = time.monotonic()
+        indexes_restored, messages = db_connector.restore_bulk_load_indexes(
+            objects["indexes"]
+        )
+        self.bulk_load_timings["indexes"] = time.monotonic() - start
+        start = time.monotonic()
+        constraints_restored, constraint_messages = (
+            db_connector.restore_bulk_load_constraints(objects["constraints"])
+        )
+        self.bulk_load_timings["constraints"] = time.monotonic() - start
+        for message in messages + constraint_messages:
+            self.stderr.emit(message + "\n")
+
+        # what could not be restored stays in the journal
+        result, message = db_connector.clear_bulk_load_journal(
+            db_connector.get_bulk_load_objects()
+        )
+        if not result and message:
+            self.stderr.emit(message + "\n")
+        return indexes_restored and constraints_restored
@@ -15,6 +15,8 @@ from .iliexecutable import IliExecutable
 
 
 class MetaConfigExporter(IliExecutable):
+    light_operation = True
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.version = 4
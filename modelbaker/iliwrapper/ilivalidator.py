@@ -11,11 +11,16 @@ License:
     (at your option) any later version.
 """
 
+import math
+import sys
 import xml.etree.ElementTree as CET  # nosec
+from array import array
 from enum import Enum
+from typing import Optional
 
-from qgis.PyQt.QtCore import Qt
-from qgis.PyQt.QtGui import QStandardItem, QStandardItemModel
+from qgis.core import QgsRectangle
+from qgis.PyQt.QtCore import QAbstractTableModel, QModelIndex, Qt
+from qgis.PyQt.QtGui import QStandardItem
 
 from .ili2dbconfig import ValidateConfiguration
 from .iliexecutable import IliExecutable
@@ -41,11 +46,275 @@ class Validator(IliExecutable):
         return args
 
 
-class ValidationResultModel(QStandardItemModel):
+class ValidationErrorStore:
+    """
+    Compact columnar store of the errors of a validation log.
+
+    Every attribute is a column (a list of interned strings, an array for the coordinates and a bytearray for the fixed state),
+    so a row costs no Python object of its own.
+
+    The store maintains hash indexes on the `INDEXED_COLUMNS` and a grid index on the coordinates, so `query` finds the
+    matching rows without scanning the whole log.
+    """
+
+    INDEXED_COLUMNS = ("ili_q_name", "tid", "obj_tag")
+
+    TEXT_COLUMNS = (
+        "id",
+        "message",
+        "type",
+        "obj_tag",
+        "tid",
+        "tech_id",
+        "user_id",
+        "ili_q_name",
+        "data_source",
+        "line",
+        "tech_details",
+        # the coordinates as written in the log
+        "coord_x_text",
+        "coord_y_text",
+    )
+
+    def __init__(self, grid_size: float = 100.0) -> None:
+        # edge length of the cells of the grid index in map units
+        self.grid_size = grid_size
+        self.clear()
+
+    def clear(self) -> None:
+        self.columns = {column: [] for column in self.TEXT_COLUMNS}
+        # NaN when there is no coordinate
+        self.coord_x = array("d")
+        self.coord_y = array("d")
+        self.fixed = bytearray()
+        # value -> rows
+        self.indexes = {column: {} for column in self.INDEXED_COLUMNS}
+        # (column, row) of the cell -> rows
+        self.grid = {}
+
+    def __len__(self) -> int:
+        return len(self.fixed)
+
+    def append(
+        self, values: dict[str, Optional[str]], coord_x: float, coord_y: float
+    ) -> int:
+        for column in self.TEXT_COLUMNS:
+            value = values.get(column)
+            self.columns[column].append(sys.intern(value) if value else value)
+        self.coord_x.append(coord_x)
+        self.coord_y.append(coord_y)
+        self.fixed.append(0)
+        row = len(self.fixed) - 1
+
+        for column in self.INDEXED_COLUMNS:
+            value = self.columns[column][row]
+            if value is not None:
+                self.indexes[column].setdefault(value, array("l")).append(row)
+        if not (math.isnan(coord_x) or math.isnan(coord_y)):
+            self.grid.setdefault(self._cell(coord_x, coord_y), array("l")).append(row)
+        return row
+
+    def value(self, row: int, column: str) -> Optional[str]:
+        return self.columns[column][row]
+
+    def coordinates(self, row: int) -> tuple[Optional[float], Optional[float]]:
+        coord_x = self.coord_x[row]
+        coord_y = self.coord_y[row]
+        if math.isnan(coord_x) or math.isnan(coord_y):
+            return None, None
+        return coord_x, coord_y
+
+    def query(
+        self,
+        ili_q_name: Optional[str] = None,
+        tid: Optional[str] = None,
+        obj_tag: Optional[str] = None,
+        extent: Optional[tuple[float, float, float, float]] = None,
+    ) -> list[int]:
+        """
+        Returns the sorted rows matching all the given criteria.
+        The `extent` is passed as (xmin, ymin, xmax, ymax) and matches only errors with coordinates inside of it.
+        """
+        candidates = []
+        for column, value in (
+            ("ili_q_name", ili_q_name),
+            ("tid", tid),
+            ("obj_tag", obj_tag),
+        ):
+            if value is not None:
+                candidates.append(self.indexes[column].get(value, ()))
+        if extent is not None:
+            candidates.append(self._rows_in_extent(*extent))
+
+        if not candidates:
+            return list(range(len(self)))
+
+        # intersect starting with the smallest candidate list
+        candidates.sort(key=len)
+        rows = set(candidates[0])
+        for other in candidates[1:]:
+            if not rows:
+                break
+            rows.intersection_update(other)
+        return sorted(rows)
+
+    def _cell(self, coord_x: float, coord_y: float) -> tuple[int, int]:
+        return (
+            math.floor(coord_x / self.grid_size),
+            math.floor(coord_y / self.grid_size),
+        )
+
+    def _rows_in_extent(
+        self, xmin: float, ymin: float, xmax: float, ymax: float
+    ) -> list[int]:
+        min_column, min_row = self._cell(xmin, ymin)
+        max_column, max_row = self._cell(xmax, ymax)
+        cell_count = (max_column - min_column + 1) * (max_row - min_row + 1)
+        if cell_count <= 0:
+            return []
+
+        # for large extents it is cheaper to look at the occupied cells only
+        if cell_count <= len(self.grid):
+            cells = (
+                (column, row)
+                for column in range(min_column, max_column + 1)
+                for row in range(min_row, max_row + 1)
+            )
+        else:
+            cells = iter(self.grid.keys())
+
+        rows = []
+        for cell in cells:
+            cell_rows = self.grid.get(cell)
+            if not cell_rows:
+                continue
+            column, row = cell
+            if min_column < column < max_column and min_row < row < max_row:
+                # inner cells are completely covered by the extent
+                rows.extend(cell_rows)
+                continue
+            for cell_row in cell_rows:
+                if (
+                    xmin <= self.coord_x[cell_row] <= xmax
+                    and ymin <= self.coord_y[cell_row] <= ymax
+                ):
+                    rows.append(cell_row)
+        return rows
+
+
+class ValidationLogReader:
+    """
+    Streaming reader of an ilivalidator xtflog. It parses the errors incrementally with `iterparse`
+    and removes the parsed objects from their basket, so the memory stays flat independent of the size of the log.
+    """
+
+    NAMESPACE = "{http://www.interlis.ch/INTERLIS2.3}"
+    ERROR_TAG = NAMESPACE + "IliVErrors.ErrorLog.Error"
+    # TRANSFER > DATASECTION > basket > object
+    OBJECT_DEPTH = 3
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.error_message = None
+        self._events = CET.iterparse(path, events=("start", "end"))  # nosec
+        # the currently open elements from the root down
+        self._open_elements = []
+        self.at_end = False
+
+    def read(self, store: ValidationErrorStore, count: int) -> int:
+        """
+        Appends up to `count` errors (of type `Error`) to the store and returns the number of appended errors.
+        """
+        appended = 0
+        while appended < count and not self.at_end:
+            try:
+                event, element = next(self._events)
+            except StopIteration:
+                self._finish()
+                break
+            except CET.ParseError as e:
+                self.error_message = (
+                    "Could not parse validation log `{file}` ({exception})".format(
+                        file=self.path, exception=str(e)
+                    )
+                )
+                self._finish()
+                break
+
+            if event == "start":
+                self._open_elements.append(element)
+                continue
+            self._open_elements.pop()
+            if len(self._open_elements) != self.OBJECT_DEPTH:
+                continue
+
+            if element.tag == self.ERROR_TAG and self._append_error(store, element):
+                appended += 1
+            # drop the parsed object, otherwise the basket keeps a reference to it
+            self._open_elements[-1].remove(element)
+        return appended
+
+    def _append_error(self, store: ValidationErrorStore, error: CET.Element) -> bool:
+        ns = self.NAMESPACE
+        values = {
+            "id": error.attrib.get("TID"),
+            "message": self._text(error.find(ns + "Message")),
+            "type": self._text(error.find(ns + "Type")),
+            "obj_tag": self._text(error.find(ns + "ObjTag")),
+            "tid": self._text(error.find(ns + "Tid")),
+            "tech_id": self._text(error.find(ns + "TechId")),
+            "user_id": self._text(error.find(ns + "UserId")),
+            "ili_q_name": self._text(error.find(ns + "IliQName")),
+            "data_source": self._text(error.find(ns + "DataSource")),
+            "line": self._text(error.find(ns + "Line")),
+            "tech_details": self._text(error.find(ns + "TechDetails")),
+        }
+        if values["type"] not in ["Error"] or values["message"] == "...validate failed":
+            return False
+
+        coord_x = coord_y = math.nan
+        coord = error.find(ns + "Geometry/" + ns + "COORD")
+        if coord is not None:
+            values["coord_x_text"] = self._text(coord.find(ns + "C1"))
+            values["coord_y_text"] = self._text(coord.find(ns + "C2"))
+            coord_x = self._float(values["coord_x_text"])
+            coord_y = self._float(values["coord_y_text"])
+        store.append(values, coord_x, coord_y)
+        return True
+
+    def _finish(self) -> None:
+        self.at_end = True
+        self._events = None
+        self._open_elements = []
+
+    @staticmethod
+    def _text(element: Optional[CET.Element]) -> Optional[str]:
+        if element is not None:
+            return element.text
+        return None
+
+    @staticmethod
+    def _float(text: Optional[str]) -> float:
+        try:
+            return float(text)
+        except (TypeError, ValueError):
+            return math.nan
+
+
+class ValidationResultModel(QAbstractTableModel):
     """
     Model containing all the error/warning data of the current xtf file.
+
+    The log is read in a streaming way: `reload` loads the first errors and the views load the next ones on demand with
+    `canFetchMore`/`fetchMore`. Use `fetch_all` to load the whole log at once.
+
+    Unlike the former `QStandardItemModel` the model cannot be filled with `appendRow` and `rowCount` returns the number
+    of the loaded errors only. `item` is kept to access an error the former way.
     """
 
+    # number of errors loaded per fetch
+    FETCH_SIZE = 1000
+
     class Roles(Enum):
         ID = Qt.ItemDataRole.UserRole + 1
         MESSAGE = Qt.ItemDataRole.UserRole + 2
@@ -66,73 +335,153 @@ class ValidationResultModel(QStandardItemModel):
         def __int__(self):
             return self.value
 
+    ROLE_COLUMNS = {
+        int(Roles.ID): "id",
+        int(Roles.MESSAGE): "message",
+        int(Roles.TYPE): "type",
+        int(Roles.OBJ_TAG): "obj_tag",
+        int(Roles.TID): "tid",
+        int(Roles.TECH_ID): "tech_id",
+        int(Roles.USER_ID): "user_id",
+        int(Roles.ILI_Q_NAME): "ili_q_name",
+        int(Roles.DATA_SOURCE): "data_source",
+        int(Roles.LINE): "line",
+        int(Roles.COORD_X): "coord_x_text",
+        int(Roles.COORD_Y): "coord_y_text",
+        int(Roles.TECH_DETAILS): "tech_details",
+    }
+
     def __init__(self):
         super().__init__()
         self.configuration = ValidateConfiguration()
         self.valid = False
+        self.store = ValidationErrorStore()
+        self._reader = None
+        # the number of errors exposed to the views (the store can hold more)
+        self._row_count = 0
 
-    def get_element_text(self, element: CET.Element) -> str:
-        if element is not None:
-            return element.text
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return self._row_count
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return 1
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        return Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= self._row_count:
+            return None
+        row = index.row()
+        column = self.ROLE_COLUMNS.get(role)
+        if column:
+            return self.store.value(row, column)
+        if role == int(ValidationResultModel.Roles.FIXED):
+            return bool(self.store.fixed[row])
         return None
 
+    def setData(
+        self, index: QModelIndex, value, role: int = Qt.ItemDataRole.EditRole
+    ) -> bool:
+        if (
+            not index.isValid()
+            or index.row() >= self._row_count
+            or role != int(ValidationResultModel.Roles.FIXED)
+        ):
+            return False
+        self.store.fixed[index.row()] = 1 if value else 0
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def item(self, row: int, column: int = 0) -> Optional[QStandardItem]:
+        """
+        Returns a detached item holding all the roles of the error in the given row (as the former `QStandardItemModel`).
+        Changes on the item are not written back, use `setData` to mark an error as fixed.
+        """
+        index = self.index(row, column)
+        if not index.isValid():
+            return None
+        item = QStandardItem()
+        for role in ValidationResultModel.Roles:
+            item.setData(self.data(index, int(role)), int(role))
+        return item
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        if parent.isValid():
+            return False
+        return self._row_count < len(self.store) or (
+            self._reader is not None and not self._reader.at_end
+        )
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        if parent.isValid():
+            return
+        self._fetch(self.FETCH_SIZE)
+
+    def fetch_all(self) -> None:
+        """Loads all the remaining errors of the log."""
+        while self.canFetchMore():
+            self._fetch(self.FETCH_SIZE)
+
+    def query(
+        self,
+        ili_q_name: Optional[str] = None,
+        tid: Optional[str] = None,
+        obj_tag: Optional[str] = None,
+        extent: Optional[QgsRectangle] = None,
+    ) -> list[int]:
+        """
+        Returns the rows of the errors matching all the given criteria (e.g. the errors in the current map canvas extent).
+        The whole log is loaded to answer the query.
+        """
+        self.fetch_all()
+        bounds = None
+        if extent is not None:
+            bounds = (
+                extent.xMinimum(),
+                extent.yMinimum(),
+                extent.xMaximum(),
+                extent.yMaximum(),
+            )
+        return self.store.query(ili_q_name, tid, obj_tag, bounds)
+
     def reload(self) -> None:
         self.beginResetModel()
+        self.store.clear()
+        self._row_count = 0
+        self._reader = None
         if self.configuration.xtflog:
             try:
-                root = CET.parse(self.configuration.xtflog).getroot()  # nosec
-            except CET.ParseError as e:
+                self._reader = ValidationLogReader(self.configuration.xtflog)
+            except OSError as e:
                 print(
                     self.tr(
-                        "Could not parse ilidata file `{file}` ({exception})".format(
+                        "Could not read validation log `{file}` ({exception})".format(
                             file=self.configuration.xtflog, exception=str(e)
                         )
                     )
                 )
-            if root is not None:
-                ns = "{http://www.interlis.ch/INTERLIS2.3}"
-                for error in root.iter(ns + "IliVErrors.ErrorLog.Error"):
-                    id = error.attrib["TID"]
-                    message = self.get_element_text(error.find(ns + "Message"))
-                    type = self.get_element_text(error.find(ns + "Type"))
-                    obj_tag = self.get_element_text(error.find(ns + "ObjTag"))
-                    tid = self.get_element_text(error.find(ns + "Tid"))
-                    tech_id = self.get_element_text(error.find(ns + "TechId"))
-                    user_id = self.get_element_text(error.find(ns + "UserId"))
-                    ili_q_name = self.get_element_text(error.find(ns + "IliQName"))
-                    data_source = self.get_element_text(error.find(ns + "DataSource"))
-                    line = self.get_element_text(error.find(ns + "Line"))
-                    coord_x = None
-                    coord_y = None
-                    geometry = error.find(ns + "Geometry")
-                    if geometry:
-                        coord = geometry.find(ns + "COORD")
-                        if coord:
-                            coord_x = self.get_element_text(coord.find(ns + "C1"))
-                            coord_y = self.get_element_text(coord.find(ns + "C2"))
-                    tech_details = self.get_element_text(error.find(ns + "TechDetails"))
-
-                    if type in ["Error"] and message != "...validate failed":
-                        item = QStandardItem()
-                        item.setData(id, int(ValidationResultModel.Roles.ID))
-                        item.setData(message, int(ValidationResultModel.Roles.MESSAGE))
-                        item.setData(type, int(ValidationResultModel.Roles.TYPE))
-                        item.setData(obj_tag, int(ValidationResultModel.Roles.OBJ_TAG))
-                        item.setData(tid, int(ValidationResultModel.Roles.TID))
-                        item.setData(tech_id, int(ValidationResultModel.Roles.TECH_ID))
-                        item.setData(user_id, int(ValidationResultModel.Roles.USER_ID))
-                        item.setData(
-                            ili_q_name, int(ValidationResultModel.Roles.ILI_Q_NAME)
-                        )
-                        item.setData(
-                            data_source, int(ValidationResultModel.Roles.DATA_SOURCE)
-                        )
-                        item.setData(line, int(ValidationResultModel.Roles.LINE))
-                        item.setData(coord_x, int(ValidationResultModel.Roles.COORD_X))
-                        item.setData(coord_y, int(ValidationResultModel.Roles.COORD_Y))
-                        item.setData(
-                            tech_details, int(ValidationResultModel.Roles.TECH_DETAILS)
-                        )
-                        item.setData(False, int(ValidationResultModel.Roles.FIXED))
-                        self.appendRow(item)
+            if self._reader:
+                self._read(self.FETCH_SIZE)
+                self._row_count = len(self.store)
         self.endResetModel()
+
+    def _read(self, count: int) -> None:
+        self._reader.read(self.store, count)
+        if self._reader.at_end:
+            if self._reader.error_message:
+                print(self.tr(self._reader.error_message))
+            self._reader = None
+
+    def _fetch(self, count: int) -> None:
+        if len(self.store) - self._row_count < count and self._reader is not None:
+            self._read(count - (len(self.store) - self._row_count))
+        new_row_count = min(len(self.store), self._row_count + count)
+        if new_row_count > self._row_count:
+            self.beginInsertRows(QModelIndex(), self._row_count, new_row_count - 1)
+            self._row_count = new_row_count
+            self.endInsertRows()
@@ -0,0 +1,146 @@
+"""
+Metadata:
+    Creation Date: 2026-10-18
+    Copyright: (C) 2026 by OPENGIS.ch
+    Contact: info@opengis.ch
+
+License:
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the **GNU General Public License** as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+"""
+from __future__ import annotations
+
+import bisect
+from collections import defaultdict
+from typing import Optional
+
+
+def trigrams(text: str) -> set[str]:
+    """
+    Returns the trigrams of the lowercased text, padded like in pg_trgm (two spaces before and one after).
+    """
+    padded = "  {} ".format(text.lower())
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class ModelNameIndex:
+    """
+    Search index over model names with their version and repository.
+
+    Prefix matches are found with a binary search over the sorted names, substring and fuzzy matches with a
+    trigram index, so a search does not need to look at every model name. Queries shorter than a trigram have no
+    trigram without padding, so their substring matches are found by scanning the names.
+    """
+
+    # exact, prefix, substring and fuzzy matches are ranked in this order
+    EXACT, PREFIX, SUBSTRING, FUZZY = range(4)
+
+    def __init__(self, similarity_threshold: float = 0.3) -> None:
+        self.similarity_threshold = similarity_threshold
+        # name -> {"name", "version", "repository"}
+        self.entries = dict()
+        self._trigrams = defaultdict(set)
+        self._sorted_names = list()
+        self._sorted = True
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries
+
+    def add(self, name: str, version: Optional[str], repository: Optional[str]) -> None:
+        """
+        Adds the model or updates its version and repository.
+        """
+        if name not in self.entries:
+            for trigram in trigrams(name):
+                self._trigrams[trigram].add(name)
+            self._sorted_names.append((name.lower(), name))
+            self._sorted = False
+        self.entries[name] = {
+            "name": name,
+            "version": version,
+            "repository": repository,
+        }
+
+    def remove(self, name: str) -> None:
+        if self.entries.pop(name, None) is None:
+            return
+        for trigram in trigrams(name):
+            names = self._trigrams.get(trigram)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self._trigrams[trigram]
+        self._sort()
+        index = bisect.bisect_left(self._sorted_names, (name.lower(), name))
+        del self._sorted_names[index]
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self._trigrams.clear()
+        self._sorted_names.clear()
+        self._sorted = True
+
+    def search(self, text: str, limit: Optional[int] = None) -> list[dict]:
+        """
+        Returns the entries matching the text ranked by exact, prefix, substring and fuzzy (trigram similarity) matches.
+        Within the same kind of match, more similar and then shorter names come first.
+        """
+        query = text.strip().lower()
+        if not query:
+            return []
+
+        matches = dict()
+        for name in self._prefix_matches(query):
+            kind = self.EXACT if name.lower() == query else self.PREFIX
+            matches[name] = (kind, 1.0)
+
+        query_trigrams = trigrams(query)
+        shared_counts = defaultdict(int)
+        for trigram in query_trigrams:
+            for name in self._trigrams.get(trigram, ()):
+                shared_counts[name] += 1
+        if len(query) < 3:
+            for lower_name, name in self._sorted_names:
+                if name not in matches and query in lower_name:
+                    # make sure the name is ranked as substring match
+                    shared_counts.setdefault(name, 0)
+        for name, shared_count in shared_counts.items():
+            if name in matches:
+                continue
+            similarity = shared_count / (
+                len(query_trigrams) + len(trigrams(name)) - shared_count
+            )
+            if query in name.lower():
+                matches[name] = (self.SUBSTRING, similarity)
+            elif similarity >= self.similarity_threshold:
+                matches[name] = (self.FUZZY, similarity)
+
+        ranked_names = sorted(
+            matches,
+            key=lambda name: (matches[name][0], -matches[name][1], len(name), name),
+        )
+        if limit is not None:
+            ranked_names = ranked_names[:limit]
+        return [self.entries[name] for name in ranked_names]
+
+    def _prefix_matches(self, query: str) -> list[str]:
+        self._sort()
+        index = bisect.bisect_left(self._sorted_names, (query,))
+        names = list()
+        while index < len(self._sorted_names):
+            lower_name, name = self._sorted_names[index]
+            if not lower_name.startswith(query):
+                break
+            names.append(name)
+            index += 1
+        return names
+
+    def _sort(self) -> None:
+        if not self._sorted:
+            self._sorted_names.sort()
+            self._sorted = True
@@ -0,0 +1,305 @@
+"""
+Metadata:
+    Creation Date: 2026-10-18
+    Copyright: (C) 2026 by OPENGIS.ch
+    Contact: info@opengis.ch
+
+License:
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the **GNU General Public License** as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+"""
+from __future__ import annotations
+
+import datetime
+import json
+import os
+import shutil
+import urllib.parse
+import xml.etree.ElementTree as ET  # nosec
+from collections import deque
+from typing import Callable, Optional
+
+from ..utils.qt_utils import NetworkError, download_file, slugify
+
+BUNDLE_INDEX_FILE = "bundle_index.json"
+# increase when the format of the bundle index changes
+BUNDLE_VERSION = 1
+
+NAMESPACE = "{http://www.interlis.ch/INTERLIS2.3}"
+
+
+class RepositoryBundleError(Exception):
+    pass
+
+
+class RepositoryBundle:
+    """
+    An offline snapshot of model repositories.
+
+    Every repository (including the subsidiary sites of its ilisite.xml) is mirrored to a local directory of the
+    bundle with its ilisite.xml, ilimodels.xml, ilidata.xml, the referenced ili models and the data files (like
+    toppings). The bundle index maps the urls of the repositories to these directories and the model names and
+    dataset ids to their files, so all lookups are dictionary lookups.
+
+    Mounted to an `IliCache` (see `IliCache.mount_bundle`), the mirrored directories are used instead of the remote
+    repositories and nothing is downloaded. The directories can also be passed to ili2db as model directories.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        index_path = os.path.join(path, BUNDLE_INDEX_FILE)
+        try:
+            with open(index_path, encoding="utf-8") as file:
+                self.index = json.load(file)
+        except (OSError, ValueError) as e:
+            raise RepositoryBundleError(
+                "Could not read repository bundle index `{}` ({})".format(
+                    index_path, str(e)
+                )
+            )
+        if self.index.get("version") != BUNDLE_VERSION:
+            raise RepositoryBundleError(
+                "Unsupported repository bundle version {} in `{}`".format(
+                    self.index.get("version"), index_path
+                )
+            )
+        # repository key -> models, built on the first lookup
+        self._repository_models = None
+
+    @staticmethod
+    def repository_key(url: str) -> str:
+        return url.rstrip("/\\")
+
+    def local_directory(self, url: str) -> Optional[str]:
+        """
+        Returns the local directory mirroring the repository of the url or None if it's not in the bundle.
+        """
+        directory = self.index["repositories"].get(self.repository_key(url))
+        if directory is None:
+            return None
+        return os.path.join(self.path, directory)
+
+    def model(self, name: str) -> list[dict]:
+        """
+        Returns the versions of the model with the repository url, the version and the local file path.
+        """
+        return [
+            dict(entry, file=os.path.join(self.path, entry["file"]))
+            for entry in self.index["models"].get(name, [])
+        ]
+
+    def repository_models(self, url: str) -> list[dict]:
+        """
+        Returns the models of the repository of the url with their name, version and local file path.
+        """
+        if self._repository_models is None:
+            self._repository_models = dict()
+            for name, entries in self.index["models"].items():
+                for entry in entries:
+                    self._repository_models.setdefault(
+                        self.repository_key(entry["repository"]), []
+                    ).append(
+                        {
+                            "name": name,
+                            "version": entry["version"],
+                            "file": os.path.join(self.path, entry["file"]),
+                        }
+                    )
+        return list(self._repository_models.get(self.repository_key(url), []))
+
+    def dataset(self, dataset_id: str) -> list[dict]:
+        """
+        Returns the datasets with the id with the repository url, the version and the local file paths.
+        """
+        return [
+            dict(
+                entry, files=[os.path.join(self.path, file) for file in entry["files"]]
+            )
+            for entry in self.index["datasets"].get(dataset_id, [])
+        ]
+
+    @property
+    def model_directories(self) -> list[str]:
+        return [
+            os.path.join(self.path, directory)
+            for directory in self.index["repositories"].values()
+        ]
+
+    @staticmethod
+    def create(
+        path: str,
+        urls: list[str],
+        on_message: Optional[Callable[[str], None]] = None,
+    ) -> RepositoryBundle:
+        """
+        Snapshots the repositories of the urls (remote or local directories) and their subsidiary sites
+        into a bundle at the given path and returns it.
+        The downloads are synchronous, so it's meant to be run on a connected machine to prepare the bundle.
+        """
+        builder = _RepositoryBundleBuilder(path, on_message)
+        for url in urls:
+            builder.add_repository(url)
+        builder.build()
+        builder.write_index()
+        return RepositoryBundle(path)
+
+
+class _RepositoryBundleBuilder:
+    def __init__(
+        self, path: str, on_message: Optional[Callable[[str], None]] = None
+    ) -> None:
+        self.path = path
+        self.on_message = on_message
+        self.queue = deque()
+        self.repositories = dict()
+        self.models = dict()
+        self.datasets = dict()
+        self.missing_files = list()
+
+    def message(self, text: str) -> None:
+        if self.on_message:
+            self.on_message(text)
+
+    def add_repository(self, url: str) -> None:
+        key = RepositoryBundle.repository_key(url)
+        if not key or key in self.repositories or key[0] == "%":
+            return
+        directory = slugify(key) or "repository"
+        while directory in self.repositories.values():
+            directory += "_"
+        self.repositories[key] = directory
+        self.queue.append(key)
+
+    def build(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        while self.queue:
+            url = self.queue.popleft()
+            self.message("Bundling repository {}".format(url))
+            self._bundle_repository(url, self.repositories[url])
+
+    def write_index(self) -> None:
+        index = {
+            "version": BUNDLE_VERSION,
+            "created": datetime.datetime.now().isoformat(),
+            "repositories": self.repositories,
+            "models": self.models,
+            "datasets": self.datasets,
+            "missing_files": self.missing_files,
+        }
+        with open(
+            os.path.join(self.path, BUNDLE_INDEX_FILE), "w", encoding="utf-8"
+        ) as file:
+            json.dump(index, file, indent=2)
+
+    def _bundle_repository(self, url: str, directory: str) -> None:
+        root = self._fetch_and_parse(url, directory, "ilisite.xml")
+        if root is not None:
+            for site in root.iter(NAMESPACE + "IliSite09.SiteMetadata.Site"):
+                for location in site.findall(
+                    "{ns}subsidiarySite/{ns}IliSite09.RepositoryLocation_".format(
+                        ns=NAMESPACE
+                    )
+                ):
+                    value = self._text(location, "value")
+                    if value:
+                        self.add_repository(value)
+
+        root = self._fetch_and_parse(url, directory, "ilimodels.xml")
+        if root is not None:
+            for metadata_tag in (
+                "IliRepository09.RepositoryIndex.ModelMetadata",
+                "IliRepository20.RepositoryIndex.ModelMetadata",
+            ):
+                for metadata in root.iter(NAMESPACE + metadata_tag):
+                    name = self._text(metadata, "Name")
+                    file = self._text(metadata, "File")
+                    if not name or not file:
+                        continue
+                    local_file = self._fetch(url, directory, file)
+                    if local_file:
+                        self.models.setdefault(name, []).append(
+                            {
+                                "version": self._text(metadata, "Version"),
+                                "repository": url,
+                                "file": os.path.relpath(local_file, self.path),
+                            }
+                        )
+
+        root = self._fetch_and_parse(url, directory, "ilidata.xml")
+        if root is not None:
+            for metadata in root.iter(
+                NAMESPACE + "DatasetIdx16.DataIndex.DatasetMetadata"
+            ):
+                dataset_id = self._text(metadata, "id")
+                files = list()
+                for file in metadata.iter(NAMESPACE + "DatasetIdx16.File"):
+                    file_path = self._text(file, "path")
+                    local_file = (
+                        self._fetch(url, directory, file_path) if file_path else None
+                    )
+                    if local_file:
+                        files.append(os.path.relpath(local_file, self.path))
+                if dataset_id:
+                    self.datasets.setdefault(dataset_id, []).append(
+                        {
+                            "version": self._text(metadata, "version"),
+                            "repository": url,
+                            "files": files,
+                        }
+                    )
+
+    def _fetch(self, url: str, directory: str, file: str) -> Optional[str]:
+        """
+        Copies or downloads the file of the repository into the directory of the bundle and returns the local path.
+        """
+        repository_directory = os.path.join(self.path, directory)
+        local_file = os.path.normpath(os.path.join(repository_directory, file))
+        # never write outside of the repository directory
+        if os.path.commonpath([repository_directory, local_file]) != os.path.normpath(
+            repository_directory
+        ):
+            self.missing_files.append({"repository": url, "file": file})
+            return None
+        if os.path.exists(local_file):
+            return local_file
+
+        os.makedirs(os.path.dirname(local_file), exist_ok=True)
+        if os.path.isdir(url):
+            source = os.path.join(url, file)
+            if os.path.isfile(source):
+                shutil.copyfile(source, local_file)
+                return local_file
+        else:
+            file_url = urllib.parse.urljoin(url + "/", file.replace("\\", "/"))
+            try:
+                download_file(file_url, local_file)
+                return local_file
+            except NetworkError as e:
+                self.message("Could not download {} ({})".format(file_url, e.msg))
+                if os.path.exists(local_file):
+                    os.remove(local_file)
+
+        if file not in ("ilisite.xml", "ilimodels.xml", "ilidata.xml"):
+            self.missing_files.append({"repository": url, "file": file})
+        return None
+
+    def _fetch_and_parse(
+        self, url: str, directory: str, file: str
+    ) -> Optional[ET.Element]:
+        local_file = self._fetch(url, directory, file)
+        if not local_file:
+            return None
+        try:
+            return ET.parse(local_file).getroot()  # nosec
+        except ET.ParseError as e:
+            self.message("Could not parse `{}` ({})".format(local_file, str(e)))
+            return None
+
+    @staticmethod
+    def _text(element: ET.Element, tag: str) -> Optional[str]:
+        child = element.find(NAMESPACE + tag)
+        if child is not None:
+            return child.text
+        return None
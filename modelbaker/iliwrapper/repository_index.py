@@ -0,0 +1,175 @@
+"""
+Metadata:
+    Creation Date: 2026-10-18
+    Copyright: (C) 2026 by OPENGIS.ch
+    Contact: info@opengis.ch
+
+License:
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the **GNU General Public License** as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import zlib
+from contextlib import closing
+from typing import Optional
+
+# increase when the format of the stored entries changes, older indexes are dropped
+INDEX_VERSION = 1
+
+
+def file_hash(path: str, algorithm: str = "sha256") -> Optional[str]:
+    """
+    Returns the hash (hex digest) of the content of the file or None if it cannot be read.
+    """
+    # the hash identifies content and is not used for security
+    content_hash = hashlib.new(algorithm, usedforsecurity=False)
+    try:
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(65536), b""):
+                content_hash.update(chunk)
+    except OSError:
+        return None
+    return content_hash.hexdigest()
+
+
+class RepositoryIndex:
+    """
+    Persistent SQLite index of the parsed repository files (like ilimodels.xml or ilidata.xml).
+
+    The parsed entries are stored compressed and keyed by the hash of the file content and a context describing how
+    the file has been parsed (e.g. the repository and the filters). As long as the file does not change, the entries
+    are read from the index instead of parsing the file again.
+    Failing to access the index is never fatal, the file is just parsed again.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def get(self, content_hash: str, context: str) -> Optional[list[dict]]:
+        """
+        Returns the entries stored for the file hash and context or None if there are none.
+        """
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with closing(self._connect()) as connection:
+                row = connection.execute(
+                    "SELECT entries FROM repository_index WHERE hash = ? AND context = ?",
+                    (content_hash, context),
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        try:
+            return json.loads(zlib.decompress(row[0]))
+        except (zlib.error, ValueError):
+            return None
+
+    def put(self, content_hash: str, context: str, entries: list[dict]) -> None:
+        """
+        Stores the entries for the file hash and context. Former entries of the same context are replaced.
+        """
+        data = zlib.compress(json.dumps(entries).encode("utf-8"))
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with closing(self._connect()) as connection:
+                with connection:
+                    connection.execute(
+                        "DELETE FROM repository_index WHERE context = ?", (context,)
+                    )
+                    connection.execute(
+                        "INSERT INTO repository_index (hash, context, entries) VALUES (?, ?, ?)",
+                        (content_hash, context, data),
+                    )
+        except (sqlite3.Error, OSError):
+            pass
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path)
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != INDEX_VERSION:
+            connection.execute("DROP TABLE IF EXISTS repository_index")
+            connection.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS repository_index (
+                hash TEXT NOT NULL,
+                context TEXT NOT NULL,
+                entries BLOB NOT NULL,
+                PRIMARY KEY (hash, context)
+            )
+            """
+        )
+        connection.commit()
+        return connection
+
+
+class IliFileIndex:
+    """
+    Persistent index of the models found in local .ili files.
+
+    The models are keyed by the path of the file and only valid as long as the modification time and the size of the
+    file do not change, so unchanged files are never opened again. The index is loaded once and written with `save`.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._files = None
+        self._modified = False
+
+    @property
+    def files(self) -> dict[str, dict]:
+        if self._files is None:
+            self._files = dict()
+            try:
+                with open(self.path, encoding="utf-8") as file:
+                    index = json.load(file)
+                if index.get("version") == INDEX_VERSION:
+                    self._files = index.get("files", {})
+            except (OSError, ValueError, AttributeError):
+                # a missing or broken index only means the files are parsed again
+                pass
+        return self._files
+
+    def get(self, ilifile: str, stat: os.stat_result) -> Optional[dict]:
+        """
+        Returns the indexed information (``encoding`` and ``models``) of the file if it did not change.
+        """
+        entry = self.files.get(ilifile)
+        if (
+            entry
+            and entry.get("mtime_ns") == stat.st_mtime_ns
+            and entry.get("size") == stat.st_size
+        ):
+            return entry
+        return None
+
+    def put(
+        self, ilifile: str, stat: os.stat_result, encoding: str, models: list[dict]
+    ) -> None:
+        self.files[ilifile] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "encoding": encoding,
+            "models": models,
+        }
+        self._modified = True
+
+    def save(self) -> None:
+        if not self._modified:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as file:
+                json.dump({"version": INDEX_VERSION, "files": self.files}, file)
+            self._modified = False
+        except OSError:
+            pass
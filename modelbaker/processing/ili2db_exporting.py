@@ -150,8 +150,7 @@ class ProcessExporter(ProcessOperatorBase):
 
         # to do superuser finden? und auch dpparams?
         exporter.configuration = configuration
-        exporter.stdout.connect(feedback.pushInfo)
-        exporter.stderr.connect(feedback.pushInfo)
+        self._connect_output(exporter, feedback)
 
         if feedback.isCanceled():
             return {}
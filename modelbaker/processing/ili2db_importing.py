@@ -41,6 +41,7 @@ class ProcessImporter(ProcessOperatorBase):
     DISABLEVALIDATION = "DISABLEVALIDATION"
     DATASET = "DATASET"
     DELETEDATA = "DELETEDATA"
+    OPTIMIZE = "OPTIMIZE"
 
     XTFFILEPATH = "XTFFILEPATH"
 
@@ -99,6 +100,18 @@ class ProcessImporter(ProcessOperatorBase):
         )
         params.append(disablevalidation_param)
 
+        optimize_param = QgsProcessingParameterBoolean(
+            self.OPTIMIZE,
+            self.tr("Optimize the database after the import"),
+            defaultValue=False,
+        )
+        optimize_param.setHelp(
+            self.tr(
+                "Creates missing indexes on foreign key, basket and geometry columns and updates the statistics of the database"
+            )
+        )
+        params.append(optimize_param)
+
         return params
 
     def import_output_params(self):
@@ -129,8 +142,7 @@ class ProcessImporter(ProcessOperatorBase):
 
         # to do superuser finden? und auch dpparams?
         importer.configuration = configuration
-        importer.stdout.connect(feedback.pushInfo)
-        importer.stderr.connect(feedback.pushInfo)
+        self._connect_output(importer, feedback)
 
         if feedback.isCanceled():
             return {}
@@ -181,6 +193,9 @@ class ProcessImporter(ProcessOperatorBase):
         configuration.delete_data = self.parent.parameterAsBool(
             parameters, self.DELETEDATA, context
         )
+        configuration.optimize_db = self.parent.parameterAsBool(
+            parameters, self.OPTIMIZE, context
+        )
 
         configuration.xtffile = self.parent.parameterAsFile(
             parameters, self.XTFFILEPATH, context
@@ -11,13 +11,21 @@ License:
     (at your option) any later version.
 """
 
+import functools
+
+from qgis.core import QgsProcessingFeedback
 from qgis.PyQt.QtCore import QCoreApplication, QObject
 
+from ..iliwrapper.ili2dboutput import Ili2dbOutputEvent, Ili2dbOutputEventType
+from ..iliwrapper.iliexecutable import IliExecutable
 from ..utils.db_utils import get_db_connector
 from ..utils.globals import MODELS_BLACKLIST
 
 
 class ProcessOperatorBase(QObject):
+    # milliseconds the ili2db output is collected before it's pushed to the feedback
+    RAW_OUTPUT_INTERVAL = 250
+
     def __init__(self, parent):
         super().__init__()
         self.parent = parent
@@ -25,30 +33,58 @@ class ProcessOperatorBase(QObject):
     def _get_tid_handling(self, configuration):
         db_connector = get_db_connector(configuration)
         if db_connector:
-            return db_connector.get_tid_handling()
+            try:
+                return db_connector.get_tid_handling()
+            finally:
+                db_connector.close()
         return False
 
     def _basket_handling(self, configuration):
         db_connector = get_db_connector(configuration)
         if db_connector:
-            return db_connector.get_basket_handling()
+            try:
+                return db_connector.get_basket_handling()
+            finally:
+                db_connector.close()
         return False
 
     def _get_model_names(self, configuration):
         modelnames = []
 
         db_connector = get_db_connector(configuration)
-        if (
-            db_connector
-            and db_connector.db_or_schema_exists()
-            and db_connector.metadata_exists()
-        ):
-            db_models = db_connector.get_models()
-            for db_model in db_models:
-                name = db_model["modelname"]
-                if name and name not in modelnames and name not in MODELS_BLACKLIST:
-                    modelnames.append(name)
+        if not db_connector:
+            return modelnames
+        try:
+            if db_connector.db_or_schema_exists() and db_connector.metadata_exists():
+                db_models = db_connector.get_models()
+                for db_model in db_models:
+                    name = db_model["modelname"]
+                    if (
+                        name
+                        and name not in modelnames
+                        and name not in MODELS_BLACKLIST
+                    ):
+                        modelnames.append(name)
+        finally:
+            db_connector.close()
         return modelnames
 
+    def _connect_output(
+        self, executable: IliExecutable, feedback: QgsProcessingFeedback
+    ) -> None:
+        # the raw log is pushed in batches, the phases are shown as progress text
+        executable.raw_output_interval = self.RAW_OUTPUT_INTERVAL
+        executable.stdout.connect(feedback.pushInfo)
+        executable.stderr.connect(feedback.pushInfo)
+        executable.output_event.connect(
+            functools.partial(self._on_output_event, feedback)
+        )
+
+    def _on_output_event(
+        self, feedback: QgsProcessingFeedback, event: Ili2dbOutputEvent
+    ) -> None:
+        if event.type == Ili2dbOutputEventType.PHASE:
+            feedback.setProgressText(event.text)
+
     def tr(self, string):
         return QCoreApplication.translate("Processing", string)
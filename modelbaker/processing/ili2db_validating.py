@@ -161,8 +161,7 @@ class ProcessValidator(ProcessOperatorBase):
 
         # to do superuser finden? und auch dpparams?
         validator.configuration = configuration
-        validator.stdout.connect(feedback.pushInfo)
-        validator.stderr.connect(feedback.pushInfo)
+        self._connect_output(validator, feedback)
 
         if feedback.isCanceled():
             return {}
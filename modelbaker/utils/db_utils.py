@@ -164,7 +164,10 @@ def db_ili_version(configuration: Ili2DbCommandConfiguration) -> int:
     """
     db_connector = get_db_connector(configuration)
     if db_connector:
-        return db_connector.ili_version()
+        try:
+            return db_connector.ili_version()
+        finally:
+            db_connector.close()
 
 
 def get_service_names() -> tuple[list[str], str]:
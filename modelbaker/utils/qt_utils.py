@@ -12,6 +12,8 @@ License:
 
 
 import functools
+import json
+import os
 import re
 import unicodedata
 from abc import ABCMeta
@@ -140,6 +142,54 @@ class NetworkError(RuntimeError):
         self.error_code = error_code
 
 
+class HttpValidatorStore:
+    """
+    Persistent store of the HTTP validators (ETag and Last-Modified) of downloaded files per url.
+    Used by `download_file` to revalidate already downloaded files with conditional requests.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._validators = None
+
+    @property
+    def validators(self) -> dict[str, dict[str, str]]:
+        if self._validators is None:
+            self._validators = dict()
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path) as file:
+                        self._validators = json.load(file)
+                except (OSError, ValueError):
+                    # a broken store only means the files are downloaded again
+                    self._validators = dict()
+        return self._validators
+
+    def request_headers(self, url: str) -> dict[str, str]:
+        headers = dict()
+        validator = self.validators.get(url, {})
+        if validator.get("etag"):
+            headers["If-None-Match"] = validator["etag"]
+        if validator.get("last_modified"):
+            headers["If-Modified-Since"] = validator["last_modified"]
+        return headers
+
+    def update(self, url: str, etag: str, last_modified: str) -> None:
+        if etag or last_modified:
+            self.validators[url] = {"etag": etag, "last_modified": last_modified}
+        elif self.validators.pop(url, None) is None:
+            return
+        self.save()
+
+    def save(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "w") as file:
+                json.dump(self.validators, file)
+        except OSError:
+            pass
+
+
 replies = list()
 
 
@@ -150,6 +200,8 @@ def download_file(
     on_finished: Optional[Callable[[], None]] = None,
     on_error: Optional[Callable[[str, str], None]] = None,
     on_success: Optional[Callable[[], None]] = None,
+    validator_store: Optional[HttpValidatorStore] = None,
+    on_not_modified: Optional[Callable[[], None]] = None,
 ) -> str:
     """
     Will download the file from url to a local filename.
@@ -158,6 +210,10 @@ def download_file(
     While downloading it will repeatedly report progress by calling on_progress
     with two parameters bytes_received and bytes_total.
 
+    With a validator_store the request is conditional (If-None-Match / If-Modified-Since) when the local file
+    already exists. If the server answers that the file has not been modified, the local file is kept and
+    on_not_modified is called (or on_success if no on_not_modified is given).
+
     If an error occurs, it raises a NetworkError exception.
 
     It will return the filename if everything was ok.
@@ -170,6 +226,9 @@ def download_file(
         QNetworkRequest.Attribute.CacheLoadControlAttribute,
         QNetworkRequest.CacheLoadControl.AlwaysNetwork,
     )
+    if validator_store and os.path.exists(filename):
+        for header, value in validator_store.request_headers(url).items():
+            req.setRawHeader(header.encode(), value.encode())
 
     if QT_VERSION_STR < "6.0.0":
         req.setAttribute(QNetworkRequest.FollowRedirectsAttribute, True)
@@ -179,14 +238,33 @@ def download_file(
         on_progress(bytes_received, bytes_total)
 
     def finished(filename, reply, on_error, on_success, on_finished):
-        file = QFile(filename)
-        file.open(QIODevice.OpenModeFlag.WriteOnly)
-        file.write(reply.readAll())
-        file.close()
+        not_modified = (
+            validator_store is not None
+            and reply.attribute(QNetworkRequest.Attribute.HttpStatusCodeAttribute)
+            == 304
+        )
+        if not not_modified:
+            file = QFile(filename)
+            file.open(QIODevice.OpenModeFlag.WriteOnly)
+            file.write(reply.readAll())
+            file.close()
         if reply.error() != QNetworkReply.NetworkError.NoError and on_error:
             on_error(reply.error(), reply.errorString())
-        elif on_success:
-            on_success()
+        else:
+            if (
+                validator_store is not None
+                and not not_modified
+                and reply.error() == QNetworkReply.NetworkError.NoError
+            ):
+                validator_store.update(
+                    url,
+                    bytes(reply.rawHeader(b"ETag")).decode(),
+                    bytes(reply.rawHeader(b"Last-Modified")).decode(),
+                )
+            if not_modified and on_not_modified:
+                on_not_modified()
+            elif on_success:
+                on_success()
 
         if on_finished:
             on_finished()
@@ -0,0 +1,100 @@
+"""
+Metadata:
+    Creation Date: 2026-10-18
+    Copyright: (C) 2026 by OPENGIS.ch
+    Contact: info@opengis.ch
+
+License:
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the **GNU General Public License** as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+"""
+
+import copy
+import datetime
+import logging
+import os
+import shutil
+import tempfile
+
+from qgis.testing import start_app, unittest
+
+from modelbaker.generator.batch_generator import BatchGenerator
+from modelbaker.iliwrapper import iliimporter
+from modelbaker.iliwrapper.globals import DbIliMode
+from tests.utils import iliimporter_config
+
+start_app()
+
+
+class TestBatchGenerator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Run before all tests."""
+        cls.basetestpath = tempfile.mkdtemp()
+
+    def test_batch_generator_geopackage(self):
+        configurations = []
+        for model in [
+            "ZG_Naturschutz_und_Erholungsinfrastruktur_V1",
+            "ExceptionalLoadsRoute_LV95_V1",
+        ]:
+            importer = iliimporter.Importer()
+            importer.tool = DbIliMode.ili2gpkg
+            importer.configuration = iliimporter_config(importer.tool, "ilimodels")
+            importer.configuration.ilimodels = model
+            importer.configuration.dbfile = os.path.join(
+                self.basetestpath,
+                "tmp_batch_gpkg_{:%Y%m%d%H%M%S%f}.gpkg".format(
+                    datetime.datetime.now()
+                ),
+            )
+            importer.configuration.inheritance = "smart2"
+            importer.stdout.connect(self.print_info)
+            importer.stderr.connect(self.print_error)
+            assert importer.run() == iliimporter.Importer.SUCCESS
+            configurations.append(importer.configuration)
+
+        # a missing database must not abort the batch
+        missing_configuration = copy.copy(configurations[0])
+        missing_configuration.dbfile = os.path.join(
+            self.basetestpath, "tmp_batch_missing.gpkg"
+        )
+        configurations.insert(1, missing_configuration)
+
+        batch_generator = BatchGenerator(configurations, max_workers=2)
+        batch_generator.stdout.connect(self.print_info)
+        results = batch_generator.run()
+
+        assert [result.configuration for result in results] == configurations
+        assert [result.success for result in results] == [True, False, True]
+        assert results[1].error
+        assert results[1].project is None
+
+        for result in [results[0], results[2]]:
+            assert result.layers
+            assert result.relations
+            assert result.legend is not None
+            assert result.metadata_time > 0
+            assert result.create_time > 0
+            assert len(result.qgis_project.mapLayers()) > 0
+            assert len(result.qgis_project.relationManager().relations()) > 0
+
+        # metadata only
+        results = BatchGenerator([configurations[0]]).run(create_projects=False)
+        assert results[0].success
+        assert results[0].layers
+        assert results[0].project is None
+        assert results[0].create_time == 0
+
+    def print_info(self, text):
+        logging.info(text)
+
+    def print_error(self, text):
+        logging.error(text)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Run after all tests."""
+        shutil.rmtree(cls.basetestpath, True)
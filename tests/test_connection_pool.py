@@ -0,0 +1,92 @@
+"""
+Metadata:
+    Creation Date: 2026-10-18
+    Copyright: (C) 2026 by OPENGIS.ch
+    Contact: info@opengis.ch
+
+License:
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the **GNU General Public License** as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+"""
+
+from qgis.testing import start_app, unittest
+
+from modelbaker.dbconnector.connection_pool import ConnectionPool, connection_pool
+from modelbaker.dbconnector.pg_connector import PGConnector
+from tests.utils import get_pg_connection_string
+
+start_app()
+
+
+class TestConnectionPool(unittest.TestCase):
+    def test_pg_connection_reuse(self):
+        connection_pool.close_all()
+        uri = get_pg_connection_string()
+
+        db_connector = PGConnector(uri, "public")
+        conn = db_connector.conn
+        db_connector.close()
+        assert db_connector.conn is None
+        assert connection_pool.idle_count() == 1
+
+        # the next connector with the same uri borrows the idle connection
+        db_connector = PGConnector(uri, "public")
+        assert db_connector.conn is conn
+        assert connection_pool.idle_count() == 0
+
+        # a connection in use is never shared
+        other_db_connector = PGConnector(uri, "public")
+        assert other_db_connector.conn is not conn
+
+        other_conn = other_db_connector.conn
+        db_connector.close()
+        other_db_connector.close()
+        assert connection_pool.idle_count() == 2
+
+        # broken connections do not pass the health check
+        conn.close()
+        other_conn.close()
+        db_connector = PGConnector(uri, "public")
+        assert db_connector.conn not in (conn, other_conn)
+        assert connection_pool.idle_count() == 0
+        assert not db_connector.conn.closed
+        db_connector.close()
+
+        connection_pool.close_all()
+        assert connection_pool.idle_count() == 0
+
+    def test_pool_limits(self):
+        pool = ConnectionPool(max_size=1, idle_timeout=60)
+        first = Connection()
+        second = Connection()
+
+        pool.release("key", first)
+        pool.release("key", second)
+        assert pool.idle_count("key") == 1
+        assert second.closed
+
+        assert pool.acquire("key", Connection) is first
+        assert pool.acquire("key", Connection) is not first
+
+        # expired idle connections are closed
+        pool.idle_timeout = -1
+        pool.release("key", first)
+        assert pool.acquire("key", Connection) is not first
+        assert first.closed
+
+        # connections that cannot be reset are closed
+        pool.idle_timeout = 60
+        third = Connection()
+        pool.release("key", third, reset=lambda connection: False)
+        assert third.closed
+        assert pool.idle_count() == 0
+
+
+class Connection:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
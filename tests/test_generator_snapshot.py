@@ -0,0 +1,153 @@
+"""
+Metadata:
+    Creation Date: 2026-10-18
+    Copyright: (C) 2026 by OPENGIS.ch
+    Contact: info@opengis.ch
+
+License:
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the **GNU General Public License** as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+"""
+
+import datetime
+import logging
+import os
+import shutil
+import tempfile
+
+from qgis.core import QgsProject
+from qgis.testing import start_app, unittest
+
+from modelbaker.dataobjects.project import Project
+from modelbaker.db_factory.gpkg_command_config_manager import GpkgCommandConfigManager
+from modelbaker.generator.generator import Generator
+from modelbaker.generator.snapshot import SnapshotError
+from modelbaker.iliwrapper import iliimporter
+from modelbaker.iliwrapper.globals import DbIliMode
+from tests.utils import iliimporter_config
+
+start_app()
+
+
+class TestGeneratorSnapshot(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Run before all tests."""
+        cls.basetestpath = tempfile.mkdtemp()
+
+    def test_snapshot_geopackage(self):
+        importer = iliimporter.Importer()
+        importer.tool = DbIliMode.ili2gpkg
+        importer.configuration = iliimporter_config(importer.tool, "ilimodels")
+        importer.configuration.ilimodels = (
+            "ZG_Naturschutz_und_Erholungsinfrastruktur_V1"
+        )
+        importer.configuration.dbfile = os.path.join(
+            self.basetestpath,
+            "tmp_naturschutz_gpkg_{:%Y%m%d%H%M%S%f}.gpkg".format(
+                datetime.datetime.now()
+            ),
+        )
+        importer.configuration.inheritance = "smart1"
+        importer.stdout.connect(self.print_info)
+        importer.stderr.connect(self.print_error)
+        assert importer.run() == iliimporter.Importer.SUCCESS
+
+        config_manager = GpkgCommandConfigManager(importer.configuration)
+        uri = config_manager.get_uri()
+
+        generator = Generator(DbIliMode.ili2gpkg, uri, "smart1")
+        available_layers = generator.layers()
+        relations, bags_of_enum = generator.relations(available_layers)
+        legend = generator.legend(available_layers)
+
+        snapshot_path = os.path.join(self.basetestpath, "naturschutz.mbsnap")
+        generator.snapshot(snapshot_path, available_layers, relations, bags_of_enum)
+        assert os.path.isfile(snapshot_path)
+
+        (
+            loaded_layers,
+            loaded_relations,
+            loaded_bags_of_enum,
+            loaded_legend,
+        ) = Generator.from_snapshot(snapshot_path)
+
+        assert [layer.name for layer in loaded_layers] == [
+            layer.name for layer in available_layers
+        ]
+        assert [layer.uri for layer in loaded_layers] == [
+            layer.uri for layer in available_layers
+        ]
+        assert [layer.wkb_type for layer in loaded_layers] == [
+            layer.wkb_type for layer in available_layers
+        ]
+        for loaded_layer, layer in zip(loaded_layers, available_layers):
+            assert [
+                (field.name, field.alias, field.widget, field.widget_config)
+                for field in loaded_layer.fields
+            ] == [
+                (field.name, field.alias, field.widget, field.widget_config)
+                for field in layer.fields
+            ]
+
+        assert [
+            (
+                relation.name,
+                relation.referencing_layer.name,
+                relation.referenced_layer.name,
+                relation.strength,
+            )
+            for relation in loaded_relations
+        ] == [
+            (
+                relation.name,
+                relation.referencing_layer.name,
+                relation.referenced_layer.name,
+                relation.strength,
+            )
+            for relation in relations
+        ]
+        # the layers are shared between the layer list and the relations
+        assert all(
+            relation.referencing_layer in loaded_layers for relation in loaded_relations
+        )
+        assert bags_of_enum.keys() == loaded_bags_of_enum.keys()
+        assert [item.name for item in loaded_legend.items] == [
+            item.name for item in legend.items
+        ]
+
+        project = Project()
+        project.layers = loaded_layers
+        project.relations = loaded_relations
+        project.bags_of_enum = loaded_bags_of_enum
+        project.legend = loaded_legend
+        project.post_generate()
+
+        qgis_project = QgsProject.instance()
+        project.create(None, qgis_project)
+
+        layer_names = [layer.name() for layer in qgis_project.mapLayers().values()]
+        for layer in available_layers:
+            assert (layer.alias or layer.name) in layer_names
+        assert len(qgis_project.relationManager().relations()) > 0
+
+    def test_snapshot_invalid_file(self):
+        invalid_path = os.path.join(self.basetestpath, "invalid.mbsnap")
+        with open(invalid_path, "wb") as f:
+            f.write(b"not a snapshot")
+
+        with self.assertRaises(SnapshotError):
+            Generator.from_snapshot(invalid_path)
+
+    def print_info(self, text):
+        logging.info(text)
+
+    def print_error(self, text):
+        logging.error(text)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Run after all tests."""
+        shutil.rmtree(cls.basetestpath, True)
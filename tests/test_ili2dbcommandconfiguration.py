@@ -11,8 +11,15 @@ License:
     (at your option) any later version.
 """
 
+import os
+import shutil
+import tempfile
+
+from qgis.PyQt.QtCore import QSettings
 from qgis.testing import start_app, unittest
 
+from modelbaker.iliwrapper import ilideleter
+from modelbaker.iliwrapper.globals import DbIliMode, JvmProfile
 from modelbaker.iliwrapper.ili2dbconfig import (
     BaseConfiguration,
     DeleteConfiguration,
@@ -61,6 +68,59 @@ class TestIli2DbCommandConfiguration(unittest.TestCase):
         validate_config = ValidateConfiguration(configuration)
         self.check_members(validate_config)
 
+    def test_jvm_profiles(self):
+        base_config = BaseConfiguration()
+        assert base_config.to_jvm_args() == []
+        assert base_config.to_jvm_args(True, 10**9) == []
+
+        base_config.jvm_profile = JvmProfile.FAST_STARTUP
+        assert "-XX:TieredStopAtLevel=1" in base_config.to_jvm_args()
+
+        base_config.jvm_profile = JvmProfile.CUSTOM
+        base_config.jvm_custom_args = '-Xmx2g -Dfile.encoding="UTF-8"'
+        assert base_config.to_jvm_args() == ["-Xmx2g", "-Dfile.encoding=UTF-8"]
+        base_config.jvm_custom_args = (
+            r'-Djava.io.tmpdir=C:\Temp\ili "-Duser.home=C:\Users\Jane Doe"'
+        )
+        assert base_config.to_jvm_args() == [
+            r"-Djava.io.tmpdir=C:\Temp\ili",
+            r"-Duser.home=C:\Users\Jane Doe",
+        ]
+
+        base_config.jvm_profile = JvmProfile.AUTO
+        assert base_config.to_jvm_args(light_operation=True) == list(
+            BaseConfiguration.FAST_STARTUP_ARGS
+        )
+        assert base_config.to_jvm_args(input_size=1024) == list(
+            BaseConfiguration.FAST_STARTUP_ARGS
+        )
+        # the heap grows with the transfer file but not beyond the physical memory
+        heap_args = base_config.to_jvm_args(input_size=100 * 1048576)
+        heap_mb = min(base_config.max_heap_mb(), 512 + 4 * 100)
+        assert heap_args == ["-Xmx{}m".format(heap_mb), "-XX:+UseParallelGC"]
+        heap_args = base_config.to_jvm_args(input_size=10**15)
+        assert heap_args[0] == "-Xmx{}m".format(base_config.max_heap_mb())
+
+        basetestpath = tempfile.mkdtemp()
+        settings = QSettings(
+            os.path.join(basetestpath, "settings.ini"), QSettings.Format.IniFormat
+        )
+        base_config.save(settings)
+        restored_config = BaseConfiguration()
+        restored_config.restore(settings)
+        assert restored_config.jvm_profile == JvmProfile.AUTO
+        assert restored_config.jvm_custom_args == base_config.jvm_custom_args
+
+        # the command reflects the profile
+        deleter = ilideleter.Deleter()
+        deleter.tool = DbIliMode.ili2gpkg
+        deleter.configuration.base_configuration = base_config
+        deleter.configuration.dbfile = self.GPKG_PATH
+        deleter.configuration.dataset = "Dataset"
+        command = deleter.command(True)
+        assert "-XX:TieredStopAtLevel=1 -XX:+UseSerialGC -jar" in command
+        shutil.rmtree(basetestpath, True)
+
     def check_members(self, config):
         assert config.base_configuration.custom_model_directories_enabled == True
         assert config.base_configuration.custom_model_directories == self.MODELS_DIR
@@ -1,5 +1,9 @@
 from qgis.testing import unittest
 
+from modelbaker.iliwrapper.ili2dboutput import (
+    Ili2dbOutputEventType,
+    Ili2dbOutputParser,
+)
 from modelbaker.iliwrapper.ili2dbutils import get_all_modeldir_in_path
 from tests.utils import testdata_path
 
@@ -62,3 +66,47 @@ class TestILI2DBUtils(unittest.TestCase):
     def test_parse_special_strings(self):
         modeldirs = get_all_modeldir_in_path("%XTF_DIR")
         assert "%XTF_DIR" == modeldirs
+
+    def test_ili2db_output_parser(self):
+        parser = Ili2dbOutputParser(progress_interval=3600)
+        events = []
+        # the output arrives in arbitrary chunks
+        for index in range(0, len(ILI2DB_OUTPUT), 7):
+            events += parser.feed(ILI2DB_OUTPUT[index : index + 7])
+        events += parser.flush()
+
+        assert parser.done
+        assert not parser.failed
+        assert parser.count == 7
+        assert parser.warning_count == 1
+        assert [event.type for event in events] == [
+            Ili2dbOutputEventType.PHASE,
+            Ili2dbOutputEventType.PHASE,
+            Ili2dbOutputEventType.PROGRESS,
+            Ili2dbOutputEventType.WARNING,
+            Ili2dbOutputEventType.PHASE,
+            Ili2dbOutputEventType.DONE,
+        ]
+        assert events[1].text == "Basket RoadsSimple.Roads.Roads(oid b1)"
+        assert events[3].text == "unknown attribute Name in RoadsSimple.Roads.Street"
+        assert events[3].phase == "Basket RoadsSimple.Roads.Roads(oid b1)"
+        # the throttled progress is reported by the done event
+        assert events[5].count == 7
+
+        parser = Ili2dbOutputParser()
+        parser.feed("Info: data <test.xtf>\nError: ...import failed\n")
+        assert parser.failed
+        assert not parser.done
+        assert parser.error_count == 1
+
+
+ILI2DB_OUTPUT = """Info: ili2gpkg-5.1.0-
+Info: dbfile <roads.gpkg>
+Info: process data file...
+Info: Basket RoadsSimple.Roads.Roads(oid b1)...
+Info: \tRoadsSimple.Roads.LandCover 3 objects
+Warning: unknown attribute Name in RoadsSimple.Roads.Street
+Info: \tRoadsSimple.Roads.Street 4 objects
+Info: validate data...
+Info: ...import done
+"""
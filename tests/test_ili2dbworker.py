@@ -0,0 +1,130 @@
+"""
+Metadata:
+    Creation Date: 2026-10-18
+    Copyright: (C) 2026 by OPENGIS.ch
+    Contact: info@opengis.ch
+
+License:
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the **GNU General Public License** as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+"""
+
+import datetime
+import logging
+import os
+import shutil
+import tempfile
+
+from qgis.PyQt.QtCore import QThread
+from qgis.testing import start_app, unittest
+
+from modelbaker.iliwrapper import iliimporter, ilivalidator
+from modelbaker.iliwrapper.globals import DbIliMode
+from modelbaker.iliwrapper.ili2dbworker import escaped_worker_arg, ili2db_worker_pool
+from tests.utils import ilidataimporter_config, ilivalidator_config, testdata_path
+
+start_app()
+
+
+class TestIli2dbWorker(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Run before all tests."""
+        cls.basetestpath = tempfile.mkdtemp()
+
+    def test_escaped_worker_arg(self):
+        assert escaped_worker_arg("--models") == "--models"
+        assert escaped_worker_arg("C:\\data\\roads.xtf") == "C:\\\\data\\\\roads.xtf"
+        assert escaped_worker_arg("line\nbreak") == "line\\nbreak"
+
+    def test_runs_in_resident_worker(self):
+        dbfile = os.path.join(
+            self.basetestpath,
+            "tmp_roads_simple_worker_{:%Y%m%d%H%M%S%f}.gpkg".format(
+                datetime.datetime.now()
+            ),
+        )
+
+        importer = iliimporter.Importer()
+        importer.tool = DbIliMode.ili2gpkg
+        importer.configuration.base_configuration.ili2db_worker_enabled = True
+        importer.configuration.ilifile = testdata_path("ilimodels/RoadsSimple.ili")
+        importer.configuration.ilimodels = "RoadsSimple"
+        importer.configuration.dbfile = dbfile
+        importer.configuration.srs_code = 2056
+        importer.configuration.create_basket_col = True
+        importer.configuration.inheritance = "smart2"
+        importer.stdout.connect(self.print_info)
+        importer.stderr.connect(self.print_error)
+        assert importer.run() == iliimporter.Importer.SUCCESS
+
+        workers = list(ili2db_worker_pool.workers.values())
+        assert len(workers) == 1
+        assert not workers[0].unavailable
+        assert workers[0].process is not None
+
+        data_importer = iliimporter.Importer(dataImport=True)
+        data_importer.tool = DbIliMode.ili2gpkg
+        data_importer.configuration = ilidataimporter_config(data_importer.tool)
+        data_importer.configuration.base_configuration.ili2db_worker_enabled = True
+        data_importer.configuration.ilimodels = "RoadsSimple"
+        data_importer.configuration.dbfile = dbfile
+        data_importer.stdout.connect(self.print_info)
+        data_importer.stderr.connect(self.print_error)
+
+        data_importer.configuration.dataset = "ValidSet"
+        data_importer.configuration.xtffile = testdata_path("xtf/test_roads_simple.xtf")
+        assert data_importer.run() == iliimporter.Importer.SUCCESS
+
+        # a failing job does not affect the following ones
+        data_importer.configuration.dataset = "InvalidSet"
+        data_importer.configuration.xtffile = testdata_path(
+            "xtf/test_roads_simple_invalid.xtf"
+        )
+        assert data_importer.run() == iliimporter.Importer.ERROR
+
+        validator = ilivalidator.Validator()
+        validator.tool = DbIliMode.ili2gpkg
+        validator.configuration = ilivalidator_config(validator.tool)
+        validator.configuration.base_configuration.ili2db_worker_enabled = True
+        validator.configuration.dbfile = dbfile
+        validator.configuration.dataset = "ValidSet"
+        validator.stdout.connect(self.print_info)
+        validator.stderr.connect(self.print_error)
+        assert validator.run() == ilivalidator.Validator.SUCCESS
+
+        # all the jobs have been run by the same worker
+        assert list(ili2db_worker_pool.workers.values()) == workers
+
+        ili2db_worker_pool.stop_all()
+        assert not ili2db_worker_pool.workers
+
+    def test_workers_per_thread(self):
+        class PoolThread(QThread):
+            def run(self):
+                self.worker = ili2db_worker_pool.worker("java", "ili2db.jar")
+
+        worker = ili2db_worker_pool.worker("java", "ili2db.jar")
+        thread = PoolThread()
+        thread.start()
+        assert thread.wait(5000)
+
+        # the worker of the thread was not shared and is gone with the thread
+        assert thread.worker is not worker
+        assert list(ili2db_worker_pool.workers.values()) == [worker]
+        assert ili2db_worker_pool.worker("java", "ili2db.jar") is worker
+
+        ili2db_worker_pool.stop_all()
+
+    def print_info(self, text):
+        logging.info(text)
+
+    def print_error(self, text):
+        logging.error(text)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Run after all tests."""
+        shutil.rmtree(cls.basetestpath, True)
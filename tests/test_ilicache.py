@@ -1,5 +1,7 @@
 import os
 import pathlib
+import shutil
+import tempfile
 
 from qgis.PyQt.QtCore import QEventLoop, Qt, QTimer
 from qgis.testing import unittest
@@ -9,9 +11,14 @@ from modelbaker.iliwrapper.ilicache import (
     IliCache,
     IliDataCache,
     IliDataItemModel,
+    IliModelItemModel,
     IliToppingFileCache,
     IliToppingFileItemModel,
+    ModelSearchProxyModel,
 )
+from modelbaker.iliwrapper.repository_bundle import RepositoryBundle
+from modelbaker.iliwrapper.repository_index import IliFileIndex, RepositoryIndex
+from modelbaker.utils.qt_utils import HttpValidatorStore
 
 test_path = pathlib.Path(__file__).parent.absolute()
 
@@ -720,8 +727,20 @@ class IliCacheTest(unittest.TestCase):
             test_path, "testdata", "ilirepo", "usabilityhub"
         )
         ilitoppingfilecache = IliToppingFileCache(configuration, file_ids=qml_file_ids)
+        finished = list()
+        ilitoppingfilecache.download_finished_and_model_fresh.connect(
+            lambda: finished.append(True)
+        )
         ilitoppingfilecache.refresh()
 
+        # nothing to download, so the completion is signalled once with the model already containing the files
+        assert finished == [True]
+        model_ids = {
+            ilitoppingfilecache.model.index(row, 0).data(int(Qt.ItemDataRole.EditRole))
+            for row in range(ilitoppingfilecache.model.rowCount())
+        }
+        assert model_ids == set(qml_file_ids)
+
         # local repo repository
         assert (
             os.path.join(test_path, "testdata", "ilirepo", "usabilityhub")
@@ -742,6 +761,391 @@ class IliCacheTest(unittest.TestCase):
         }
         assert files == expected_files
 
+    def test_toppingfile_download_md5_and_coalescing(self):
+        basetestpath = tempfile.mkdtemp()
+        ilitoppingfilecache = IliToppingFileCache(configuration=None)
+        ilitoppingfilecache.CACHE_PATH = basetestpath
+        url = "http://localhost:1/repo"
+
+        # a cached file matching the md5 is not downloaded again
+        cached_file = os.path.join(basetestpath, "localhost", "layerstyle", "a.qml")
+        os.makedirs(os.path.dirname(cached_file))
+        with open(cached_file, "w") as f:
+            f.write("<qgis/>")
+        succeeded = []
+        ilitoppingfilecache.file_download_succeeded.connect(
+            lambda dataset_id, path: succeeded.append((dataset_id, path))
+        )
+        ilitoppingfilecache.download_file(
+            "localhost",
+            url,
+            "layerstyle/a.qml",
+            "ilidata:a",
+            "0A1DE4E457BA6B86792E1F97D273FB8E",
+        )
+        assert ilitoppingfilecache.running_downloads == 0
+        assert succeeded == [("ilidata:a", os.path.normpath(cached_file))]
+
+        # requests of the same file are joined
+        for dataset_id in ("ilidata:b", "ilidata:c"):
+            ilitoppingfilecache.download_file(
+                "localhost", url, "layerstyle/b.qml", dataset_id
+            )
+        assert ilitoppingfilecache.running_downloads == 1
+        assert list(ilitoppingfilecache.pending_file_downloads.values()) == [
+            ["ilidata:b", "ilidata:c"]
+        ]
+
+        shutil.rmtree(basetestpath, True)
+
+    def test_ilisite_crawling_visits_sites_once(self):
+        # two local repositories referencing each other as subsidiary sites
+        basetestpath = tempfile.mkdtemp()
+        first_repo = os.path.join(basetestpath, "first")
+        second_repo = os.path.join(basetestpath, "second")
+        for repo, subsite in ((first_repo, second_repo), (second_repo, first_repo)):
+            os.makedirs(repo)
+            shutil.copy(
+                os.path.join(test_path, "testdata", "ilirepo", "24", "ilimodels.xml"),
+                repo,
+            )
+            with open(os.path.join(repo, "ilisite.xml"), "w") as f:
+                f.write(ILISITE.format(subsite=subsite))
+
+        ilicache = IliCache([])
+        ilicache.directories = [first_repo, second_repo]
+        processed_files = []
+        process_informationfile = ilicache._process_informationfile
+
+        def track_informationfile(file, netloc, url):
+            processed_files.append(file)
+            process_informationfile(file, netloc, url)
+
+        ilicache._process_informationfile = track_informationfile
+        resolved = []
+        ilicache.repositories_resolved.connect(lambda: resolved.append(True))
+        ilicache.refresh()
+
+        assert sorted(processed_files) == sorted(
+            [
+                os.path.join(first_repo, "ilimodels.xml"),
+                os.path.join(second_repo, "ilimodels.xml"),
+            ]
+        )
+        assert first_repo in ilicache.repositories.keys()
+        assert second_repo in ilicache.repositories.keys()
+        assert resolved == [True]
+
+        shutil.rmtree(basetestpath, True)
+
+    def test_http_validator_store(self):
+        basetestpath = tempfile.mkdtemp()
+        path = os.path.join(basetestpath, "cache", "validators.json")
+        url = "https://models.interlis.ch/ilimodels.xml"
+
+        validator_store = HttpValidatorStore(path)
+        assert validator_store.request_headers(url) == {}
+        validator_store.update(url, '"abc"', "Wed, 21 Oct 2026 07:28:00 GMT")
+
+        # the validators are persisted
+        validator_store = HttpValidatorStore(path)
+        assert validator_store.request_headers(url) == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Wed, 21 Oct 2026 07:28:00 GMT",
+        }
+
+        # a response without validators removes them
+        validator_store.update(url, "", "")
+        assert HttpValidatorStore(path).request_headers(url) == {}
+
+        shutil.rmtree(basetestpath, True)
+
+    def test_repository_index(self):
+        basetestpath = tempfile.mkdtemp()
+        repo = os.path.join(basetestpath, "repo")
+        os.makedirs(repo)
+        shutil.copy(
+            os.path.join(test_path, "testdata", "ilirepo", "24", "ilimodels.xml"), repo
+        )
+        index_path = os.path.join(basetestpath, "repository_index.sqlite")
+
+        def load_repository():
+            ilicache = IliCache([])
+            ilicache.repository_index = RepositoryIndex(index_path)
+            processed_files = []
+            process_informationfile = ilicache._process_informationfile
+
+            def track_informationfile(file, netloc, url):
+                processed_files.append(file)
+                process_informationfile(file, netloc, url)
+
+            ilicache._process_informationfile = track_informationfile
+            ilicache.download_repository(repo)
+            return ilicache.repositories[repo], processed_files
+
+        models, processed_files = load_repository()
+        assert len(processed_files) == 1
+        assert models
+
+        # the unchanged file is loaded from the index
+        indexed_models, processed_files = load_repository()
+        assert processed_files == []
+        assert indexed_models == models
+
+        # the changed file is parsed again
+        with open(os.path.join(repo, "ilimodels.xml"), "a") as f:
+            f.write("\n")
+        changed_models, processed_files = load_repository()
+        assert len(processed_files) == 1
+        assert changed_models == models
+
+        shutil.rmtree(basetestpath, True)
+
+    def test_ili_file_index(self):
+        basetestpath = tempfile.mkdtemp()
+        modeldir = os.path.join(basetestpath, "models")
+        os.makedirs(modeldir)
+        for ilifile in ("RoadsSimple.ili", "DM01AVLV95LU2401.ili"):
+            shutil.copy(
+                os.path.join(test_path, "testdata", "ilimodels", ilifile), modeldir
+            )
+        index_path = os.path.join(basetestpath, "ili_file_index.json")
+
+        def load_models():
+            ilicache = IliCache([])
+            ilicache.ili_file_index = IliFileIndex(index_path)
+            parsed_files = []
+            parse_ili_lines = ilicache._parse_ili_lines
+
+            def track_parsing(ilipath, lines):
+                parsed_files.append(ilipath)
+                return parse_ili_lines(ilipath, lines)
+
+            ilicache._parse_ili_lines = track_parsing
+            messages = []
+            ilicache.new_message.connect(lambda level, text: messages.append(level))
+            ilicache.process_model_directory(modeldir)
+            models = {
+                (model["name"], model["version"])
+                for model in ilicache.repositories[modeldir]
+            }
+            return models, parsed_files, messages
+
+        expected_models = {("RoadsSimple", "2016-08-11"), ("DM01AVLV95LU2401", "")}
+        models, parsed_files, messages = load_models()
+        assert models == expected_models
+        assert len(parsed_files) == 2
+        # the latin1 file is reported
+        assert len(messages) == 1
+
+        # unchanged files are not parsed again
+        models, parsed_files, messages = load_models()
+        assert models == expected_models
+        assert parsed_files == []
+        assert len(messages) == 1
+
+        # changed files are parsed again
+        with open(os.path.join(modeldir, "RoadsSimple.ili"), "a") as f:
+            f.write("\n")
+        models, parsed_files, messages = load_models()
+        assert models == expected_models
+        assert parsed_files == [os.path.join(modeldir, "RoadsSimple.ili")]
+
+        shutil.rmtree(basetestpath, True)
+
+    def test_parallel_ili_file_parsing(self):
+        basetestpath = tempfile.mkdtemp()
+        modeldir = os.path.join(test_path, "testdata", "ilimodels")
+
+        sequential_ilicache = IliCache([])
+        sequential_ilicache.ili_file_index = IliFileIndex(
+            os.path.join(basetestpath, "sequential_index.json")
+        )
+        sequential_ilicache.process_model_directory(modeldir)
+
+        parallel_ilicache = IliCache([], parallel_parsing=True)
+        parallel_ilicache.ili_file_index = IliFileIndex(
+            os.path.join(basetestpath, "parallel_index.json")
+        )
+        progress = []
+        parallel_ilicache.ili_files_parsed.connect(
+            lambda parsed, total: progress.append((parsed, total))
+        )
+        parallel_ilicache.process_model_directory(modeldir)
+
+        assert parallel_ilicache.repositories == sequential_ilicache.repositories
+        assert progress
+        assert progress[-1][0] == progress[-1][1]
+
+        shutil.rmtree(basetestpath, True)
+
+    def test_model_item_model_incremental_search(self):
+        item_model = IliModelItemModel()
+        repositories = {
+            "models.interlis.ch": [
+                {"name": "RoadsSimple", "version": "2016-08-11", "repository": "a"},
+                {"name": "RoadsExdm2ben", "version": "2016-08-11", "repository": "a"},
+            ],
+            "models.geo.admin.ch": [
+                {"name": "RoadsSimple", "version": "2014-01-01", "repository": "b"},
+                {"name": "KbS_LV95_V1_4", "version": "2020-01-01", "repository": "b"},
+            ],
+        }
+        item_model.set_repositories(repositories)
+        assert item_model.rowCount() == 3
+        roads_simple = item_model.search("RoadsSimple")[0]
+        assert roads_simple.data(int(IliModelItemModel.Roles.ILIREPO)) == "a"
+        assert roads_simple.data(int(IliModelItemModel.Roles.VERSION)) == "2016-08-11"
+
+        # unchanged repositories keep the items
+        item = item_model.item(0)
+        item_model.set_repositories(repositories)
+        assert item_model.item(0) is item
+
+        # a removed repository removes its models and the others take over
+        del repositories["models.interlis.ch"]
+        item_model.set_repositories(repositories)
+        assert item_model.rowCount() == 2
+        roads_simple = item_model.search("RoadsSimple")[0]
+        assert roads_simple.data(int(IliModelItemModel.Roles.ILIREPO)) == "b"
+        assert roads_simple.data(int(IliModelItemModel.Roles.VERSION)) == "2014-01-01"
+        assert item_model.search("RoadsExdm2ben") == []
+
+        # ranked prefix, substring and fuzzy matches
+        repositories["local"] = [
+            {"name": "Roads", "version": "", "repository": "c"},
+            {"name": "SIA405_Roads", "version": "", "repository": "c"},
+        ]
+        item_model.set_repositories(repositories)
+        assert [index.data() for index in item_model.search("roads")] == [
+            "Roads",
+            "RoadsSimple",
+            "SIA405_Roads",
+        ]
+        assert [index.data() for index in item_model.search("lv95")] == [
+            "KbS_LV95_V1_4"
+        ]
+        assert item_model.search("RodsSimple", limit=1)[0].data() == "RoadsSimple"
+
+        # queries shorter than a trigram find substrings as well
+        repositories["local"].append(
+            {"name": "DM01AVCH24LV95D", "version": "", "repository": "c"}
+        )
+        item_model.set_repositories(repositories)
+        assert [index.data() for index in item_model.search("LV")] == [
+            "KbS_LV95_V1_4",
+            "DM01AVCH24LV95D",
+        ]
+
+        # the search proxy of the completer filters and ranks by the name index
+        search_model = ModelSearchProxyModel()
+        search_model.setSourceModel(item_model)
+        search_model.sort(0, Qt.SortOrder.AscendingOrder)
+        assert search_model.rowCount() == 5
+        search_model.set_search_text("roads")
+        assert [
+            search_model.index(row, 0).data()
+            for row in range(search_model.rowCount())
+        ] == ["Roads", "RoadsSimple", "SIA405_Roads"]
+
+        # a change of the repositories resets the model once and updates the ranks
+        resets = []
+        item_model.modelReset.connect(lambda: resets.append(True))
+        repositories["local"].append(
+            {"name": "RoadsNew", "version": "", "repository": "c"}
+        )
+        item_model.set_repositories(repositories)
+        assert len(resets) == 1
+        assert "RoadsNew" in [
+            search_model.index(row, 0).data()
+            for row in range(search_model.rowCount())
+        ]
+        search_model.set_search_text("")
+        assert search_model.rowCount() == 6
+
+    def test_repository_bundle(self):
+        basetestpath = tempfile.mkdtemp()
+        first_repo = os.path.join(basetestpath, "first")
+        second_repo = os.path.join(basetestpath, "second")
+        os.makedirs(os.path.join(first_repo, "models"))
+        shutil.copy(
+            os.path.join(test_path, "testdata", "ilimodels", "RoadsSimple.ili"),
+            os.path.join(first_repo, "models"),
+        )
+        with open(os.path.join(first_repo, "ilimodels.xml"), "w") as f:
+            f.write(ILIMODELS)
+        with open(os.path.join(first_repo, "ilisite.xml"), "w") as f:
+            f.write(ILISITE.format(subsite=second_repo))
+        shutil.copytree(
+            os.path.join(test_path, "testdata", "ilirepo", "usabilityhub"), second_repo
+        )
+        # the subsidiary site of the usabilityhub repository is not bundled
+        os.remove(os.path.join(second_repo, "ilisite.xml"))
+
+        bundle_path = os.path.join(basetestpath, "bundle")
+        bundle = RepositoryBundle.create(bundle_path, [first_repo])
+        assert len(bundle.model_directories) == 2
+        roads_simple = bundle.model("RoadsSimple")
+        assert len(roads_simple) == 1
+        assert roads_simple[0]["version"] == "2016-08-11"
+        assert os.path.isfile(roads_simple[0]["file"])
+        datasets = bundle.dataset("ch.opengis.topping.opengisch_KbS_LV95_V1_4_001")
+        assert len(datasets) == 1
+        assert all(os.path.isfile(file) for file in datasets[0]["files"])
+
+        # the mounted bundle replaces the (now unavailable) repositories
+        shutil.rmtree(first_repo)
+        shutil.rmtree(second_repo)
+        ilicache = IliCache([])
+        ilicache.directories = [first_repo]
+        ilicache.mount_bundle(bundle_path)
+        ilicache.refresh()
+        assert {
+            model["name"]
+            for models in ilicache.repositories.values()
+            for model in models
+        } == {"RoadsSimple"}
+
+        assert [model["name"] for model in ilicache.repositories[first_repo]] == [
+            "RoadsSimple"
+        ]
+
+        ilidatacache = IliDataCache(configuration=None, models="KbS_LV95_V1_4")
+        ilidatacache.directories = [second_repo]
+        ilidatacache.mount_bundle(bundle_path)
+        ilidatacache.refresh()
+        assert ilidatacache.repositories[second_repo]
+
+        # the topping files are taken from the bundle index
+        dataset_id = "ilidata:ch.opengis.topping.opengisch_KbS_LV95_V1_4_001"
+        toppingfilecache = IliToppingFileCache(
+            configuration=None, file_ids=[dataset_id]
+        )
+        toppingfilecache.directories = [second_repo]
+        toppingfilecache.mount_bundle(bundle_path)
+        toppingfilecache.refresh()
+        toppingfiles = toppingfilecache.repositories[second_repo]
+        assert {toppingfile["id"] for toppingfile in toppingfiles} == {dataset_id}
+        assert {toppingfile["local_file_path"] for toppingfile in toppingfiles} == set(
+            datasets[0]["files"]
+        )
+
+        # the bundle configured in the base configuration is mounted and passed to ili2db
+        configuration = BaseConfiguration()
+        configuration.custom_model_directories_enabled = True
+        configuration.custom_model_directories = "%ILI_FROM_DB;{}".format(first_repo)
+        configuration.repository_bundle_path = bundle_path
+        ilicache = IliCache(configuration)
+        assert ilicache.bundle.path == bundle_path
+        args = configuration.to_ili2db_args()
+        assert args[args.index("--modeldir") + 1].split(";") == [
+            "%ILI_FROM_DB",
+            bundle.local_directory(first_repo),
+            bundle.local_directory(second_repo),
+        ]
+
+        shutil.rmtree(basetestpath, True)
+
     def test_ilimodels_xml_parser_invalid(self):
         """
         parse invalid models withouth crashing
@@ -787,3 +1191,39 @@ class IliCacheTest(unittest.TestCase):
         if model:
             model.modelReset.connect(lambda: loop.quit())
         loop.exec()
+
+
+ILISITE = """<?xml version='1.0' encoding='UTF-8'?>
+<TRANSFER xmlns="http://www.interlis.ch/INTERLIS2.3">
+<HEADERSECTION SENDER="modelbaker" VERSION="2.3"></HEADERSECTION>
+<DATASECTION>
+<IliSite09.SiteMetadata BID="b0">
+  <IliSite09.SiteMetadata.Site TID="1">
+  <Name>test repo</Name>
+  <subsidiarySite>
+    <IliSite09.RepositoryLocation_>
+      <value>{subsite}</value>
+    </IliSite09.RepositoryLocation_>
+  </subsidiarySite>
+  </IliSite09.SiteMetadata.Site>
+</IliSite09.SiteMetadata>
+</DATASECTION>
+</TRANSFER>
+"""
+
+
+ILIMODELS = """<?xml version="1.0" encoding="UTF-8"?>
+<TRANSFER xmlns="http://www.interlis.ch/INTERLIS2.3">
+<HEADERSECTION SENDER="modelbaker" VERSION="2.3"></HEADERSECTION>
+<DATASECTION>
+<IliRepository20.RepositoryIndex BID="b1">
+  <IliRepository20.RepositoryIndex.ModelMetadata TID="1">
+    <Name>RoadsSimple</Name>
+    <SchemaLanguage>ili2_3</SchemaLanguage>
+    <File>models/RoadsSimple.ili</File>
+    <Version>2016-08-11</Version>
+  </IliRepository20.RepositoryIndex.ModelMetadata>
+</IliRepository20.RepositoryIndex>
+</DATASECTION>
+</TRANSFER>
+"""
@@ -668,6 +668,261 @@ class TestImport(unittest.TestCase):
         dataImporter.stderr.connect(self.print_error)
         assert dataImporter.run() == iliimporter.Importer.SUCCESS
 
+    def test_bulk_load_import_postgis(self):
+        importer = iliimporter.Importer()
+        importer.tool = DbIliMode.ili2pg
+        importer.configuration = iliimporter_config(importer.tool)
+        importer.configuration.ilifile = testdata_path("ilimodels/RoadsSimple.ili")
+        importer.configuration.ilimodels = "RoadsSimple"
+        importer.configuration.dbschema = "roads_simple_bulk_{:%Y%m%d%H%M%S%f}".format(
+            datetime.datetime.now()
+        )
+        importer.configuration.srs_code = 2056
+        importer.configuration.inheritance = "smart2"
+        importer.stdout.connect(self.print_info)
+        importer.stderr.connect(self.print_error)
+        assert importer.run() == iliimporter.Importer.SUCCESS
+
+        db_connector = db_utils.get_db_connector(importer.configuration)
+        objects = db_connector.get_bulk_load_objects()
+        db_connector.close()
+        assert objects["indexes"]
+        assert objects["constraints"]
+
+        dataImporter = iliimporter.Importer(dataImport=True)
+        dataImporter.tool = DbIliMode.ili2pg
+        dataImporter.configuration = ilidataimporter_config(dataImporter.tool)
+        dataImporter.configuration.ilimodels = "RoadsSimple"
+        dataImporter.configuration.dbschema = importer.configuration.dbschema
+        dataImporter.configuration.xtffile = testdata_path("xtf/test_roads_simple.xtf")
+        dataImporter.configuration.bulk_load = True
+        dataImporter.stdout.connect(self.print_info)
+        dataImporter.stderr.connect(self.print_error)
+        assert dataImporter.run() == iliimporter.Importer.SUCCESS
+        assert set(dataImporter.bulk_load_timings.keys()) == {
+            "drop",
+            "ili2db",
+            "indexes",
+            "constraints",
+        }
+
+        # the indexes and constraints are recreated
+        db_connector = db_utils.get_db_connector(importer.configuration)
+        assert db_connector.get_bulk_load_objects() == objects
+        db_connector.close()
+
+        # and restored after a failing import
+        dataImporter.configuration.xtffile = testdata_path(
+            "xtf/test_roads_simple_invalid.xtf"
+        )
+        assert dataImporter.run() == iliimporter.Importer.ERROR
+        assert dataImporter.bulk_load_objects is None
+
+        db_connector = db_utils.get_db_connector(importer.configuration)
+        assert db_connector.get_bulk_load_objects() == objects
+        db_connector.close()
+
+        # the dropped objects are journaled in the schema and restored after an interrupted import
+        db_connector = db_utils.get_db_connector(importer.configuration)
+        result, _ = db_connector.drop_bulk_load_objects(objects)
+        assert result
+        assert db_connector.get_bulk_load_journal() == objects
+        db_connector.close()
+
+        restoringImporter = iliimporter.Importer(dataImport=True)
+        restoringImporter.tool = DbIliMode.ili2pg
+        restoringImporter.configuration = dataImporter.configuration
+        restoringImporter.stdout.connect(self.print_info)
+        restoringImporter.stderr.connect(self.print_error)
+        assert restoringImporter.restore_bulk_load()
+
+        db_connector = db_utils.get_db_connector(importer.configuration)
+        assert db_connector.get_bulk_load_objects() == objects
+        assert db_connector.get_bulk_load_journal() == {
+            "indexes": [],
+            "constraints": [],
+        }
+        db_connector.close()
+
+    def test_spatial_index_single_point_mssql(self):
+        importer = iliimporter.Importer()
+        importer.tool = DbIliMode.ili2mssql
+        importer.configuration = iliimporter_config(importer.tool)
+        importer.configuration.ilifile = testdata_path("ilimodels/RoadsSimple.ili")
+        importer.configuration.ilimodels = "RoadsSimple"
+        importer.configuration.dbschema = "roads_simple_{:%Y%m%d%H%M%S%f}".format(
+            datetime.datetime.now()
+        )
+        importer.configuration.inheritance = "smart2"
+        importer.stdout.connect(self.print_info)
+        importer.stderr.connect(self.print_error)
+        assert importer.run() == iliimporter.Importer.SUCCESS
+
+        # a table containing a single point has no extent
+        uri = "DSN={dsn};DATABASE={db};UID={uid};PWD={pwd}".format(
+            dsn="testsqlserver",
+            db=importer.configuration.database,
+            uid=importer.configuration.dbusr,
+            pwd=importer.configuration.dbpwd,
+        )
+        conn = pyodbc.connect(uri)
+        cursor = conn.cursor()
+        cursor.execute(
+            "CREATE TABLE {}.single_point (t_id INT PRIMARY KEY, geom GEOMETRY)".format(
+                importer.configuration.dbschema
+            )
+        )
+        cursor.execute(
+            "INSERT INTO {}.single_point VALUES (1, geometry::Point(2600000, 1200000, 2056))".format(
+                importer.configuration.dbschema
+            )
+        )
+        conn.commit()
+
+        db_connector = db_utils.get_db_connector(importer.configuration)
+        result, message = db_connector.create_index(
+            {"tablename": "single_point", "columnname": "geom", "kind": "spatial"}
+        )
+        db_connector.close()
+        assert result, message
+
+        cursor.execute(
+            """
+                SELECT bounding_box_xmin, bounding_box_xmax, bounding_box_ymin, bounding_box_ymax
+                FROM sys.spatial_index_tessellations
+                WHERE object_id = OBJECT_ID('{}.single_point')
+            """.format(
+                importer.configuration.dbschema
+            )
+        )
+        assert tuple(next(cursor)) == (2599999, 2600001, 1199999, 1200001)
+        cursor.close()
+        conn.close()
+
+    def test_optimize_import_geopackage(self):
+        importer = iliimporter.Importer()
+        importer.tool = DbIliMode.ili2gpkg
+        importer.configuration = iliimporter_config(importer.tool)
+        importer.configuration.ilifile = testdata_path("ilimodels/RoadsSimple.ili")
+        importer.configuration.ilimodels = "RoadsSimple"
+        importer.configuration.dbfile = os.path.join(
+            self.basetestpath,
+            "tmp_roads_simple_{:%Y%m%d%H%M%S%f}.gpkg".format(datetime.datetime.now()),
+        )
+        importer.configuration.srs_code = 2056
+        importer.configuration.create_basket_col = True
+        importer.configuration.inheritance = "smart2"
+        importer.stdout.connect(self.print_info)
+        importer.stderr.connect(self.print_error)
+        assert importer.run() == iliimporter.Importer.SUCCESS
+
+        # drop the indexes ili2db created on the foreign key and basket columns
+        conn = utils.spatialite_connect(importer.configuration.dbfile)
+        cursor = conn.cursor()
+        cursor.execute(
+            """SELECT DISTINCT il.name
+            FROM sqlite_master m, pragma_index_list(m.name) il
+            WHERE m.type = 'table' AND il.origin = 'c'
+            AND m.name NOT LIKE 'gpkg%' AND m.name NOT LIKE 'rtree%'"""
+        )
+        for record in cursor.fetchall():
+            cursor.execute('DROP INDEX "{}"'.format(record[0]))
+        conn.commit()
+        cursor.close()
+        conn.close()
+
+        db_connector = db_utils.get_db_connector(importer.configuration)
+        missing_indexes = db_connector.get_missing_indexes()
+        db_connector.close()
+        missing_columns = {
+            (index["tablename"].lower(), index["columnname"].lower())
+            for index in missing_indexes
+        }
+        assert ("streetaxis", "street") in missing_columns
+        assert ("streetaxis", "t_basket") in missing_columns
+
+        # the optimizer creates them again after the import
+        messages = []
+        dataImporter = iliimporter.Importer(dataImport=True)
+        dataImporter.tool = DbIliMode.ili2gpkg
+        dataImporter.configuration = ilidataimporter_config(importer.tool)
+        dataImporter.configuration.ilimodels = "RoadsSimple"
+        dataImporter.configuration.dbfile = importer.configuration.dbfile
+        dataImporter.configuration.xtffile = testdata_path("xtf/test_roads_simple.xtf")
+        dataImporter.configuration.dataset = "Optimized"
+        dataImporter.configuration.optimize_db = True
+        dataImporter.stdout.connect(messages.append)
+        dataImporter.stderr.connect(self.print_error)
+        assert dataImporter.run() == iliimporter.Importer.SUCCESS
+        assert any("streetaxis" in message.lower() for message in messages)
+
+        db_connector = db_utils.get_db_connector(importer.configuration)
+        assert not [
+            index
+            for index in db_connector.get_missing_indexes()
+            if index["kind"] == "btree"
+        ]
+        # the meta tables are indexed as well
+        assert not db_connector.get_missing_metadata_indexes()
+        db_connector.close()
+
+    def test_metadata_indexes_geopackage(self):
+        importer = iliimporter.Importer()
+        importer.tool = DbIliMode.ili2gpkg
+        importer.configuration = iliimporter_config(importer.tool)
+        importer.configuration.ilifile = testdata_path("ilimodels/RoadsSimple.ili")
+        importer.configuration.ilimodels = "RoadsSimple"
+        importer.configuration.dbfile = os.path.join(
+            self.basetestpath,
+            "tmp_roads_simple_{:%Y%m%d%H%M%S%f}.gpkg".format(datetime.datetime.now()),
+        )
+        importer.configuration.srs_code = 2056
+        importer.configuration.inheritance = "smart2"
+        importer.stdout.connect(self.print_info)
+        importer.stderr.connect(self.print_error)
+        assert importer.run() == iliimporter.Importer.SUCCESS
+
+        db_connector = db_utils.get_db_connector(importer.configuration)
+        metadata_indexes = db_connector.get_metadata_indexes()
+        # ili2db creates no indexes on the meta tables
+        assert db_connector.get_missing_metadata_indexes() == metadata_indexes
+
+        result, messages = db_connector.create_metadata_indexes()
+        assert result
+        assert len(messages) == len(metadata_indexes)
+        assert db_connector.get_missing_metadata_indexes() == []
+
+        # the introspection uses them
+        cursor = db_connector.conn.cursor()
+        cursor.execute(
+            """EXPLAIN QUERY PLAN
+            SELECT setting FROM T_ILI2DB_COLUMN_PROP
+            WHERE tablename = 'streetaxis' AND columnname = 'street' AND tag = ?""",
+            ("ch.ehi.ili2db.foreignKey",),
+        )
+        assert any(
+            "t_ili2db_column_prop_tablename_columnname_tag_idx" in record["detail"]
+            for record in cursor.fetchall()
+        )
+        cursor.close()
+
+        result, messages = db_connector.drop_metadata_indexes()
+        assert result
+        assert len(messages) == len(metadata_indexes)
+        assert db_connector.get_missing_metadata_indexes() == metadata_indexes
+
+        # long index names are shortened to unique names within the identifier limit
+        tablename = "a_very_long_table_name_of_an_interlis_class_in_a_topic"
+        first_name = db_connector.index_name(tablename, ["first_reference_column"])
+        second_name = db_connector.index_name(tablename, ["second_reference_column"])
+        assert first_name != second_name
+        assert len(first_name.encode("utf-8")) == db_connector.MAX_IDENTIFIER_LENGTH
+        assert first_name.startswith(tablename[:40]) and first_name.endswith("_idx")
+        assert (
+            db_connector.index_name("streetaxis", ["street"]) == "streetaxis_street_idx"
+        )
+        db_connector.close()
+
     def print_info(self, text):
         logging.info(text)
 
@@ -0,0 +1,133 @@
+"""
+Metadata:
+    Creation Date: 2026-10-18
+    Copyright: (C) 2026 by OPENGIS.ch
+    Contact: info@opengis.ch
+
+License:
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the **GNU General Public License** as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+"""
+
+import datetime
+import logging
+import os
+import shutil
+import tempfile
+
+from qgis.testing import start_app, unittest
+
+from modelbaker.db_factory.gpkg_command_config_manager import GpkgCommandConfigManager
+from modelbaker.dbconnector.gpkg_connector import GPKGConnector
+from modelbaker.generator.generator import Generator
+from modelbaker.generator.metadata_cache import MetadataCache
+from modelbaker.iliwrapper import iliimporter
+from modelbaker.iliwrapper.globals import DbIliMode
+from tests.utils import iliimporter_config
+
+start_app()
+
+
+class TestMetadataCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Run before all tests."""
+        cls.basetestpath = tempfile.mkdtemp()
+        cls.original_cache_path = MetadataCache.CACHE_PATH
+        MetadataCache.CACHE_PATH = os.path.join(cls.basetestpath, "modelbakercache")
+
+    def test_metadata_cache_geopackage(self):
+        importer = iliimporter.Importer()
+        importer.tool = DbIliMode.ili2gpkg
+        importer.configuration = iliimporter_config(importer.tool, "ilimodels")
+        importer.configuration.ilimodels = (
+            "ZG_Naturschutz_und_Erholungsinfrastruktur_V1"
+        )
+        importer.configuration.dbfile = os.path.join(
+            self.basetestpath,
+            "tmp_naturschutz_gpkg_{:%Y%m%d%H%M%S%f}.gpkg".format(
+                datetime.datetime.now()
+            ),
+        )
+        importer.configuration.inheritance = "smart1"
+        importer.stdout.connect(self.print_info)
+        importer.stderr.connect(self.print_error)
+        assert importer.run() == iliimporter.Importer.SUCCESS
+
+        config_manager = GpkgCommandConfigManager(importer.configuration)
+        uri = config_manager.get_uri()
+
+        # the fingerprint is stable as long as the schema does not change
+        fingerprint = GPKGConnector(uri, None).get_metadata_fingerprint()
+        assert fingerprint
+        assert fingerprint == GPKGConnector(uri, None).get_metadata_fingerprint()
+
+        generator = Generator(DbIliMode.ili2gpkg, uri, "smart1")
+        available_layers = generator.layers()
+        relations, _ = generator.relations(available_layers)
+
+        # first run stores the metadata
+        storing_generator = Generator(
+            DbIliMode.ili2gpkg, uri, "smart1", use_metadata_cache=True
+        )
+        stored_layers = storing_generator.layers()
+        stored_relations, _ = storing_generator.relations(stored_layers)
+        assert os.path.isfile(
+            os.path.join(MetadataCache.CACHE_PATH, MetadataCache.CACHE_FILE)
+        )
+
+        # second run loads the metadata
+        loading_generator = Generator(
+            DbIliMode.ili2gpkg, uri, "smart1", use_metadata_cache=True
+        )
+        key = MetadataCache.key(DbIliMode.ili2gpkg, None, "", fingerprint)
+        assert MetadataCache().load(key) is not None
+        loaded_layers = loading_generator.layers()
+        loaded_relations, _ = loading_generator.relations(loaded_layers)
+
+        for layers in [stored_layers, loaded_layers]:
+            assert [layer.name for layer in layers] == [
+                layer.name for layer in available_layers
+            ]
+            assert [layer.alias for layer in layers] == [
+                layer.alias for layer in available_layers
+            ]
+        for layer_relations in [stored_relations, loaded_relations]:
+            assert [relation.name for relation in layer_relations] == [
+                relation.name for relation in relations
+            ]
+
+    def test_metadata_cache_store_load(self):
+        cache = MetadataCache(os.path.join(self.basetestpath, "storeload"))
+        key = MetadataCache.key(DbIliMode.ili2pg, "schema", "de", "fingerprint")
+        assert cache.load(key) is None
+
+        metadata = {
+            "tables_info": [{"tablename": "a", "srid": 2056, "relevance": True}],
+            "relations_info": [],
+            "bags_of_info": [],
+        }
+        assert cache.store(key, metadata)
+        assert cache.load(key) == metadata
+
+        # other schema, other entry
+        assert (
+            cache.load(
+                MetadataCache.key(DbIliMode.ili2pg, "other", "de", "fingerprint")
+            )
+            is None
+        )
+
+    def print_info(self, text):
+        logging.info(text)
+
+    def print_error(self, text):
+        logging.error(text)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Run after all tests."""
+        MetadataCache.CACHE_PATH = cls.original_cache_path
+        shutil.rmtree(cls.basetestpath, True)
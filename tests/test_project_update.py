@@ -0,0 +1,142 @@
+"""
+Metadata:
+    Creation Date: 2026-10-18
+    Copyright: (C) 2026 by OPENGIS.ch
+    Contact: info@opengis.ch
+
+License:
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the **GNU General Public License** as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+"""
+
+import datetime
+import logging
+import os
+import shutil
+import tempfile
+
+from qgis.core import QgsProject
+from qgis.testing import start_app, unittest
+
+from modelbaker.dataobjects.project import Project
+from modelbaker.db_factory.gpkg_command_config_manager import GpkgCommandConfigManager
+from modelbaker.generator.generator import Generator
+from modelbaker.iliwrapper import iliimporter
+from modelbaker.iliwrapper.globals import DbIliMode
+from tests.utils import iliimporter_config
+
+start_app()
+
+
+class TestProjectUpdate(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Run before all tests."""
+        cls.basetestpath = tempfile.mkdtemp()
+
+    def test_update_geopackage(self):
+        dbfile = os.path.join(
+            self.basetestpath,
+            "tmp_project_update_gpkg_{:%Y%m%d%H%M%S%f}.gpkg".format(
+                datetime.datetime.now()
+            ),
+        )
+        configuration = self._import_schema(
+            dbfile, "ZG_Naturschutz_und_Erholungsinfrastruktur_V1"
+        )
+        uri = GpkgCommandConfigManager(configuration).get_uri()
+
+        qgis_project = QgsProject()
+        project = self._generate_project(uri)
+        project.create(None, qgis_project)
+        assert Project.read_generation_state(qgis_project) is not None
+
+        layer_count = len(qgis_project.mapLayers())
+        relation_ids = set(qgis_project.relationManager().relations().keys())
+        layer_names = [layer.name for layer in project.layers]
+
+        # nothing changed
+        report = self._generate_project(uri).update(qgis_project)
+        assert report["added"] == []
+        assert report["updated"] == []
+        assert report["removed"] == []
+        assert report["customized"] == []
+        assert sorted(report["unchanged"]) == sorted(layer_names)
+        assert len(qgis_project.mapLayers()) == layer_count
+        assert set(qgis_project.relationManager().relations().keys()) == relation_ids
+
+        # the user customizes a layer
+        customized_layer = next(
+            layer
+            for layer in project.layers
+            if layer.name == "erholungsinfrastruktur_punktobjekt"
+        )
+        customized_layer_id = customized_layer.layer.id()
+        customized_layer.layer.setFieldAlias(0, "Custom alias")
+
+        report = self._generate_project(uri).update(qgis_project)
+        assert report["customized"] == ["erholungsinfrastruktur_punktobjekt"]
+        assert report["updated"] == []
+
+        # the schema gets extended by another model
+        self._import_schema(dbfile, "ExceptionalLoadsRoute_LV95_V1")
+        updated_project = self._generate_project(uri)
+        report = updated_project.update(qgis_project)
+
+        assert report["added"]
+        assert "erholungsinfrastruktur_punktobjekt" in report["customized"]
+        assert len(qgis_project.mapLayers()) == len(updated_project.layers)
+        assert len(qgis_project.relationManager().relations()) > len(relation_ids)
+        for layer in updated_project.layers:
+            assert qgis_project.layerTreeRoot().findLayer(layer.layer.id())
+
+        # the customized layer is untouched
+        customized_qgis_layer = qgis_project.mapLayer(customized_layer_id)
+        assert customized_qgis_layer is not None
+        assert customized_qgis_layer.fields().at(0).alias() == "Custom alias"
+
+    def test_update_without_generation_state(self):
+        qgis_project = QgsProject()
+        project = Project(log_function=lambda text, level: None)
+        project.layers = []
+        project.relations = []
+        assert project.update(qgis_project) is None
+
+    def _import_schema(self, dbfile, model):
+        importer = iliimporter.Importer()
+        importer.tool = DbIliMode.ili2gpkg
+        importer.configuration = iliimporter_config(importer.tool, "ilimodels")
+        importer.configuration.ilimodels = model
+        importer.configuration.dbfile = dbfile
+        importer.configuration.inheritance = "smart2"
+        importer.stdout.connect(self.print_info)
+        importer.stderr.connect(self.print_error)
+        assert importer.run() == iliimporter.Importer.SUCCESS
+        return importer.configuration
+
+    def _generate_project(self, uri):
+        generator = Generator(DbIliMode.ili2gpkg, uri, "smart2")
+        available_layers = generator.layers()
+        relations, bags_of_enum = generator.relations(available_layers)
+        legend = generator.legend(available_layers)
+
+        project = Project()
+        project.layers = available_layers
+        project.relations = relations
+        project.bags_of_enum = bags_of_enum
+        project.legend = legend
+        project.post_generate()
+        return project
+
+    def print_info(self, text):
+        logging.info(text)
+
+    def print_error(self, text):
+        logging.error(text)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Run after all tests."""
+        shutil.rmtree(cls.basetestpath, True)
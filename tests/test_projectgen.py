@@ -5606,6 +5606,137 @@ class TestProjectGen(unittest.TestCase):
 
         assert count == 2
 
+    def test_bulk_introspection_postgis(self):
+        importer = iliimporter.Importer()
+        importer.tool = DbIliMode.ili2pg
+        importer.configuration = iliimporter_config(
+            importer.tool, "ilimodels/CIAF_LADM"
+        )
+        importer.configuration.ilimodels = "CIAF_LADM"
+        importer.configuration.dbschema = "ciaf_ladm_{:%Y%m%d%H%M%S%f}".format(
+            datetime.datetime.now()
+        )
+        importer.configuration.srs_code = 3116
+        importer.configuration.inheritance = "smart2"
+        importer.stdout.connect(self.print_info)
+        importer.stderr.connect(self.print_error)
+        assert importer.run() == iliimporter.Importer.SUCCESS
+
+        generator = Generator(
+            DbIliMode.ili2pg,
+            get_pg_connection_string(),
+            "smart2",
+            importer.configuration.dbschema,
+        )
+        bulk_generator = Generator(
+            DbIliMode.ili2pg,
+            get_pg_connection_string(),
+            "smart2",
+            importer.configuration.dbschema,
+            bulk_introspection=True,
+        )
+
+        self._check_same_fields(generator.layers(), bulk_generator.layers())
+
+    def test_bulk_introspection_geopackage(self):
+        importer = iliimporter.Importer()
+        importer.tool = DbIliMode.ili2gpkg
+        importer.configuration = iliimporter_config(
+            importer.tool, "ilimodels/CIAF_LADM"
+        )
+        importer.configuration.ilimodels = "CIAF_LADM"
+        importer.configuration.dbfile = os.path.join(
+            self.basetestpath,
+            "tmp_bulk_introspection_gpkg_{:%Y%m%d%H%M%S%f}.gpkg".format(
+                datetime.datetime.now()
+            ),
+        )
+        importer.configuration.srs_code = 3116
+        importer.configuration.inheritance = "smart2"
+        importer.stdout.connect(self.print_info)
+        importer.stderr.connect(self.print_error)
+        assert importer.run() == iliimporter.Importer.SUCCESS
+
+        config_manager = GpkgCommandConfigManager(importer.configuration)
+        uri = config_manager.get_uri()
+
+        generator = Generator(DbIliMode.ili2gpkg, uri, "smart2")
+        bulk_generator = Generator(
+            DbIliMode.ili2gpkg, uri, "smart2", bulk_introspection=True
+        )
+
+        self._check_same_fields(generator.layers(), bulk_generator.layers())
+
+    def test_lazy_fields_geopackage(self):
+        importer = iliimporter.Importer()
+        importer.tool = DbIliMode.ili2gpkg
+        importer.configuration = iliimporter_config(importer.tool, "ilimodels")
+        importer.configuration.ilimodels = (
+            "ZG_Naturschutz_und_Erholungsinfrastruktur_V1"
+        )
+        importer.configuration.dbfile = os.path.join(
+            self.basetestpath,
+            "tmp_lazy_fields_gpkg_{:%Y%m%d%H%M%S%f}.gpkg".format(
+                datetime.datetime.now()
+            ),
+        )
+        importer.configuration.inheritance = "smart2"
+        importer.stdout.connect(self.print_info)
+        importer.stderr.connect(self.print_error)
+        assert importer.run() == iliimporter.Importer.SUCCESS
+
+        config_manager = GpkgCommandConfigManager(importer.configuration)
+        uri = config_manager.get_uri()
+
+        generator = Generator(DbIliMode.ili2gpkg, uri, "smart2")
+        lazy_generator = Generator(DbIliMode.ili2gpkg, uri, "smart2", lazy_fields=True)
+
+        layers = generator.layers()
+        lazy_layers = lazy_generator.layers()
+        assert all(layer.fields_loaded for layer in layers)
+        assert not any(layer.fields_loaded for layer in lazy_layers)
+
+        # creating a layer resolves its fields only
+        lazy_layers[0].create()
+        assert lazy_layers[0].fields_loaded
+        assert not any(layer.fields_loaded for layer in lazy_layers[1:])
+
+        self._check_same_fields(layers, lazy_layers)
+        assert all(layer.fields_loaded for layer in lazy_layers)
+
+    def _check_same_fields(self, layers, bulk_layers):
+        assert len(layers) == len(bulk_layers)
+        for layer, bulk_layer in zip(layers, bulk_layers):
+            assert layer.name == bulk_layer.name
+            assert layer.alias == bulk_layer.alias
+            assert [
+                (
+                    field.name,
+                    field.alias,
+                    field.hidden,
+                    field.read_only,
+                    field.widget,
+                    field.widget_config,
+                    field.default_value_expression,
+                    field.enum_domain,
+                    field.oid_domain,
+                )
+                for field in layer.fields
+            ] == [
+                (
+                    field.name,
+                    field.alias,
+                    field.hidden,
+                    field.read_only,
+                    field.widget,
+                    field.widget_config,
+                    field.default_value_expression,
+                    field.enum_domain,
+                    field.oid_domain,
+                )
+                for field in bulk_layer.fields
+            ]
+
     def print_info(self, text):
         logging.info(text)
 
@@ -5643,6 +5774,10 @@ class TestProjectGen(unittest.TestCase):
 
         # we wait for the download or we timeout after 30 seconds and we apply what we have
         loop = QEventLoop()
+        finished = list()
+        topping_file_cache.download_finished_and_model_fresh.connect(
+            lambda: finished.append(True)
+        )
         topping_file_cache.download_finished_and_model_fresh.connect(
             lambda: loop.quit()
         )
@@ -5653,12 +5788,9 @@ class TestProjectGen(unittest.TestCase):
 
         topping_file_cache.refresh()
 
-        if len(topping_file_cache.downloaded_files) != len(id_list):
+        if not finished:
             loop.exec()
 
-        # since the local download is quicker than the delay in the model refresh, we make one here as well
-        self._sleep(mili=3000)
-
         return topping_file_cache.model
 
     def _sleep(self, model=None, mili=10000):
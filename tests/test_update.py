@@ -10,6 +10,7 @@ import pyodbc
 from qgis import utils
 from qgis.testing import start_app, unittest
 
+import modelbaker.utils.db_utils as db_utils
 from modelbaker.db_factory.mssql_command_config_manager import MssqlCommandConfigManager
 from modelbaker.db_factory.pg_command_config_manager import PgCommandConfigManager
 from modelbaker.iliwrapper import iliimporter, iliupdater
@@ -98,6 +99,28 @@ class TestUpdate(unittest.TestCase):
         cursor.close()
         conn.close()
 
+    def test_update_optimize_gpkg(self):
+        tool = DbIliMode.ili2gpkg
+        dataset_name = "updater_optimize_test"
+        db_file = os.path.join(self.base_test_path, "tmp_update_optimize_gpkg.gpkg")
+
+        importer = self.__get_importer(tool)
+        importer.configuration.dbfile = db_file
+        assert importer.run() == iliimporter.Importer.SUCCESS
+
+        # the updater optimizes the database like the importer
+        messages = []
+        updater = self.__get_updater(tool, dataset_name)
+        updater.configuration.dbfile = db_file
+        updater.configuration.optimize_db = True
+        updater.stdout.connect(messages.append)
+        assert updater.run() == iliupdater.Updater.SUCCESS
+        assert "Optimizing the database...\n" in messages
+
+        db_connector = db_utils.get_db_connector(updater.configuration)
+        assert not db_connector.get_missing_metadata_indexes()
+        db_connector.close()
+
     def __get_importer(self, tool):
         # Schema Import
         importer = iliimporter.Importer()
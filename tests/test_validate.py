@@ -12,16 +12,20 @@ License:
 """
 
 
+import asyncio
 import datetime
 import logging
 import os
 import shutil
 import tempfile
+import tracemalloc
 
+from qgis.core import QgsRectangle
 from qgis.testing import start_app, unittest
 
 from modelbaker.iliwrapper import iliimporter, ilivalidator
 from modelbaker.iliwrapper.globals import DbIliMode
+from modelbaker.iliwrapper.ilibatchrunner import IliBatchRunner
 from tests.utils import (
     ilidataimporter_config,
     iliimporter_config,
@@ -568,6 +572,283 @@ class TestExport(unittest.TestCase):
         # No skip
         assert validator.run() == ilivalidator.Validator.SUCCESS
 
+    def test_batch_import_and_validate_geopackage(self):
+        importer = iliimporter.Importer()
+        importer.tool = DbIliMode.ili2gpkg
+        importer.configuration.ilifile = testdata_path("ilimodels/RoadsSimple.ili")
+        importer.configuration.ilimodels = "RoadsSimple"
+        importer.configuration.dbfile = os.path.join(
+            self.basetestpath,
+            "tmp_roads_simple_batch_{:%Y%m%d%H%M%S%f}.gpkg".format(
+                datetime.datetime.now()
+            ),
+        )
+        importer.configuration.srs_code = 2056
+        importer.configuration.create_basket_col = True
+        importer.configuration.inheritance = "smart2"
+        assert importer.run() == iliimporter.Importer.SUCCESS
+
+        runner = IliBatchRunner(max_workers=4)
+
+        dataImporter = iliimporter.Importer(dataImport=True)
+        dataImporter.tool = DbIliMode.ili2gpkg
+        dataImporter.configuration = ilidataimporter_config(dataImporter.tool)
+        dataImporter.configuration.ilimodels = "RoadsSimple"
+        dataImporter.configuration.dbfile = importer.configuration.dbfile
+        import_jobs = runner.add_xtffiles(
+            dataImporter,
+            [
+                testdata_path("xtf/test_roads_simple.xtf"),
+                testdata_path("xtf/test_roads_simple_invalid.xtf"),
+            ],
+            ["ValidSet", "InvalidSet"],
+        )
+        assert import_jobs[0].lock_key == import_jobs[1].lock_key
+
+        validator = ilivalidator.Validator()
+        validator.tool = DbIliMode.ili2gpkg
+        validator.configuration = ilivalidator_config(validator.tool)
+        validator.configuration.dbfile = importer.configuration.dbfile
+        validator.configuration.dataset = "ValidSet"
+        validation_job = runner.add(validator, "ValidSet")
+
+        started = []
+        runner.job_started.connect(started.append)
+        jobs = runner.run()
+
+        # the jobs on the same geopackage are run in order
+        assert started == [0, 1, 2]
+        assert [job.result for job in jobs] == [
+            iliimporter.Importer.SUCCESS,
+            iliimporter.Importer.ERROR,
+            ilivalidator.Validator.SUCCESS,
+        ]
+        assert not runner.succeeded
+        assert runner.summary[ilivalidator.Validator.SUCCESS] == 2
+        assert validation_job.log
+        assert all(job.duration is not None for job in jobs)
+
+    def test_batch_copies_configuration(self):
+        dataImporter = iliimporter.Importer(dataImport=True)
+        dataImporter.tool = DbIliMode.ili2gpkg
+        dataImporter.configuration = ilidataimporter_config(dataImporter.tool)
+        dataImporter.configuration.delete_data = True
+        dataImporter.configuration.with_importtid = True
+        dataImporter.configuration.bulk_load = True
+        dataImporter.configuration.srs_code = 3116
+
+        validator = ilivalidator.Validator()
+        validator.tool = DbIliMode.ili2gpkg
+        validator.configuration = ilivalidator_config(validator.tool)
+        validator.configuration.ilimodels = "RoadsSimple"
+        validator.configuration.baskets = ["b1"]
+        validator.configuration.skip_geometry_errors = True
+
+        runner = IliBatchRunner()
+        import_job, validation_job = [
+            runner.add_xtffiles(executable, ["data.xtf"])[0]
+            for executable in (dataImporter, validator)
+        ]
+
+        # the operation specific settings survive the copy
+        configuration = import_job.executable.configuration
+        assert configuration is not dataImporter.configuration
+        assert configuration.delete_data
+        assert configuration.with_importtid
+        assert configuration.bulk_load
+        assert configuration.srs_code == 3116
+        assert configuration.xtffile == "data.xtf"
+        assert (
+            configuration.base_configuration
+            is dataImporter.configuration.base_configuration
+        )
+
+        configuration = validation_job.executable.configuration
+        assert configuration.ilimodels == "RoadsSimple"
+        assert configuration.skip_geometry_errors
+        assert configuration.baskets == ["b1"]
+        assert configuration.baskets is not validator.configuration.baskets
+
+    def test_validate_non_blocking_geopackage(self):
+        importer = iliimporter.Importer()
+        importer.tool = DbIliMode.ili2gpkg
+        importer.configuration.ilifile = testdata_path("ilimodels/RoadsSimple.ili")
+        importer.configuration.ilimodels = "RoadsSimple"
+        importer.configuration.dbfile = os.path.join(
+            self.basetestpath,
+            "tmp_roads_simple_non_blocking_{:%Y%m%d%H%M%S%f}.gpkg".format(
+                datetime.datetime.now()
+            ),
+        )
+        importer.configuration.srs_code = 2056
+        importer.configuration.inheritance = "smart2"
+        assert importer.run() == iliimporter.Importer.SUCCESS
+
+        futures = []
+        finished = []
+        for _ in range(2):
+            validator = ilivalidator.Validator()
+            validator.tool = DbIliMode.ili2gpkg
+            validator.configuration = ilivalidator_config(validator.tool)
+            validator.configuration.dbfile = importer.configuration.dbfile
+            future = validator.start()
+            future.add_done_callback(finished.append)
+            futures.append(future)
+
+        # both validations run at the same time
+        assert not any(future.done() for future in futures)
+        assert [future.wait() for future in futures] == [
+            ilivalidator.Validator.SUCCESS,
+            ilivalidator.Validator.SUCCESS,
+        ]
+        assert sorted(finished, key=futures.index) == futures
+
+        async def await_result(future):
+            return await future
+
+        assert asyncio.run(await_result(futures[0])) == ilivalidator.Validator.SUCCESS
+
+        # a canceled run finishes with an error
+        validator = ilivalidator.Validator()
+        validator.tool = DbIliMode.ili2gpkg
+        validator.configuration = ilivalidator_config(validator.tool)
+        validator.configuration.dbfile = importer.configuration.dbfile
+        future = validator.start()
+        future.cancel()
+        assert future.wait() == ilivalidator.Validator.ERROR
+
+    def test_validation_result_model_paging(self):
+        xtflog = os.path.join(
+            self.basetestpath,
+            "tmp_test_paging_result_{:%Y%m%d%H%M%S%f}.xtf".format(
+                datetime.datetime.now()
+            ),
+        )
+        errors = []
+        for i in range(25):
+            errors.append(
+                VALIDATION_ERROR.format(
+                    tid=i, message=f"Error {i}", type="Error", coord=i * 10.5
+                )
+            )
+        # warnings and the final summary are not listed
+        errors.append(
+            VALIDATION_ERROR.format(tid=25, message="Warning", type="Warning", coord=0)
+        )
+        errors.append(
+            VALIDATION_ERROR.format(
+                tid=26, message="...validate failed", type="Error", coord=0
+            )
+        )
+        with open(xtflog, "w") as f:
+            f.write(VALIDATION_LOG.format(errors="".join(errors)))
+
+        result_model = ilivalidator.ValidationResultModel()
+        result_model.FETCH_SIZE = 10
+        result_model.configuration.xtflog = xtflog
+        result_model.reload()
+        assert result_model.rowCount() == 10
+        assert result_model.canFetchMore()
+
+        result_model.fetchMore()
+        assert result_model.rowCount() == 20
+        result_model.fetch_all()
+        assert result_model.rowCount() == 25
+        assert not result_model.canFetchMore()
+
+        index = result_model.index(24, 0)
+        assert (
+            index.data(int(ilivalidator.ValidationResultModel.Roles.MESSAGE))
+            == "Error 24"
+        )
+        assert index.data(int(ilivalidator.ValidationResultModel.Roles.ID)) == "24"
+        # the coordinates are returned as written in the log
+        assert (
+            index.data(int(ilivalidator.ValidationResultModel.Roles.COORD_X))
+            == "252.0"
+        )
+        assert (
+            result_model.item(3).data(
+                int(ilivalidator.ValidationResultModel.Roles.COORD_Y)
+            )
+            == "31.5"
+        )
+        assert not index.data(int(ilivalidator.ValidationResultModel.Roles.FIXED))
+        assert result_model.setData(
+            index, True, int(ilivalidator.ValidationResultModel.Roles.FIXED)
+        )
+        assert index.data(int(ilivalidator.ValidationResultModel.Roles.FIXED))
+
+    def test_validation_result_model_query(self):
+        xtflog = os.path.join(
+            self.basetestpath,
+            "tmp_test_query_result_{:%Y%m%d%H%M%S%f}.xtf".format(
+                datetime.datetime.now()
+            ),
+        )
+        errors = []
+        for i in range(100):
+            errors.append(
+                VALIDATION_ERROR.format(
+                    tid=i, message=f"Error {i}", type="Error", coord=i * 10.0
+                )
+            )
+        with open(xtflog, "w") as f:
+            f.write(VALIDATION_LOG.format(errors="".join(errors)))
+
+        result_model = ilivalidator.ValidationResultModel()
+        result_model.FETCH_SIZE = 10
+        result_model.configuration.xtflog = xtflog
+        result_model.reload()
+
+        # the query loads the whole log
+        assert result_model.query(tid="42") == [42]
+        assert result_model.rowCount() == 100
+        assert result_model.query(tid="unknown") == []
+        assert len(result_model.query(obj_tag="Model.Topic.Class")) == 100
+        assert result_model.query(extent=QgsRectangle(95, 95, 230, 230)) == list(
+            range(10, 24)
+        )
+        assert result_model.query(
+            tid="15", extent=QgsRectangle(95, 95, 230, 230)
+        ) == [15]
+        assert result_model.query(tid="5", extent=QgsRectangle(95, 95, 230, 230)) == []
+
+    def test_validation_log_reader_memory(self):
+        def read_peak(error_count):
+            xtflog = os.path.join(
+                self.basetestpath,
+                "tmp_test_reader_memory_{:%Y%m%d%H%M%S%f}.xtf".format(
+                    datetime.datetime.now()
+                ),
+            )
+            # warnings are not stored, so only the reader itself could grow
+            with open(xtflog, "w") as f:
+                head, tail = VALIDATION_LOG.split("{errors}")
+                f.write(head)
+                for i in range(error_count):
+                    f.write(
+                        VALIDATION_ERROR.format(
+                            tid=i, message=f"Warning {i}", type="Warning", coord=i
+                        )
+                    )
+                f.write(tail)
+
+            store = ilivalidator.ValidationErrorStore()
+            reader = ilivalidator.ValidationLogReader(xtflog)
+            tracemalloc.start()
+            try:
+                while not reader.at_end:
+                    reader.read(store, 1000)
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+                assert len(store) == 0
+
+        small_peak = read_peak(2000)
+        large_peak = read_peak(20000)
+        assert large_peak < 2 * small_peak
+
     def print_info(self, text):
         logging.info(text)
 
@@ -578,3 +859,24 @@ class TestExport(unittest.TestCase):
     def tearDownClass(cls):
         """Run after all tests."""
         shutil.rmtree(cls.basetestpath, True)
+
+
+VALIDATION_LOG = """<?xml version="1.0" encoding="UTF-8"?>
+<TRANSFER xmlns="http://www.interlis.ch/INTERLIS2.3">
+<HEADERSECTION SENDER="ilivalidator" VERSION="2.3"></HEADERSECTION>
+<DATASECTION>
+<IliVErrors.ErrorLog BID="b1">
+{errors}
+</IliVErrors.ErrorLog>
+</DATASECTION>
+</TRANSFER>
+"""
+
+VALIDATION_ERROR = """<IliVErrors.ErrorLog.Error TID="{tid}">
+<Message>{message}</Message>
+<Type>{type}</Type>
+<ObjTag>Model.Topic.Class</ObjTag>
+<Tid>{tid}</Tid>
+<Geometry><COORD><C1>{coord}</C1><C2>{coord}</C2></COORD></Geometry>
+</IliVErrors.ErrorLog.Error>
+"""